@@ -0,0 +1,97 @@
+# tests for the BitGrid and BitBoard classes in the bitboard.py module
+
+import random
+import unittest
+
+from base_models.bitboard import BitBoard
+from base_models.bitboard import BitGrid
+from base_models.bitboard import bits_of
+from base_models.bitboard import popcount
+from base_models.board import Board
+
+
+class TestBitBoard(unittest.TestCase):
+    """TestCase class containing unit tests for BitGrid and BitBoard
+
+    i. spaces convert to masks and back without loss
+    ii. shifts drop cells that would leave the grid
+    iii. line checks agree with a check of every line
+    iv. a BitBoard made from a Board follows its spaces
+    """
+    def setUp(self):
+        self.grid = BitGrid(5, 4)
+
+    def test_round_trip(self):
+        rng = random.Random(3)
+        pieces = [0, 'X', 'O', ('p1', 'king'), ['stack', 2], None]
+        spaces = [rng.choice(pieces) for index in range(20)]
+        bitboard = BitBoard(self.grid, spaces)
+        self.assertEqual(bitboard.to_spaces(), spaces)
+        self.assertEqual(bits_of(bitboard.mask('X')),
+                         [index for index, content in enumerate(spaces)
+                          if content == 'X'])
+        self.assertEqual(popcount(bitboard.occupied | bitboard.empty), 20)
+        self.assertEqual(bitboard.occupied & bitboard.empty, 0)
+        bitboard.set(0, ['stack', 2])
+        bitboard.set(1, 0)
+        spaces[0] = ['stack', 2]
+        spaces[1] = 0
+        self.assertEqual(bitboard.get(0), ['stack', 2])
+        self.assertEqual(bitboard.get(1), 0)
+        self.assertEqual(bitboard.to_spaces(), spaces)
+        self.assertRaises(ValueError, BitBoard, self.grid, [0] * 3)
+
+    def test_shifts(self):
+        grid = self.grid
+        corner = 1 << grid.index(4, 0)
+        self.assertEqual(grid.shift(corner, 1, 0), 0)
+        self.assertEqual(grid.shift(corner, 0, -1), 0)
+        self.assertEqual(grid.shift(corner, -1, 1),
+                         1 << grid.index(3, 1))
+        self.assertEqual(sorted(grid.coord(index) for index
+                                in bits_of(grid.neighborhoods[4])),
+                         [(3, 0), (3, 1), (4, 1)])
+        self.assertEqual(popcount(grid.neighborhoods[grid.index(2, 2)]), 8)
+        self.assertEqual(grid.shift(grid.full, 2, 0),
+                         grid.full & ~(grid.columns[0] | grid.columns[1]))
+        # an X with an O to its right and an empty cell after that
+        bitboard = BitBoard(grid, [0] * 20)
+        for x, content in enumerate(['X', 'O', 0, 'X', 'O']):
+            bitboard.set(grid.index(x, 0), content)
+        found = grid.matches(
+            [bitboard.mask('X'), bitboard.mask('O'), bitboard.empty],
+            [(0, 0), (1, 0), (2, 0)]
+        )
+        self.assertEqual(bits_of(found), [0])
+
+    def test_lines(self):
+        grid = self.grid
+        self.assertEqual(len(grid.lines(4)), 4 * 2 + 5 + 2 * 2 * 1)
+        rng = random.Random(11)
+        for trial in range(200):
+            mask = rng.getrandbits(20) & rng.getrandbits(20)
+            for length in (3, 4):
+                expected = any(mask & line == line
+                               for line in grid.lines(length))
+                self.assertEqual(grid.has_line(mask, length), expected)
+                self.assertEqual(bool(grid.line_ends(mask, length)),
+                                 expected)
+                for index in bits_of(mask):
+                    self.assertEqual(
+                        grid.completes_line(mask, index, length),
+                        any(mask & line == line for line
+                            in grid.lines(length) if line >> index & 1)
+                    )
+
+    def test_follows_board(self):
+        board = Board(spaces=[0] * 20)
+        bitboard = BitBoard.from_board(board, self.grid)
+        for x in range(4):
+            board.set_space(self.grid.index(x, x), 'X')
+        self.assertTrue(self.grid.has_line(bitboard.mask('X'), 4))
+        board.set_space(0, 'O')
+        self.assertFalse(self.grid.has_line(bitboard.mask('X'), 4))
+        self.assertEqual(bitboard.to_spaces(), board.spaces)
+        bitboard.close()
+        board.set_space(1, 'O')
+        self.assertEqual(bitboard.get(1), 0)
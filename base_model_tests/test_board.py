@@ -20,6 +20,7 @@ class TestBoardMethods(unittest.TestCase):
         expected output when not default initialization
     iii. get a reasonable error when I initialize with an unreasonable initial
         condition set
+    iv. the mutator methods change spaces, tiles, decks, tokens and score
     """
     def setUp(self):
         """Initialize objects for later test methods
@@ -139,3 +140,47 @@ class TestBoardMethods(unittest.TestCase):
         }
         with self.assertRaises(TypeError) as context:
             Board(**initial_attributes)
+
+    def test_place_and_remove_tile(self):
+        """Test place_tile moves a reserve tile and remove_tile returns it
+        """
+        test_board = Board(spaces=[0, 0, 0], tiles=self.test_tile_list)
+        old_content = test_board.place_tile(1, self.test_tile)
+        self.assertEqual(old_content, 0)
+        self.assertEqual(test_board.spaces, [0, self.test_tile, 0])
+        self.assertEqual(test_board.tiles, [])
+        removed_tile = test_board.remove_tile(1, empty=0)
+        self.assertTrue(removed_tile is self.test_tile)
+        self.assertEqual(test_board.spaces, [0, 0, 0])
+        self.assertEqual(test_board.tiles, [self.test_tile])
+        with self.assertRaises(ValueError) as context:
+            test_board.remove_tile(0)
+        with self.assertRaises(TypeError) as context:
+            test_board.place_tile(0, 'nonsense')
+
+    def test_deck_token_and_score_mutators(self):
+        """Test the deck, token and score mutators change the board
+        """
+        test_board = Board(decks=self.test_deck_list)
+        dealt_card = test_board.deal_card(0)
+        self.assertEqual(dealt_card.to_dict(), {'rank': 1, 'value': 1})
+        test_board.add_card(0, dealt_card, bottom_add=True)
+        self.assertEqual(test_board.decks[0].show_bottom(),
+                         {'rank': 1, 'value': 1})
+        test_board.shuffle_deck(0)
+        self.assertEqual(test_board.decks[0].cards_left, 3)
+        test_board.add_token('chip')
+        test_board.add_token('house')
+        test_board.remove_token('chip')
+        self.assertEqual(test_board.tokens, ['house'])
+        self.assertEqual(test_board.set_score(5), None)
+        self.assertEqual(test_board.score, 5)
+        self.assertEqual(Board().tokens, [])
+
+    def test_roll_dice(self):
+        """Test roll_dice rolls one of the dice rollers
+        """
+        test_board = Board(dice_rollers=self.test_roller_list)
+        roll_value = test_board.roll_dice(0)
+        self.assertTrue(2 <= roll_value <= 12)
+        self.assertEqual(self.test_dice_roller.roll_value, roll_value)
@@ -4,9 +4,11 @@
 # the intention is that cards are a base class to a future tiles class
 # which will enable the construction of flexible playing boards later
 
+import random
 import unittest
 
 from base_models.cards import Card
+from base_models.cards import CompactCard
 from base_models.cards import DeckOfCards
 
 
@@ -21,6 +23,7 @@ class TestCardMethods(unittest.TestCase):
         expected output when not default initialization
     iii. get a reasonable error when I initialize with an unreasonable initial
         condition set
+    iv. a CompactCard holds its attributes in slots, not in a dict
     """
     def test_default_initialization(self):
         """Test that when I initialize with no args I get a Card object
@@ -58,6 +61,16 @@ class TestCardMethods(unittest.TestCase):
         with self.assertRaises(TypeError) as context:
             Card(**initial_attributes)
 
+    def test_compact_card_uses_slots(self):
+        """Test a CompactCard holds its attributes in slots, not a dict
+        """
+        test_card = CompactCard(rank=2, value=11)
+        self.assertTrue(isinstance(test_card, Card))
+        self.assertEqual(test_card.rank, 2)
+        self.assertEqual(test_card.value, 11)
+        self.assertEqual(test_card.to_dict(), {'rank': 2, 'value': 11})
+        self.assertFalse(hasattr(test_card, '__dict__'))
+
 
 class TestDeckOfCardsMethods(unittest.TestCase):
     """TestCase class containing unit tests for the DeckOfCards methods
@@ -75,6 +88,16 @@ class TestDeckOfCardsMethods(unittest.TestCase):
     xi. Test deal_card from empty deck
     x. Three card deck shuffled many times has expected outcome
     xi. Shuffling a deck with many cards results in a new list
+    xii. deal_many matches repeated deal_card from the top and bottom
+    xiii. add_many matches repeated add_card to the top and bottom
+    xiv. deal_many past the end of the deck returns the cards left
+    xv. lazy shuffle deals distinct cards and tracks cards_left
+    xvi. lazy shuffle show_top and show_bottom match the next deals
+    xvii. three card deck lazily shuffled many times has expected outcome
+    xviii. adding to a lazily shuffled deck keeps the dealt positions
+    xix. finishing a lazy shuffle does not draw from the caller's rng
+    xx. shuffling again while a lazy shuffle is pending stays lazy
+    xxi. card_list is read as a copy and changed by assigning it back
     """
     def setUp(self):
         self.card_to_add = Card(rank=2, value=11)
@@ -227,3 +250,186 @@ class TestDeckOfCardsMethods(unittest.TestCase):
         test_deck.shuffle()
         final_values = [card.value for card in test_deck.card_list]
         self.assertNotEqual(init_values, final_values)
+
+    def test_deal_many_matches_repeated_deal_card(self):
+        """deal_many matches repeated deal_card from the top and bottom
+        """
+        test_deck = DeckOfCards(card_list=self.large_shuffle_init_list)
+        check_deck = DeckOfCards(card_list=self.large_shuffle_init_list)
+        dealt_cards = test_deck.deal_many(10)
+        expected_cards = [check_deck.deal_card() for i in range(10)]
+        self.assertEqual(dealt_cards, expected_cards)
+        dealt_cards = test_deck.deal_many(10, bottom_deal=True)
+        expected_cards = [
+            check_deck.deal_card(bottom_deal=True) for i in range(10)
+        ]
+        self.assertEqual(dealt_cards, expected_cards)
+        self.assertEqual(test_deck.card_list, check_deck.card_list)
+        self.assertEqual(test_deck.cards_left, 980)
+
+    def test_add_many_matches_repeated_add_card(self):
+        """add_many matches repeated add_card to the top and bottom
+        """
+        test_deck = DeckOfCards(card_list=self.card_init_list)
+        check_deck = DeckOfCards(card_list=self.card_init_list)
+        to_add = self.large_shuffle_init_list[:5]
+        test_deck.add_many(to_add)
+        test_deck.add_many(to_add, bottom_add=True)
+        for card in to_add:
+            check_deck.add_card(card)
+        for card in to_add:
+            check_deck.add_card(card, bottom_add=True)
+        self.assertEqual(test_deck.card_list, check_deck.card_list)
+        self.assertEqual(test_deck.cards_left, 13)
+        self.assertEqual(test_deck.show_top(), {'rank': 1, 'value': 5})
+        self.assertEqual(test_deck.show_bottom(), {'rank': 1, 'value': 5})
+        with self.assertRaises(TypeError) as context:
+            test_deck.add_many(['nonsense'])
+
+    def test_deal_many_past_end_of_deck(self):
+        """deal_many past the end of the deck returns the cards left
+        """
+        test_deck = DeckOfCards(card_list=self.card_init_list)
+        dealt_cards = test_deck.deal_many(5)
+        self.assertEqual(dealt_cards, self.card_init_list)
+        self.assertEqual(test_deck.cards_left, 0)
+        self.assertEqual(test_deck.deal_many(2), [])
+
+    def test_lazy_shuffle_deals_distinct_cards(self):
+        """lazy shuffle deals distinct cards and tracks cards_left
+        """
+        test_deck = DeckOfCards(card_list=self.large_shuffle_init_list)
+        test_deck.shuffle(lazy=True)
+        dealt_cards = test_deck.deal_many(5)
+        dealt_cards.append(test_deck.deal_card(bottom_deal=True))
+        self.assertEqual(test_deck.cards_left, 994)
+        self.assertEqual(len(set([card.value for card in dealt_cards])), 6)
+        remaining_values = [card.value for card in test_deck.card_list]
+        all_values = sorted(
+            remaining_values + [card.value for card in dealt_cards]
+        )
+        self.assertEqual(all_values, list(range(1, 1001)))
+        self.assertNotEqual(remaining_values, sorted(remaining_values))
+
+    def test_lazy_shuffle_show_matches_deal(self):
+        """lazy shuffle show_top and show_bottom match the next deals
+        """
+        test_deck = DeckOfCards(card_list=self.card_init_list)
+        test_deck.shuffle(lazy=True, rng=random.Random(4))
+        top_attributes = test_deck.show_top()
+        bottom_attributes = test_deck.show_bottom()
+        self.assertEqual(test_deck.show_top(), top_attributes)
+        self.assertEqual(test_deck.deal_card().to_dict(), top_attributes)
+        self.assertEqual(
+            test_deck.deal_card(bottom_deal=True).to_dict(),
+            bottom_attributes
+        )
+        self.assertEqual(test_deck.cards_left, 1)
+        self.assertEqual(test_deck.show_top(), test_deck.show_bottom())
+        test_deck.deal_card()
+        self.assertEqual(test_deck.cards_left, 0)
+        self.assertFalse(test_deck.deal_card())
+        with self.assertRaises(IndexError) as context:
+            test_deck.show_top()
+
+    def test_lazy_shuffling_short_deck_many_times(self):
+        """Three card deck lazily shuffled many times has expected outcome
+
+        same counting as the eager shuffle test, with the order read off
+        by dealing from the top and bottom in turn
+        """
+        location_count_array = [
+            [0, 0, 0],
+            [0, 0, 0],
+            [0, 0, 0]
+        ]
+        value_rows = {1: 0, 4: 1, 9: 2}
+        for i in range(10000):
+            test_deck = DeckOfCards(card_list=self.card_init_list)
+            test_deck.shuffle(lazy=True)
+            bottom_card = test_deck.deal_card(bottom_deal=True)
+            top_card = test_deck.deal_card()
+            middle_card = test_deck.deal_card()
+            for n, card in enumerate([top_card, middle_card, bottom_card]):
+                location_count_array[value_rows[card.value]][n] += 1
+        minimum_count = min([min(row) for row in location_count_array])
+        maximum_count = max([max(row) for row in location_count_array])
+        self.assertTrue(minimum_count > 3100)
+        self.assertTrue(maximum_count < 3500)
+
+    def test_add_card_to_lazy_deck(self):
+        """adding to a lazily shuffled deck keeps the dealt positions
+        """
+        test_deck = DeckOfCards(card_list=self.large_shuffle_init_list)
+        test_deck.shuffle(lazy=True)
+        top_attributes = test_deck.show_top()
+        bottom_attributes = test_deck.show_bottom()
+        test_deck.add_card(self.card_to_add, bottom_add=True)
+        self.assertEqual(test_deck.cards_left, 1001)
+        self.assertEqual(test_deck.show_top(), top_attributes)
+        self.assertEqual(test_deck.card_list[-2].to_dict(), bottom_attributes)
+        self.assertEqual(test_deck.show_bottom(), {'rank': 2, 'value': 11})
+
+    def test_lazy_shuffle_leaves_rng_alone(self):
+        """finishing a lazy shuffle does not draw from the caller's rng
+        """
+        rng = random.Random(9)
+        test_deck = DeckOfCards(card_list=self.large_shuffle_init_list)
+        test_deck.shuffle(lazy=True, rng=rng)
+        state = rng.getstate()
+        first_card = test_deck.deal_card()
+        card_list = test_deck.card_list
+        self.assertEqual(rng.getstate(), state)
+        self.assertEqual(len(card_list), 999)
+        self.assertFalse(first_card in card_list)
+        self.assertEqual(len(set(map(id, card_list))), 999)
+
+    def test_lazy_reshuffle_stays_lazy(self):
+        """shuffling again while a lazy shuffle is pending stays lazy
+
+        the cards already drawn to the ends go back into the shuffle,
+        and the outcome counts are as even as for a single shuffle
+        """
+        test_deck = DeckOfCards(card_list=self.large_shuffle_init_list)
+        test_deck.shuffle(lazy=True)
+        pending = test_deck._lazy
+        test_deck.deal_many(5)
+        test_deck.show_bottom()
+        test_deck.shuffle(lazy=True)
+        self.assertTrue(test_deck._lazy is pending)
+        self.assertEqual(test_deck.cards_left, 995)
+        self.assertEqual(len(set(map(id, test_deck.card_list))), 995)
+
+        rng = random.Random(14)
+        location_count_array = [
+            [0, 0, 0],
+            [0, 0, 0],
+            [0, 0, 0]
+        ]
+        value_rows = {1: 0, 4: 1, 9: 2}
+        for i in range(10000):
+            test_deck = DeckOfCards(card_list=self.card_init_list)
+            test_deck.shuffle(lazy=True, rng=rng)
+            test_deck.show_top()
+            test_deck.shuffle(lazy=True, rng=rng)
+            for n, card in enumerate(test_deck.card_list):
+                location_count_array[value_rows[card.value]][n] += 1
+        minimum_count = min([min(row) for row in location_count_array])
+        maximum_count = max([max(row) for row in location_count_array])
+        self.assertTrue(minimum_count > 3100)
+        self.assertTrue(maximum_count < 3500)
+
+    def test_card_list_copy_and_assign(self):
+        """card_list is read as a copy and changed by assigning it back
+        """
+        test_deck = DeckOfCards(card_list=self.card_init_list)
+        card_list = test_deck.card_list
+        card_list.append(self.card_to_add)
+        self.assertEqual(test_deck.cards_left, 3)
+        card_list.sort(key=lambda card: -card.value)
+        test_deck.card_list = card_list
+        self.assertEqual(test_deck.cards_left, 4)
+        self.assertEqual(test_deck.show_top(), {'rank': 2, 'value': 11})
+        self.assertEqual(test_deck.show_bottom(), {'rank': 1, 'value': 1})
+        with self.assertRaises(AttributeError) as context:
+            test_deck.cards_left = 2
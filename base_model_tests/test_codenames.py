@@ -0,0 +1,136 @@
+# tests for the CodenamesBoard class in the codenames.py module
+
+import random
+import unittest
+
+from base_models.cards import Card
+from base_models.codenames import ASSASSIN
+from base_models.codenames import BLUE
+from base_models.codenames import NEUTRAL
+from base_models.codenames import RED
+from base_models.codenames import CodenamesBoard
+from base_models.codenames import WordTile
+from base_models.journal import MoveJournal
+
+
+def brute_force_targets(game, team, clue, margin=0.0):
+    """targets of a clue found by checking every word one at a time
+    """
+    def similarity(first, second):
+        return sum([a * b for a, b in zip(first, second)])
+    clue_vector = game.test_embeddings[clue]
+    own, others = [], []
+    for index, word in enumerate(game.words):
+        if game.revealed >> index & 1:
+            continue
+        score = similarity(clue_vector, game.test_embeddings[word])
+        if game.identities[index] == team:
+            own.append((score, index))
+        else:
+            others.append(score)
+    threshold = max(others) + margin if others else float('-inf')
+    return sorted([index for score, index in own if score > threshold])
+
+
+class TestCodenamesBoard(unittest.TestCase):
+    """TestCase class containing unit tests for CodenamesBoard
+
+    i. words sit on the Board as WordTiles with masks for identities
+    ii. revealing covers words with agent cards and undo uncovers them
+    iii. clue targets match a check of every word and clue
+    iv. rankings are cached for each set of covered words
+    v. tokens other than agent cards leave the masks alone
+    """
+    def setUp(self):
+        rng = random.Random(2)
+        self.identities = ([RED] * 9 + [BLUE] * 8 + [NEUTRAL] * 7 +
+                           [ASSASSIN])
+        rng.shuffle(self.identities)
+        self.words = ['word{}'.format(index) for index in range(25)]
+        embeddings = {}
+        for word in self.words + ['clue{}'.format(index)
+                                  for index in range(40)]:
+            vector = [rng.gauss(0, 1) for dimension in range(8)]
+            length = sum([component ** 2 for component in vector]) ** 0.5
+            embeddings[word] = [component / length for component in vector]
+        self.game = CodenamesBoard(self.words, self.identities, embeddings)
+        self.game.test_embeddings = embeddings
+
+    def test_masks(self):
+        game = self.game
+        self.assertEqual(len(game.board.spaces), 25)
+        self.assertTrue(all(isinstance(tile, WordTile)
+                            for tile in game.board.spaces))
+        self.assertEqual(game.board.spaces[3].word, 'word3')
+        self.assertEqual(game.remaining(RED), 9)
+        self.assertEqual(game.remaining(BLUE), 8)
+        self.assertEqual(game.assassin_mask,
+                         1 << self.identities.index(ASSASSIN))
+        self.assertEqual(game.team_masks[RED] | game.team_masks[BLUE] |
+                         game.neutral_mask | game.assassin_mask, game.full)
+        self.assertEqual(len(game.clues), 40)
+        self.assertRaises(ValueError, CodenamesBoard, ['a'], [RED, BLUE],
+                          {'a': [1.0]})
+
+    def test_reveal_and_undo(self):
+        game = self.game
+        journal = MoveJournal(game.board)
+        red_word = self.identities.index(RED)
+        journal.mark()
+        self.assertEqual(game.reveal(red_word), RED)
+        self.assertEqual(game.remaining(RED), 8)
+        self.assertEqual(game.revealed, 1 << red_word)
+        token = game.board.tokens[0]
+        self.assertEqual((token[0], token[1].rank), (red_word, RED))
+        self.assertRaises(ValueError, game.reveal, red_word)
+        journal.undo()
+        self.assertEqual(game.revealed, 0)
+        self.assertEqual(game.remaining(RED), 9)
+        journal.close()
+
+    def test_other_tokens_ignored(self):
+        game = self.game
+        journal = MoveJournal(game.board)
+        journal.mark()
+        for token in ['chip', 7, (3,), ('word3', Card(rank=RED)),
+                      (3, 'red'), (3, Card(rank=9)), (99, Card(rank=RED)),
+                      (-1, Card(rank=RED))]:
+            game.board.add_token(token)
+        game.board.remove_token('chip')
+        self.assertEqual(game.revealed, 0)
+        game.reveal(3)
+        self.assertEqual(game.revealed, 1 << 3)
+        journal.undo()
+        self.assertEqual(game.revealed, 0)
+        self.assertEqual(game.board.tokens, [])
+
+    def test_clue_targets(self):
+        game = self.game
+        for reveal in [None] + list(range(0, 25, 3)):
+            if reveal is not None:
+                game.reveal(reveal)
+            for team in (RED, BLUE):
+                for margin in (0.0, 0.1):
+                    ranking = game.score_clues(team, limit=100,
+                                               margin=margin)
+                    found = dict(ranking)
+                    for clue in game.clues:
+                        self.assertEqual(
+                            sorted(found.get(clue, [])),
+                            brute_force_targets(game, team, clue, margin)
+                        )
+                    counts = [len(targets) for clue, targets in ranking]
+                    self.assertEqual(counts, sorted(counts, reverse=True))
+
+    def test_cache(self):
+        game = self.game
+        ranking = game.score_clues(RED, limit=5)
+        self.assertTrue(len(ranking) <= 5)
+        self.assertEqual(game.score_clues(RED, limit=5), ranking)
+        self.assertEqual(len(game._rankings), 1)
+        game.reveal(0)
+        game.score_clues(RED)
+        self.assertEqual(len(game._rankings), 2)
+        game.board.remove_token(game.board.tokens[0])
+        self.assertEqual(game.score_clues(RED, limit=5), ranking)
+        self.assertEqual(len(game._rankings), 2)
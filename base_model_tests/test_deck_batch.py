@@ -0,0 +1,139 @@
+# tests for DeckBatch in the deck_batch.py module
+
+import random
+import unittest
+
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.deck_batch import DeckBatch
+from base_models.packed_deck import PackedDeck
+from base_models.packed_deck import encode_card
+
+
+def rows_as_lists(rows):
+    """plain lists of ints for numpy or array module rows
+    """
+    return [[int(code) for code in row] for row in rows]
+
+
+class TestDeckBatchMethods(unittest.TestCase):
+    """TestCase class containing unit tests for the DeckBatch methods
+
+    i. decks survive conversion into a batch and back
+    ii. decks of different sizes raise a ValueError
+    iii. deal returns the next columns and stops at the end of the decks
+    iv. shuffle keeps each deck a permutation and is reproducible
+    v. three card decks shuffled many times have the expected outcome
+    vi. shuffle only reorders the cards left and reset gathers them back
+    """
+    def setUp(self):
+        list_card_attributes = [
+            {'rank': 1, 'value': 1},
+            {'rank': 3, 'value': 4},
+            {'rank': 4, 'value': 9}
+        ]
+        self.card_init_list = [
+            Card(**init_dict) for init_dict in list_card_attributes
+        ]
+        self.init_codes = [encode_card(card) for card in self.card_init_list]
+        self.large_init_list = [
+            Card(rank=1, value=i) for i in range(1, 53)
+        ]
+
+    def test_round_trip_through_decks(self):
+        """Decks survive conversion into a batch and back
+        """
+        decks = [
+            DeckOfCards(card_list=self.card_init_list),
+            PackedDeck(card_list=self.card_init_list[::-1])
+        ]
+        test_batch = DeckBatch.from_decks(decks)
+        self.assertEqual(test_batch.num_decks, 2)
+        self.assertEqual(test_batch.deck_size, 3)
+        self.assertEqual(
+            rows_as_lists(test_batch.rows),
+            [self.init_codes, self.init_codes[::-1]]
+        )
+        new_decks = test_batch.to_decks()
+        self.assertEqual(new_decks[0].show_top(), {'rank': 1, 'value': 1})
+        self.assertEqual(new_decks[1].show_top(), {'rank': 4, 'value': 9})
+        packed_decks = test_batch.to_decks(packed=True)
+        self.assertEqual(
+            list(packed_decks[1].to_codes()), self.init_codes[::-1]
+        )
+
+    def test_unequal_decks_raise_value_error(self):
+        """Decks of different sizes raise a ValueError
+        """
+        decks = [
+            DeckOfCards(card_list=self.card_init_list),
+            DeckOfCards(card_list=self.card_init_list[:2])
+        ]
+        with self.assertRaises(ValueError) as context:
+            DeckBatch.from_decks(decks)
+        with self.assertRaises(TypeError) as context:
+            DeckBatch.from_decks(['nonsense'])
+
+    def test_deal_columns(self):
+        """Deal returns the next columns and stops at the end of the decks
+        """
+        test_batch = DeckBatch.from_deck(
+            DeckOfCards(card_list=self.card_init_list), 4
+        )
+        dealt = test_batch.deal(2)
+        self.assertEqual(rows_as_lists(dealt), [self.init_codes[:2]] * 4)
+        self.assertEqual(test_batch.cards_left, 1)
+        dealt = test_batch.deal(2)
+        self.assertEqual(rows_as_lists(dealt), [self.init_codes[2:]] * 4)
+        self.assertEqual(test_batch.cards_left, 0)
+        self.assertEqual(test_batch.to_decks()[0].cards_left, 0)
+
+    def test_shuffle_permutes_each_deck(self):
+        """Shuffle keeps each deck a permutation and is reproducible
+        """
+        deck = DeckOfCards(card_list=self.large_init_list)
+        first_batch = DeckBatch.from_deck(deck, 50)
+        second_batch = DeckBatch.from_deck(deck, 50)
+        first_batch.shuffle(rng=random.Random(8))
+        second_batch.shuffle(rng=random.Random(8))
+        first_rows = rows_as_lists(first_batch.rows)
+        self.assertEqual(first_rows, rows_as_lists(second_batch.rows))
+        sorted_codes = sorted([encode_card(c) for c in self.large_init_list])
+        for row in first_rows:
+            self.assertEqual(sorted(row), sorted_codes)
+        self.assertTrue(len(set([tuple(row) for row in first_rows])) > 45)
+
+    def test_shuffling_short_decks(self):
+        """Three card decks shuffled many times have the expected outcome
+
+        same bounds as the DeckOfCards test, each card should land in
+        each position close to 3333 times across 10000 decks
+        """
+        test_batch = DeckBatch.from_deck(
+            DeckOfCards(card_list=self.card_init_list), 10000
+        )
+        test_batch.shuffle()
+        location_count_array = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+        for row in rows_as_lists(test_batch.rows):
+            for position, code in enumerate(row):
+                card_index = self.init_codes.index(code)
+                location_count_array[card_index][position] += 1
+        minimum_count = min([min(row) for row in location_count_array])
+        maximum_count = max([max(row) for row in location_count_array])
+        self.assertTrue(minimum_count > 3100)
+        self.assertTrue(maximum_count < 3500)
+
+    def test_shuffle_after_deal_and_reset(self):
+        """Shuffle only reorders the cards left and reset gathers them back
+        """
+        test_batch = DeckBatch.from_deck(
+            DeckOfCards(card_list=self.large_init_list), 20
+        )
+        dealt = rows_as_lists(test_batch.deal(5))
+        test_batch.shuffle()
+        top_codes = [encode_card(c) for c in self.large_init_list[:5]]
+        for row in rows_as_lists(test_batch.rows):
+            self.assertEqual(row[:5], top_codes)
+        self.assertEqual(dealt, [top_codes] * 20)
+        test_batch.reset()
+        self.assertEqual(test_batch.cards_left, 52)
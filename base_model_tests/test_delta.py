@@ -0,0 +1,172 @@
+# tests for the Board deltas in the delta.py module
+
+import random
+import unittest
+
+from base_models.board import Board
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.delta import Viewer
+from base_models.delta import apply_delta
+from base_models.delta import diff
+from base_models.delta import view_of
+from base_models.dice import DiceRoller
+from base_models.journal import MoveJournal
+from base_models.registry import standard_deck
+from base_models.tiles import Tile
+
+
+def snapshot_state(snapshot):
+    """plain description of a snapshot for comparing states
+    """
+    return (
+        list(snapshot.spaces),
+        list(snapshot.tiles),
+        [deck.card_list for deck in snapshot.decks],
+        list(snapshot.dice),
+        list(snapshot.tokens),
+        snapshot.score
+    )
+
+
+class TestDelta(unittest.TestCase):
+    """TestCase class containing unit tests for diff and apply_delta
+
+    i. applying the delta of each move rebuilds the newer state
+    ii. delta size follows what changed, not the board size
+    iii. decks changed at both ends send only the changed cards
+    iv. viewers only see the card counts of decks hidden from them
+    v. a shuffle after bottom deals sends the whole deck
+    """
+    def setUp(self):
+        self.tiles = [Tile(rank=1, value=i) for i in range(4)]
+        self.test_board = Board(
+            spaces=[0] * 2000,
+            tiles=list(self.tiles),
+            decks=[standard_deck(), DeckOfCards(), DeckOfCards()],
+            tokens=['chip'],
+            dice_rollers=[DiceRoller()],
+            score=0
+        )
+
+    def random_move(self, rng):
+        board = self.test_board
+        choice = rng.randrange(7)
+        if choice == 0:
+            board.set_space(rng.randrange(2000), rng.randrange(9))
+        elif choice == 1 and board.tiles:
+            board.place_tile(rng.randrange(2000), board.tiles[-1])
+        elif choice == 2 and board.decks[0].cards_left:
+            board.add_card(rng.randrange(1, 3), board.deal_card(0))
+        elif choice == 3 and board.decks[0].cards_left:
+            board.add_card(0, board.deal_card(0, bottom_deal=True),
+                           bottom_add=True)
+        elif choice == 4:
+            board.roll_dice(0, rng=rng)
+        elif choice == 5:
+            board.add_token(rng.randrange(5))
+        else:
+            board.set_score(rng.randrange(100))
+
+    def test_apply_rebuilds_newer_state(self):
+        """applying the delta of each move rebuilds the newer state
+        """
+        rng = random.Random(19)
+        journal = MoveJournal(self.test_board)
+        client_state = self.test_board.snapshot()
+        for move in range(150):
+            old_snapshot = self.test_board.snapshot()
+            journal.mark()
+            self.random_move(rng)
+            if move % 10 == 9:
+                journal.undo()
+            if move % 25 == 24:
+                self.test_board.shuffle_deck(0, rng=rng)
+            delta = diff(old_snapshot, self.test_board)
+            client_state = apply_delta(client_state, delta)
+            self.assertEqual(snapshot_state(client_state),
+                             snapshot_state(self.test_board.snapshot()))
+
+    def test_delta_size_follows_changes(self):
+        """delta size follows what changed, not the board size
+        """
+        old_snapshot = self.test_board.snapshot()
+        self.test_board.set_space(1500, 'road')
+        dealt_card = self.test_board.deal_card(0)
+        self.test_board.add_card(1, dealt_card)
+        delta = diff(old_snapshot, self.test_board)
+        self.assertEqual(sorted(delta.keys()), ['decks', 'spaces'])
+        self.assertEqual(delta['spaces'],
+                         {'length': 2000, 'set': [(1500, 'road')]})
+        self.assertEqual(delta['decks'][0]['top_removed'], 1)
+        self.assertEqual(delta['decks'][1],
+                         {'cards': [dealt_card], 'ordered': True})
+        self.assertEqual(diff(self.test_board, self.test_board), {})
+
+    def test_deck_ends(self):
+        """decks changed at both ends send only the changed cards
+        """
+        board = self.test_board
+        old_snapshot = board.snapshot()
+        bottom_card = board.deal_card(0, bottom_deal=True)
+        board.deal_card(0)
+        board.add_card(0, bottom_card, bottom_add=True)
+        extra_card = Card(rank=5, value=5)
+        board.add_card(0, extra_card)
+        deck_delta = diff(old_snapshot, board)['decks'][0]
+        self.assertEqual(deck_delta['top_removed'], 1)
+        self.assertEqual(deck_delta['top_added'], [extra_card])
+        self.assertEqual(deck_delta['bottom_removed'], 0)
+        self.assertEqual(deck_delta['bottom_added'], [])
+        shuffled_snapshot = board.snapshot()
+        board.shuffle_deck(0, rng=random.Random(1))
+        self.assertEqual(len(diff(shuffled_snapshot, board)['decks'][0]
+                             ['cards']), 52)
+
+    def test_viewer_filtering(self):
+        """viewers only see the card counts of decks hidden from them
+        """
+        board = self.test_board
+        viewer = Viewer(player='north', hidden_decks=[0],
+                        hands={1: 'north', 2: 'south'})
+        client_state = view_of(board.snapshot(), viewer)
+        rng = random.Random(23)
+        for move in range(60):
+            old_snapshot = board.snapshot()
+            self.random_move(rng)
+            if move % 20 == 19:
+                board.shuffle_deck(0, rng=rng)
+            delta = diff(old_snapshot, board, viewer=viewer)
+            for index in (0, 2):
+                if index in delta.get('decks', {}):
+                    self.assertEqual(list(delta['decks'][index].keys()),
+                                     ['cards_left'])
+            client_state = apply_delta(client_state, delta)
+        self.assertEqual(snapshot_state(client_state),
+                         snapshot_state(view_of(board, viewer)))
+        self.assertTrue(viewer.can_see(1))
+        self.assertFalse(Viewer(player='south', hands={1: 'north'})
+                         .can_see(1))
+
+    def test_shuffle_after_bottom_deals(self):
+        """a shuffle after bottom deals sends the whole deck
+        """
+        board = self.test_board
+        board.snapshot()
+        for card in range(5):
+            board.deal_card(0, bottom_deal=True)
+        old_snapshot = board.snapshot()
+        self.assertEqual(old_snapshot.decks[0]._start, 5)
+        board.shuffle_deck(0, rng=random.Random(4))
+        board.deal_card(0)
+        board.deal_card(0)
+        delta = diff(old_snapshot, board)
+        self.assertEqual(snapshot_state(apply_delta(old_snapshot, delta)),
+                         snapshot_state(board.snapshot()))
+        for card in range(44):
+            board.deal_card(0)
+        delta = diff(old_snapshot, board)
+        self.assertEqual(delta['decks'][0],
+                         {'cards': board.decks[0].card_list, 'ordered': True})
+        self.assertEqual(snapshot_state(apply_delta(old_snapshot, delta)),
+                         snapshot_state(board.snapshot()))
@@ -2,6 +2,7 @@
 # this module is meant to contain tests that I expect the classes
 # written in 'dice.py' should pass
 
+import random
 import unittest
 from collections import Counter
 
@@ -23,6 +24,7 @@ class TestSingleDieMethods(unittest.TestCase):
         number of outcomes in the list
     iv. get a reasonable error when I initialize with an unreasonable initial
         condition set
+    v. a batch from roll_many has the same distribution as repeated rolls
     """
     def test_default_initialization(self):
         """Test that when I initialize with no args I get a SingleDie object
@@ -67,6 +69,24 @@ class TestSingleDieMethods(unittest.TestCase):
         with self.assertRaises(ValueError) as context:
             SingleDie(0)
 
+    def test_roll_many_creates_distribution(self):
+        """A batch from roll_many should have the expected values
+
+        same bounds as the 400 roll series above; face_value is left
+        at the last roll of the batch
+        """
+        test_die = SingleDie()
+        roll_series = test_die.roll_many(400)
+        roll_counter = Counter([int(face) for face in roll_series])
+        roll_coverage = sorted(roll_counter.keys())
+        roll_maximum = max([i for i in roll_counter.values()])
+        roll_minimum = min([i for i in roll_counter.values()])
+        self.assertEqual(len(roll_series), 400)
+        self.assertEqual(roll_coverage, list(range(1, 7)))
+        self.assertTrue(roll_maximum < 250)
+        self.assertTrue(roll_minimum > 10)
+        self.assertEqual(test_die.face_value, roll_series[-1])
+
 
 class TestDiceRollerMethods(unittest.TestCase):
     """TestCase class containing unit tests for the DiceRoller methods
@@ -82,6 +102,8 @@ class TestDiceRollerMethods(unittest.TestCase):
         number of outcomes in the list
     iv. get a reasonable error when I initialize with an unreasonable initial
         condition set
+    v. a batch from roll_many has the same distribution as repeated rolls
+        and the per-roll sums match the per-die faces
     """
     def test_default_initialization(self):
         """Test when initialized with no args I get a DiceRoller object
@@ -150,3 +172,34 @@ class TestDiceRollerMethods(unittest.TestCase):
         }
         with self.assertRaises(TypeError) as context:
             DiceRoller(**initial_attributes)
+
+    def test_roll_many_creates_distribution(self):
+        """A batch from roll_many should have the expected values
+
+        same bounds as the 2000 roll series above, and each sum
+        should equal the faces rolled for it
+        """
+        test_dice_roll = DiceRoller()
+        faces, sums = test_dice_roll.roll_many(2000, rng=random.Random(7))
+        if hasattr(faces, 'ravel'):
+            faces = faces.ravel()
+        face_list = [int(face) for face in faces]
+        sum_list = [int(roll_sum) for roll_sum in sums]
+        self.assertEqual(len(face_list), 4000)
+        self.assertEqual(
+            sum_list,
+            [face_list[i] + face_list[i + 1] for i in range(0, 4000, 2)]
+        )
+        roll_counter = Counter(sum_list)
+        roll_coverage = sorted(roll_counter.keys())
+        roll_maximum = max([i for i in roll_counter.values()])
+        roll_minimum = min([i for i in roll_counter.values()])
+        roll_most_common = roll_counter.most_common(1)
+        self.assertEqual(roll_coverage, list(range(2, 13)))
+        self.assertTrue(roll_maximum < 700)
+        self.assertTrue(roll_minimum > 20)
+        self.assertEqual(roll_most_common[0][0], 7)
+        self.assertEqual(test_dice_roll.roll_value, sum_list[-1])
+        self.assertEqual(
+            [die.face_value for die in test_dice_roll.dice], face_list[-2:]
+        )
@@ -0,0 +1,114 @@
+# tests for the exact dice sum distributions and alias sampler
+# in the distributions.py module
+
+import random
+import unittest
+from collections import Counter
+from fractions import Fraction
+from itertools import product
+
+from base_models.distributions import AliasSampler
+from base_models.distributions import pool_distribution
+from base_models.distributions import roll_distribution
+from base_models.dice import DiceRoller
+
+
+class TestRollDistribution(unittest.TestCase):
+    """TestCase class containing unit tests for RollDistribution
+
+    i. two six sided dice have the familiar triangular counts
+    ii. a mixed pool matches brute force enumeration of the faces
+    iii. probabilities and cdf are exact and bounded
+    iv. the same pool in any order comes back from the cache
+    v. a pool with a zero sided die raises a ValueError
+    """
+    def test_two_six_sided_dice(self):
+        """Two six sided dice have the familiar triangular counts
+        """
+        distribution = roll_distribution(6, 2)
+        self.assertEqual(distribution.min_sum, 2)
+        self.assertEqual(distribution.max_sum, 12)
+        self.assertEqual(
+            distribution.counts, (1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1)
+        )
+        self.assertEqual(distribution.total_outcomes, 36)
+        self.assertEqual(distribution.mean(), 7)
+
+    def test_mixed_pool_matches_enumeration(self):
+        """A mixed pool matches brute force enumeration of the faces
+        """
+        sides = [4, 6, 8, 3]
+        faces = [range(1, num_sides + 1) for num_sides in sides]
+        expected = Counter([sum(roll) for roll in product(*faces)])
+        distribution = pool_distribution(sides)
+        for value, count in expected.items():
+            self.assertEqual(distribution.count(value), count)
+        self.assertEqual(distribution.total_outcomes, 4 * 6 * 8 * 3)
+
+    def test_probability_and_cdf(self):
+        """Probabilities and cdf are exact and bounded
+        """
+        distribution = roll_distribution(6, 3)
+        self.assertEqual(distribution.probability(3), Fraction(1, 216))
+        self.assertEqual(distribution.probability(2), 0)
+        self.assertEqual(distribution.probability(19), 0)
+        self.assertEqual(distribution.cdf(2), 0)
+        self.assertEqual(distribution.cdf(10), Fraction(1, 2))
+        self.assertEqual(distribution.cdf(18), 1)
+        self.assertEqual(sum(distribution.pmf().values()), 1)
+
+    def test_pool_order_shares_cache(self):
+        """The same pool in any order comes back from the cache
+        """
+        self.assertTrue(
+            pool_distribution([8, 4, 6]) is pool_distribution([6, 8, 4])
+        )
+        self.assertTrue(roll_distribution(6, 2) is pool_distribution([6, 6]))
+
+    def test_zero_sided_die_raises_value_error(self):
+        """A pool with a zero sided die raises a ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            pool_distribution([6, 0])
+        with self.assertRaises(ValueError) as context:
+            pool_distribution([])
+
+
+class TestAliasSampler(unittest.TestCase):
+    """TestCase class containing unit tests for AliasSampler
+
+    i. samples follow the weights, including zero weight outcomes
+    ii. DiceRoller.sample_sum draws sums with the roll distribution
+    iii. mismatched outcomes and weights raise a ValueError
+    """
+    def test_samples_follow_weights(self):
+        """Samples follow the weights, including zero weight outcomes
+        """
+        sampler = AliasSampler(['a', 'b', 'c'], [1, 0, 3])
+        counter = Counter(sampler.sample_many(8000))
+        self.assertEqual(counter['b'], 0)
+        self.assertTrue(1700 < counter['a'] < 2300)
+        self.assertTrue(5700 < counter['c'] < 6300)
+
+    def test_dice_roller_sample_sum(self):
+        """DiceRoller.sample_sum draws sums with the roll distribution
+
+        across 2000 draws every sum hits, 7 is the most common
+        """
+        test_dice_roll = DiceRoller()
+        rng = random.Random(7)
+        roll_series = [
+            test_dice_roll.sample_sum(rng=rng) for i in range(2000)
+        ]
+        roll_counter = Counter(roll_series)
+        self.assertEqual(sorted(roll_counter.keys()), list(range(2, 13)))
+        self.assertEqual(roll_counter.most_common(1)[0][0], 7)
+        self.assertEqual(test_dice_roll.roll_value, roll_series[-1])
+
+    def test_bad_weights_raise_value_error(self):
+        """Mismatched outcomes and weights raise a ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            AliasSampler(['a', 'b'], [1])
+        with self.assertRaises(ValueError) as context:
+            AliasSampler(['a'], [0])
@@ -0,0 +1,146 @@
+# tests for the hold'em equity calculator in the equity.py module
+
+import unittest
+from itertools import combinations
+
+from base_models.board import Board
+from base_models.cards import DeckOfCards
+from base_models.equity import _choose
+from base_models.equity import _unrank_combination
+from base_models.equity import board_equity
+from base_models.equity import hand_equity
+from base_models.poker import evaluate
+from base_models.registry import default_registry
+from base_models.registry import standard_deck
+
+
+def brute_force_equity(hole_cards, board_cards):
+    """equity of each player found by evaluating every run-out directly
+    """
+    known = set([id(card) for cards in hole_cards for card in cards] +
+                [id(card) for card in board_cards])
+    unseen = [card for card in standard_deck().card_list
+              if id(card) not in known]
+    totals = [0.0] * len(hole_cards)
+    runouts = list(combinations(unseen, 5 - len(board_cards)))
+    for runout in runouts:
+        values = [evaluate(list(cards) + list(board_cards) + list(runout))
+                  for cards in hole_cards]
+        winners = [i for i, value in enumerate(values)
+                   if value == max(values)]
+        for i in winners:
+            totals[i] += 1.0 / len(winners)
+    return [total / len(runouts) for total in totals]
+
+
+class TestHandEquity(unittest.TestCase):
+    """TestCase class containing unit tests for hold'em equity
+
+    i. colex unranking inverts the combinatorial number system
+    ii. enumerated turn and flop equity matches brute force
+    iii. two worker processes give the same exact equity as one
+    iv. sampled equity is seeded and close to the exact answer
+    v. board_equity reads the stub and community cards from a Board
+    vi. a card dealt twice raises a ValueError
+    vii. preflop equity is counted over every run-out
+    """
+    def setUp(self):
+        card = default_registry.card
+        self.aces = [card(4, 14), card(3, 14)]
+        self.kings = [card(4, 13), card(3, 13)]
+        self.suited = [card(1, 10), card(1, 11)]
+        self.flop = [card(1, 2), card(2, 7), card(1, 9)]
+        self.turn = self.flop + [card(3, 12)]
+
+    def test_unrank_combination(self):
+        """colex unranking inverts the combinatorial number system
+        """
+        for rank in [0, 1, 5, 100, 12345, _choose(48, 5) - 1]:
+            combination = _unrank_combination(rank, 5)
+            self.assertEqual(combination, sorted(set(combination)))
+            self.assertEqual(
+                sum([_choose(index, i + 1)
+                     for i, index in enumerate(combination)]),
+                rank
+            )
+
+    def test_enumeration_matches_brute_force(self):
+        """enumerated turn and flop equity matches brute force
+        """
+        hole_cards = [self.aces, self.kings, self.suited]
+        result = hand_equity(hole_cards, board_cards=self.turn)
+        expected = brute_force_equity(hole_cards, self.turn)
+        self.assertTrue(result.exact)
+        self.assertEqual(result.num_runouts, 42)
+        for equity, expected_equity in zip(result.equities, expected):
+            self.assertAlmostEqual(equity, expected_equity)
+        result = hand_equity(hole_cards[:2], board_cards=self.flop)
+        expected = brute_force_equity(hole_cards[:2], self.flop)
+        self.assertEqual(result.num_runouts, 990)
+        for equity, expected_equity in zip(result.equities, expected):
+            self.assertAlmostEqual(equity, expected_equity)
+        self.assertAlmostEqual(sum(result.equities), 1.0)
+        result = hand_equity([self.suited, self.kings],
+                             board_cards=self.flop, num_workers=2)
+        expected = brute_force_equity([self.suited, self.kings], self.flop)
+        for equity, expected_equity in zip(result.equities, expected):
+            self.assertAlmostEqual(equity, expected_equity)
+
+    def test_workers_match_single_process(self):
+        """two worker processes give the same exact equity as one
+        """
+        hole_cards = [self.aces, self.suited]
+        single_result = hand_equity(hole_cards, board_cards=self.flop)
+        pool_result = hand_equity(hole_cards, board_cards=self.flop,
+                                  num_workers=2)
+        self.assertEqual(single_result.equities, pool_result.equities)
+
+    def test_sampled_equity(self):
+        """sampled equity is seeded and close to the exact answer
+        """
+        hole_cards = [self.aces, self.kings]
+        exact = hand_equity(hole_cards, board_cards=self.flop)
+        first = hand_equity(hole_cards, board_cards=self.flop,
+                            max_enumeration=0, num_samples=4000, seed=3)
+        second = hand_equity(hole_cards, board_cards=self.flop,
+                             max_enumeration=0, num_samples=4000, seed=3)
+        self.assertFalse(first.exact)
+        self.assertEqual(first.equities, second.equities)
+        for player in range(2):
+            self.assertTrue(first.margins[player] > 0)
+            self.assertTrue(
+                abs(first.equities[player] - exact.equities[player]) <
+                2 * first.margins[player]
+            )
+
+    def test_board_equity(self):
+        """board_equity reads the stub and community cards from a Board
+        """
+        stub = standard_deck()
+        for card in self.aces + self.kings:
+            stub.card_list = [c for c in stub.card_list if c is not card]
+        community = DeckOfCards(card_list=self.turn)
+        test_board = Board(decks=[stub, community])
+        result = board_equity(test_board, [self.aces, self.kings],
+                              community_index=1)
+        expected = hand_equity([self.aces, self.kings],
+                               board_cards=self.turn)
+        self.assertEqual(result.equities, expected.equities)
+        self.assertEqual(result.num_runouts, 44)
+
+    def test_card_dealt_twice_raises_value_error(self):
+        """a card dealt twice raises a ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            hand_equity([self.aces, self.aces])
+        with self.assertRaises(ValueError) as context:
+            hand_equity([self.aces])
+
+    def test_preflop_equity(self):
+        """preflop equity is counted over every run-out
+        """
+        result = hand_equity([self.aces, self.kings])
+        self.assertTrue(result.exact)
+        self.assertEqual(result.num_runouts, _choose(48, 5))
+        self.assertAlmostEqual(result.equities[0], 0.8264, places=4)
+        self.assertAlmostEqual(sum(result.equities), 1.0)
@@ -0,0 +1,167 @@
+# tests for the append-only event log in the event_log.py module
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from base_models.board import Board
+from base_models.cards import Card
+from base_models.dice import DiceRoller
+from base_models.event_log import DEAL
+from base_models.event_log import GAME
+from base_models.event_log import EventLog
+from base_models.event_log import EventLogWriter
+from base_models.registry import standard_deck
+from base_models.shoe import Shoe
+from base_models.tiles import Tile
+
+
+def board_state(board):
+    """plain description of a board for comparing states
+    """
+    def describe(obj):
+        if isinstance(obj, Card):
+            return obj.to_dict()
+        return obj
+    return (
+        [describe(space) for space in board.spaces],
+        [describe(tile) for tile in board.tiles],
+        [sorted([tuple(sorted(card.to_dict().items()))
+                 for card in deck.card_list])
+         if not deck.ordered else
+         [card.to_dict() for card in deck.card_list]
+         for deck in board.decks],
+        [[die.face_value for die in roller.dice]
+         for roller in board.dice_rollers],
+        [roller.roll_value for roller in board.dice_rollers],
+        [describe(token) for token in board.tokens],
+        board.score
+    )
+
+
+class TestEventLog(unittest.TestCase):
+    """TestCase class containing unit tests for the event log
+
+    i. the board at any turn of any game is rebuilt from the log
+    ii. periodic and fallback checkpoints rebuild the same states
+    iii. records stream in order with their game and turn
+    iv. a writer reopened on a log appends to it
+    v. unknown turns raise KeyError and game ids must increase
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'games')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_board(self):
+        return Board(
+            spaces=[0] * 6,
+            tiles=[Tile(num_edges=6, rank=1, value=i) for i in range(3)],
+            decks=[standard_deck(), Shoe(templates=[standard_deck()])],
+            tokens=['chip'],
+            dice_rollers=[DiceRoller()],
+            score=0
+        )
+
+    def play_games(self, writer, num_games, num_turns, seed):
+        """play random games, returning the board state at each turn
+        """
+        rng = random.Random(seed)
+        states = {}
+        for game in range(num_games):
+            board = self.make_board()
+            writer.begin_game(board)
+            for turn in range(num_turns):
+                if turn:
+                    writer.begin_turn()
+                states[(writer.game, turn)] = board_state(board)
+                board.shuffle_deck(0, rng=rng)
+                board.roll_dice(0, rng=rng)
+                board.add_card(1, board.deal_card(0))
+                board.add_card(0, board.deal_card(1), bottom_add=True)
+                if board.tiles:
+                    board.place_tile(turn % 6, board.tiles[0])
+                board.set_score(board.score + 2)
+                board.add_token(turn)
+                if turn % 3 == 0:
+                    board.set_space(5, 'road {}'.format(turn))
+                if isinstance(board.spaces[turn % 6], Tile):
+                    board.remove_tile(turn % 6, empty=None)
+            writer.end_game()
+        return states
+
+    def test_rebuild_any_turn(self):
+        """the board at any turn of any game is rebuilt from the log
+        """
+        with EventLogWriter(self.path, buffer_records=7) as writer:
+            states = self.play_games(writer, 3, 6, seed=4)
+        with EventLog(self.path) as event_log:
+            self.assertEqual(len(event_log.turns()), 18)
+            for (game, turn), state in sorted(states.items()):
+                self.assertEqual(
+                    board_state(event_log.board_at(game, turn)), state
+                )
+
+    def test_checkpoints(self):
+        """periodic and fallback checkpoints rebuild the same states
+        """
+        with EventLogWriter(self.path, checkpoint_every=2) as writer:
+            states = self.play_games(writer, 2, 7, seed=9)
+        with EventLog(self.path) as event_log:
+            for (game, turn), state in sorted(states.items()):
+                self.assertEqual(
+                    board_state(event_log.board_at(game, turn)), state
+                )
+
+    def test_streaming_records(self):
+        """records stream in order with their game and turn
+        """
+        with EventLogWriter(self.path) as writer:
+            self.play_games(writer, 2, 3, seed=1)
+        with EventLog(self.path) as event_log:
+            records = list(event_log)
+            self.assertEqual(len(records), len(event_log))
+            self.assertEqual(records[0].kind, GAME)
+            self.assertEqual(
+                [record.game for record in records],
+                sorted([record.game for record in records])
+            )
+            deals = [record for record in records if record.kind == DEAL]
+            self.assertEqual(len(deals), 12)
+            self.assertEqual(event_log.record(event_log.find(1, 2)).turn, 2)
+            self.assertEqual(
+                list(event_log.records(3, 5)), records[3:5]
+            )
+
+    def test_reopened_writer_appends(self):
+        """a writer reopened on a log appends to it
+        """
+        with EventLogWriter(self.path) as writer:
+            first_states = self.play_games(writer, 1, 3, seed=2)
+        with EventLogWriter(self.path) as writer:
+            second_states = self.play_games(writer, 1, 3, seed=3)
+        self.assertEqual(sorted(second_states)[0], (1, 0))
+        with EventLog(self.path) as event_log:
+            self.assertEqual(board_state(event_log.board_at(0, 2)),
+                             first_states[(0, 2)])
+            self.assertEqual(board_state(event_log.board_at(1, 2)),
+                             second_states[(1, 2)])
+
+    def test_errors(self):
+        """unknown turns raise KeyError and game ids must increase
+        """
+        with EventLogWriter(self.path) as writer:
+            self.play_games(writer, 1, 2, seed=5)
+            with self.assertRaises(ValueError) as context:
+                writer.begin_game(self.make_board(), game=0)
+        with EventLog(self.path) as event_log:
+            with self.assertRaises(KeyError) as context:
+                event_log.board_at(0, 5)
+            with self.assertRaises(IndexError) as context:
+                event_log.record(len(event_log))
+        with EventLog(os.path.join(self.directory, 'empty')) as event_log:
+            self.assertEqual(list(event_log), [])
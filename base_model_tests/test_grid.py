@@ -0,0 +1,126 @@
+# tests for the grid indexes in the grid.py module
+
+import unittest
+
+from base_models.board import Board
+from base_models.grid import GridIndex
+from base_models.grid import HexGrid
+from base_models.grid import SquareGrid
+from base_models.grid import cell_values
+from base_models.tiles import Tile
+
+
+class TestGrid(unittest.TestCase):
+    """TestCase class containing unit tests for HexGrid and SquareGrid
+
+    i. a radius 2 hex grid has the cells, vertices and edges of Settlers
+    ii. coordinates and indexes map both ways and neighbors are mutual
+    iii. cells, vertices and edges agree on what touches what
+    iv. value queries find the vertices next to tiles with a value
+    v. a GridIndex subclass needs only its direction and corner tables
+    """
+    def setUp(self):
+        self.hexes = HexGrid(2)
+        self.squares = SquareGrid(3, 2)
+
+    def test_counts(self):
+        self.assertEqual(len(self.hexes), 19)
+        self.assertEqual(self.hexes.num_vertices, 54)
+        self.assertEqual(self.hexes.num_edges, 72)
+        self.assertEqual(len(self.squares), 6)
+        self.assertEqual(self.squares.num_vertices, 12)
+        self.assertEqual(self.squares.num_edges, 17)
+        self.assertEqual(len(HexGrid(0)), 1)
+        self.assertEqual(HexGrid(0).num_vertices, 6)
+
+    def test_grid_from_tables(self):
+        class StripGrid(GridIndex):
+            directions = ((0, -1), (1, 0), (0, 1), (-1, 0))
+            corners = ((0, 0), (2, 0), (2, 2), (0, 2))
+            corner_scale = 2
+
+        strip = StripGrid([(x, 0) for x in range(3)])
+        self.assertEqual(strip.num_vertices, 8)
+        self.assertEqual(strip.num_edges, 10)
+        self.assertEqual(strip.corner_key((1, 0), 1), (4, 0))
+        self.assertEqual(list(strip.neighbors[4:8]), [-1, 2, -1, 0])
+
+    def test_coordinates(self):
+        for grid in (self.hexes, self.squares):
+            for index, coord in enumerate(grid.coords):
+                self.assertEqual(grid.index(coord), index)
+                self.assertEqual(grid.coord(index), coord)
+                self.assertIn(coord, grid)
+        self.assertEqual(self.hexes.index((0, 0)), 9)
+        self.assertEqual(self.squares.index((2, 1)), 5)
+        self.assertNotIn((3, 0), self.hexes)
+        self.assertRaises(KeyError, self.hexes.index, (3, 0))
+        self.assertRaises(KeyError, self.squares.index, (3, 0))
+        self.assertEqual(HexGrid.distance((0, 0), (2, -1)), 2)
+
+    def test_neighbors(self):
+        for grid in (self.hexes, self.squares):
+            for index in range(len(grid)):
+                for neighbor in grid.neighbors_of(index):
+                    if neighbor != -1:
+                        self.assertIn(index, grid.neighbors_of(neighbor))
+        center = self.hexes.neighbors_of(self.hexes.index((0, 0)))
+        self.assertNotIn(-1, center)
+        self.assertEqual(
+            sorted(self.hexes.coord(index) for index in center),
+            sorted([(1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1)])
+        )
+        self.assertEqual(self.squares.neighbors_of(0), [-1, 1, 3, -1])
+
+    def test_adjacency(self):
+        grid = self.hexes
+        for index in range(len(grid)):
+            vertices = grid.vertices_of(index)
+            neighbors = grid.neighbors_of(index)
+            for side, edge in enumerate(grid.edges_of(index)):
+                ends = grid.edge_ends(edge)
+                self.assertEqual(
+                    sorted(ends), sorted([vertices[side],
+                                          vertices[(side + 1) % 6]])
+                )
+                cells = grid.cells_of_edge(edge)
+                self.assertIn(index, cells)
+                if neighbors[side] != -1:
+                    self.assertEqual(sorted(cells),
+                                     sorted([index, neighbors[side]]))
+                else:
+                    self.assertEqual(cells, [index])
+                self.assertIn(ends[1], grid.vertices_next_to(ends[0]))
+            for vertex in vertices:
+                self.assertIn(index, grid.cells_of_vertex(vertex))
+        shared = [vertex for vertex in range(grid.num_vertices)
+                  if len(grid.cells_of_vertex(vertex)) == 3]
+        self.assertEqual(len(shared), 24)
+        self.assertTrue(all(
+            len(grid.vertices_next_to(vertex)) in (2, 3)
+            for vertex in range(grid.num_vertices)
+        ))
+
+    def test_value_queries(self):
+        grid = self.hexes
+        board = grid.new_board()
+        self.assertIsInstance(board, Board)
+        self.assertEqual(len(board.spaces), 19)
+        board.spaces[grid.index((0, 0))] = Tile(num_edges=6, value=8)
+        board.spaces[grid.index((1, 0))] = Tile(num_edges=6, value=8)
+        board.spaces[grid.index((-2, 2))] = 6
+        values = cell_values(board.spaces)
+        self.assertEqual(
+            grid.cells_with_value(values, 8),
+            sorted([grid.index((0, 0)), grid.index((1, 0))])
+        )
+        hits = grid.vertex_hits(values, 8)
+        self.assertEqual(sum(hits), 12)
+        self.assertEqual(sorted(hits).count(2), 2)
+        self.assertEqual(len(grid.vertices_with_value(values, 8)), 10)
+        self.assertEqual(grid.vertices_with_value(values, 6),
+                         sorted(grid.vertices_of(grid.index((-2, 2)))))
+        many = grid.vertex_hits_many([values, cell_values([0] * 19)], 8)
+        self.assertEqual(list(many[0]), list(hits))
+        self.assertEqual(sum(many[1]), 0)
+
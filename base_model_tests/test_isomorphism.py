@@ -0,0 +1,74 @@
+# tests for suit canonicalization in the isomorphism.py module
+
+import unittest
+from itertools import combinations
+
+from base_models.isomorphism import SUIT_PERMUTATIONS
+from base_models.isomorphism import canonical_key
+from base_models.isomorphism import canonicalize
+from base_models.isomorphism import inverse_permutation
+from base_models.isomorphism import permute
+from base_models.packed_deck import encode_card
+from base_models.registry import default_registry
+from base_models.registry import standard_deck
+
+
+class TestCanonicalize(unittest.TestCase):
+    """TestCase class containing unit tests for suit canonicalization
+
+    i. the 1326 starting hands fall into the 169 classic classes
+    ii. every suit relabelling of a state has the same canonical form
+    iii. the returned permutation maps the state onto its canonical form
+    iv. states that differ by more than suits stay apart
+    v. cards that are not standard raise a ValueError
+    """
+    def setUp(self):
+        card = default_registry.card
+        self.hole = [card(3, 14), card(3, 13)]
+        self.board = [card(3, 2), card(1, 9), card(4, 9)]
+
+    def test_starting_hand_classes(self):
+        """the 1326 starting hands fall into the 169 classic classes
+        """
+        codes = [encode_card(card) for card in standard_deck().card_list]
+        classes = set([
+            canonical_key([hand]) for hand in combinations(codes, 2)
+        ])
+        self.assertEqual(len(classes), 169)
+
+    def test_relabelled_states_match(self):
+        """every suit relabelling of a state has the same canonical form
+        """
+        state = [self.hole, self.board]
+        expected = canonical_key(state)
+        for permutation in SUIT_PERMUTATIONS:
+            self.assertEqual(
+                canonical_key(permute(state, permutation)), expected
+            )
+
+    def test_permutation_maps_to_canonical(self):
+        """the returned permutation maps the state onto its canonical form
+        """
+        state = [self.hole, self.board]
+        canonical, permutation = canonicalize(state)
+        self.assertEqual(permute(state, permutation), canonical)
+        restored = permute(canonical, inverse_permutation(permutation))
+        self.assertEqual(restored, permute(state, (1, 2, 3, 4)))
+
+    def test_different_states_stay_apart(self):
+        """states that differ by more than suits stay apart
+        """
+        card = default_registry.card
+        suited = [card(1, 14), card(1, 13)]
+        offsuit = [card(1, 14), card(2, 13)]
+        self.assertNotEqual(canonical_key([suited]), canonical_key([offsuit]))
+        self.assertNotEqual(
+            canonical_key([self.hole, self.board]),
+            canonical_key([self.board, self.hole])
+        )
+
+    def test_non_standard_cards_raise_value_error(self):
+        """cards that are not standard raise a ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            canonicalize([[default_registry.card(7, 2)]])
@@ -0,0 +1,194 @@
+# tests for the MoveJournal undo log in the journal.py module
+
+import copy
+import random
+import unittest
+
+from base_models.board import Board
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.dice import DiceRoller
+from base_models.journal import MoveJournal
+from base_models.shoe import Shoe
+from base_models.tiles import Tile
+
+
+def board_state(board):
+    """plain description of a board for comparing states
+    """
+    return (
+        [getattr(space, 'value', space) for space in board.spaces],
+        [tile.value for tile in board.tiles],
+        [[card.to_dict() for card in deck.card_list]
+         for deck in board.decks],
+        [[die.face_value for die in roller.dice]
+         for roller in board.dice_rollers],
+        [roller.roll_value for roller in board.dice_rollers],
+        list(board.tokens),
+        board.score
+    )
+
+
+class TestMoveJournal(unittest.TestCase):
+    """TestCase class containing unit tests for MoveJournal
+
+    i. undo reverts each kind of change made in a ply
+    ii. rewind jumps back several plies to a checkpoint
+    iii. undone dice rolls and shuffles repeat exactly with the same rng
+    iv. undo keeps hash_key in step
+    v. count based decks undo deals and adds
+    vi. undo without a mark raises IndexError and close stops recording
+    vii. undoing a deal of a shown shoe card holds it at its end again
+    viii. a board journaled through the global random module deep copies
+    """
+    def setUp(self):
+        self.tiles = [Tile(rank=1, value=i) for i in range(3)]
+        card_list = [Card(rank=1, value=i) for i in range(1, 11)]
+        self.test_board = Board(
+            spaces=[0] * 4,
+            tiles=list(self.tiles),
+            decks=[DeckOfCards(card_list=card_list), DeckOfCards()],
+            tokens=['chip'],
+            dice_rollers=[DiceRoller()],
+            score=0
+        )
+        self.journal = MoveJournal(self.test_board)
+
+    def make_move(self, rng):
+        board = self.test_board
+        board.place_tile(1, self.tiles[2])
+        board.set_space(3, 'road')
+        board.add_card(1, board.deal_card(0))
+        board.add_card(0, board.deal_card(0, bottom_deal=True))
+        board.shuffle_deck(0, rng=rng)
+        board.roll_dice(0, rng=rng)
+        board.add_token('house')
+        board.remove_token('chip')
+        board.set_score(board.score + 1)
+
+    def test_undo_reverts_ply(self):
+        """undo reverts each kind of change made in a ply
+        """
+        start_state = board_state(self.test_board)
+        self.journal.mark()
+        self.make_move(random.Random(3))
+        self.assertNotEqual(board_state(self.test_board), start_state)
+        self.assertEqual(self.journal.depth, 1)
+        self.journal.undo()
+        self.assertEqual(board_state(self.test_board), start_state)
+        self.assertEqual(len(self.journal), 0)
+        self.assertTrue(self.test_board.tiles[2] is self.tiles[2])
+
+    def test_rewind_to_checkpoint(self):
+        """rewind jumps back several plies to a checkpoint
+        """
+        rng = random.Random(5)
+        self.journal.mark()
+        self.make_move(rng)
+        checkpoint = self.journal.checkpoint()
+        middle_state = board_state(self.test_board)
+        for ply in range(3):
+            self.journal.mark()
+            self.test_board.roll_dice(0, rng=rng)
+            self.test_board.set_score(ply + 10)
+        self.journal.rewind(checkpoint)
+        self.assertEqual(board_state(self.test_board), middle_state)
+        self.assertEqual(self.journal.depth, 1)
+        with self.assertRaises(ValueError) as context:
+            self.journal.rewind(checkpoint + 1)
+
+    def test_random_changes_repeat_after_undo(self):
+        """undone dice rolls and shuffles repeat exactly with the same rng
+        """
+        rng = random.Random(8)
+        self.journal.mark()
+        self.make_move(rng)
+        made_state = board_state(self.test_board)
+        self.journal.undo()
+        self.make_move(rng)
+        self.assertEqual(board_state(self.test_board), made_state)
+
+    def test_hash_key_follows_undo(self):
+        """undo keeps hash_key in step
+        """
+        self.test_board.set_hash_debug()
+        start_key = self.test_board.hash_key
+        self.journal.mark()
+        self.make_move(random.Random(1))
+        self.journal.undo()
+        self.assertEqual(self.test_board.hash_key, start_key)
+
+    def test_shoe_deals_and_adds(self):
+        """count based decks undo deals and adds
+        """
+        template = DeckOfCards(
+            card_list=[Card(rank=2, value=i) for i in range(1, 6)]
+        )
+        test_board = Board(decks=[Shoe(templates=[template], num_copies=3)])
+        test_board.decks[0].shuffle(rng=random.Random(4))
+        journal = MoveJournal(test_board)
+        start_composition = test_board.decks[0].composition()
+        journal.mark()
+        dealt_cards = [test_board.deal_card(0) for i in range(4)]
+        test_board.add_card(0, Card(rank=9, value=9))
+        journal.undo()
+        self.assertEqual(test_board.decks[0].composition(),
+                         start_composition)
+        self.assertEqual(
+            [card.to_dict() for card in
+             [test_board.deal_card(0) for i in range(4)]],
+            [card.to_dict() for card in dealt_cards]
+        )
+
+    def test_shoe_pins_restored(self):
+        """undoing a deal of a shown shoe card holds it at its end again
+        """
+        template = DeckOfCards(
+            card_list=[Card(rank=2, value=i) for i in range(1, 6)]
+        )
+        test_board = Board(decks=[Shoe(templates=[template], num_copies=3)])
+        test_board.set_hash_debug()
+        shoe = test_board.decks[0]
+        shoe.shuffle(rng=random.Random(6))
+        journal = MoveJournal(test_board)
+        shown_top = shoe.show_top()
+        shown_bottom = shoe.show_bottom()
+        pinned = shoe.pinned_cards()
+        start_key = test_board.hash_key
+        journal.mark()
+        test_board.deal_card(0)
+        test_board.deal_card(0, bottom_deal=True)
+        test_board.add_card(0, pinned[0])
+        test_board.deal_card(0)
+        journal.undo()
+        self.assertEqual(shoe.pinned_cards(), pinned)
+        self.assertEqual(shoe.cards_left, 15)
+        self.assertEqual(test_board.hash_key, start_key)
+        self.assertEqual(test_board.deal_card(0).to_dict(), shown_top)
+        self.assertEqual(test_board.deal_card(0, bottom_deal=True).to_dict(),
+                         shown_bottom)
+
+    def test_global_random_copies(self):
+        """a board journaled through the global random module deep copies
+        """
+        self.journal.mark()
+        self.test_board.roll_dice(0)
+        self.test_board.shuffle_deck(0)
+        copied_board = copy.deepcopy(self.test_board)
+        self.assertEqual(board_state(copied_board),
+                         board_state(self.test_board))
+        made_state = board_state(self.test_board)
+        self.journal.undo()
+        self.test_board.roll_dice(0)
+        self.test_board.shuffle_deck(0)
+        self.assertEqual(board_state(self.test_board), made_state)
+
+    def test_errors_and_close(self):
+        """undo without a mark raises IndexError and close stops recording
+        """
+        with self.assertRaises(IndexError) as context:
+            self.journal.undo()
+        self.journal.close()
+        self.test_board.set_score(4)
+        self.assertEqual(len(self.journal), 0)
+        self.assertEqual(self.test_board._trackers, ())
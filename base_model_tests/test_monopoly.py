@@ -0,0 +1,130 @@
+# tests for the Monopoly Markov chain in the monopoly.py and markov.py
+# modules
+
+import random
+import unittest
+
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.dice import DiceRoller
+from base_models.markov import MarkovChain
+from base_models.monopoly import CHANCE
+from base_models.monopoly import COMMUNITY_CHEST
+from base_models.monopoly import GO_TO_JAIL
+from base_models.monopoly import JAIL
+from base_models.monopoly import STAY
+from base_models.monopoly import MonopolyChain
+from base_models.monopoly import card_target
+from base_models.monopoly import chance_deck
+from base_models.monopoly import community_chest_deck
+from base_models.monopoly import roll_outcomes
+
+
+def simulate_landings(num_rolls, rng, jail_turns=3):
+    """share of rolls ending on each square, by playing them out
+    """
+    dice_roller = DiceRoller(6, 2)
+    chance = chance_deck().card_list
+    community_chest = community_chest_deck().card_list
+    landings = [0] * 40
+    square, streak, turns_in_jail = 0, 0, None
+    for roll in range(num_rolls):
+        faces = [die.roll(rng) for die in dice_roller.dice]
+        doubles = faces[0] == faces[1]
+        if turns_in_jail is not None:
+            if doubles or turns_in_jail + 1 == jail_turns:
+                turns_in_jail = None
+                square = (JAIL + sum(faces)) % 40
+                streak = 0
+            else:
+                turns_in_jail += 1
+        else:
+            streak = streak + 1 if doubles else 0
+            if streak == 3:
+                turns_in_jail = 0
+            else:
+                square = (square + sum(faces)) % 40
+        while turns_in_jail is None:
+            if square == GO_TO_JAIL:
+                turns_in_jail = 0
+            elif square in CHANCE or square in COMMUNITY_CHEST:
+                deck = chance if square in CHANCE else community_chest
+                target = card_target(rng.choice(deck), square)
+                if target is None:
+                    turns_in_jail = 0
+                elif target != square:
+                    square = target
+                    continue
+            break
+        if turns_in_jail is not None:
+            square, streak = JAIL, 0
+        landings[square] += 1
+    return [count / float(num_rolls) for count in landings]
+
+
+class TestMonopolyChain(unittest.TestCase):
+    """TestCase class containing unit tests for MonopolyChain
+
+    i. every state's moves are a probability distribution
+    ii. landing probabilities match known values and a simulation
+    iii. changed rules solve from the previous solution
+    """
+    def setUp(self):
+        self.monopoly = MonopolyChain()
+
+    def test_outcomes_and_rows(self):
+        outcomes = roll_outcomes(DiceRoller(6, 2))
+        self.assertAlmostEqual(sum(share for roll_sum, doubles, share
+                                   in outcomes), 1.0)
+        self.assertAlmostEqual(sum(share for roll_sum, doubles, share
+                                   in outcomes if doubles), 1.0 / 6)
+        # 2 and 12 are only ever doubles
+        self.assertEqual(len(outcomes), 9 + 6)
+        self.monopoly.chain.check()
+        self.assertEqual(self.monopoly.chain.num_states, 40 * 3 + 3)
+        chain = MarkovChain(2)
+        chain.add(0, 1, 0.5)
+        self.assertRaises(ValueError, chain.check)
+
+    def test_landing_probabilities(self):
+        landings = self.monopoly.landing_probabilities()
+        self.assertAlmostEqual(sum(landings), 1.0)
+        self.assertEqual(landings[GO_TO_JAIL], 0.0)
+        # long run shares per roll with the standard rules
+        self.assertAlmostEqual(landings[0], 0.0292, places=3)
+        self.assertAlmostEqual(landings[24], 0.0300, places=3)
+        self.assertAlmostEqual(landings[JAIL], 0.1153, places=3)
+        self.assertEqual(landings.index(max(landings)), JAIL)
+        self.assertAlmostEqual(self.monopoly.jail_probability(),
+                               0.0939, places=3)
+        simulated = simulate_landings(60000, random.Random(4))
+        for square in range(40):
+            self.assertAlmostEqual(landings[square], simulated[square],
+                                   delta=0.004)
+
+    def test_rule_changes(self):
+        self.monopoly.solve()
+        short_jail = self.monopoly.with_rules(jail_turns=0)
+        landings = short_jail.landing_probabilities()
+        self.assertAlmostEqual(sum(landings), 1.0)
+        self.assertTrue(landings[JAIL] <
+                        self.monopoly.landing_probabilities()[JAIL])
+        no_cards = DeckOfCards([Card(STAY, 0)])
+        plain = self.monopoly.with_rules(chance=no_cards,
+                                         community_chest=no_cards,
+                                         doubles_to_jail=0, jail_turns=0)
+        landings = plain.landing_probabilities()
+        self.assertAlmostEqual(sum(landings), 1.0)
+        # cards no longer send tokens away from the Chance squares
+        standard = self.monopoly.landing_probabilities()
+        for square in CHANCE:
+            self.assertTrue(landings[square] > standard[square])
+        cold = MonopolyChain(community_chest=no_cards)
+        cold.solve()
+        warm = self.monopoly.with_rules(community_chest=no_cards)
+        self.assertTrue(warm.chain.iterations < cold.chain.iterations)
+        for warm_share, cold_share in zip(warm.landing_probabilities(),
+                                          cold.landing_probabilities()):
+            self.assertAlmostEqual(warm_share, cold_share, places=9)
+        same = self.monopoly.with_rules()
+        self.assertEqual(same.chain.iterations, 1)
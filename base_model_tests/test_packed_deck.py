@@ -0,0 +1,177 @@
+# tests for the packed card codes and the array backed PackedDeck
+# in the packed_deck.py module
+
+import random
+import unittest
+
+from base_models.cards import Card
+from base_models.cards import CompactCard
+from base_models.cards import DeckOfCards
+from base_models.packed_deck import PackedDeck
+from base_models.packed_deck import decode_card
+from base_models.packed_deck import encode_card
+
+
+class TestCardCodes(unittest.TestCase):
+    """TestCase class for encode_card and decode_card
+
+    i. a card survives encoding and decoding
+    ii. rank or value outside 0 to 255 raises a ValueError
+    """
+    def test_round_trip(self):
+        """A card survives encoding and decoding
+        """
+        code = encode_card(Card(rank=3, value=12))
+        self.assertEqual(code, 3 * 256 + 12)
+        decoded_card = decode_card(code)
+        self.assertEqual(decoded_card.to_dict(), {'rank': 3, 'value': 12})
+        compact_card = decode_card(code, card_class=CompactCard)
+        self.assertTrue(isinstance(compact_card, CompactCard))
+        self.assertEqual(compact_card.to_dict(), {'rank': 3, 'value': 12})
+
+    def test_out_of_range_raises_value_error(self):
+        """Rank or value outside 0 to 255 raises a ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            encode_card(Card(rank=1, value=256))
+        with self.assertRaises(ValueError) as context:
+            encode_card(Card(rank=-1, value=0))
+
+
+class TestPackedDeckMethods(unittest.TestCase):
+    """TestCase class containing unit tests for the PackedDeck methods
+
+    i. Test initialization with list of Card objects, show attributes
+    ii. Test top and bottom add_card and deal_card match DeckOfCards
+    iii. Test deal_many and add_many match DeckOfCards
+    iv. Test deal_card from empty deck and improper initialization
+    v. Test shuffle keeps the same cards and is reproducible
+    vi. Test to_codes and from_codes round trip, top of the deck first
+    vii. Test the DeckOfCards API runs the same on a PackedDeck
+    """
+    def setUp(self):
+        list_card_attributes = [
+            {'rank': 1, 'value': 1},
+            {'rank': 3, 'value': 4},
+            {'rank': 4, 'value': 9}
+        ]
+        self.card_init_list = [
+            Card(**init_dict) for init_dict in list_card_attributes
+        ]
+        self.card_to_add = Card(rank=2, value=11)
+        self.large_init_list = [
+            Card(rank=i % 4, value=i % 200) for i in range(1, 1001)
+        ]
+
+    def assertSameCards(self, first_list, second_list):
+        self.assertEqual(
+            [card.to_dict() for card in first_list],
+            [card.to_dict() for card in second_list]
+        )
+
+    def test_initialization_with_card_list(self):
+        """Test initialization with list of Card objects, show attributes
+        """
+        test_deck = PackedDeck(card_list=self.card_init_list)
+        self.assertTrue(isinstance(test_deck, DeckOfCards))
+        self.assertSameCards(test_deck.card_list, self.card_init_list)
+        self.assertEqual(test_deck.cards_left, 3)
+        self.assertEqual(test_deck.show_top(), {'rank': 1, 'value': 1})
+        self.assertEqual(test_deck.show_bottom(), {'rank': 4, 'value': 9})
+
+    def test_add_and_deal_match_deck_of_cards(self):
+        """Test top and bottom add_card and deal_card match DeckOfCards
+        """
+        test_deck = PackedDeck(card_list=self.card_init_list)
+        check_deck = DeckOfCards(card_list=self.card_init_list)
+        for deck in (test_deck, check_deck):
+            deck.add_card(self.card_to_add)
+            deck.add_card(self.card_to_add, bottom_add=True)
+        self.assertSameCards(test_deck.card_list, check_deck.card_list)
+        self.assertSameCards(
+            [test_deck.deal_card(), test_deck.deal_card(bottom_deal=True)],
+            [check_deck.deal_card(), check_deck.deal_card(bottom_deal=True)]
+        )
+        self.assertSameCards(test_deck.card_list, check_deck.card_list)
+        with self.assertRaises(TypeError) as context:
+            test_deck.add_card('nonsense')
+
+    def test_bulk_methods_match_deck_of_cards(self):
+        """Test deal_many and add_many match DeckOfCards
+        """
+        test_deck = PackedDeck(card_list=self.large_init_list)
+        check_deck = DeckOfCards(card_list=self.large_init_list)
+        self.assertSameCards(test_deck.deal_many(7), check_deck.deal_many(7))
+        self.assertSameCards(
+            test_deck.deal_many(5, bottom_deal=True),
+            check_deck.deal_many(5, bottom_deal=True)
+        )
+        for deck in (test_deck, check_deck):
+            deck.add_many(self.card_init_list)
+            deck.add_many(self.card_init_list, bottom_add=True)
+        self.assertSameCards(test_deck.card_list, check_deck.card_list)
+        self.assertEqual(test_deck.cards_left, 994)
+
+    def test_empty_deck_and_bad_initialization(self):
+        """Test deal_card from empty deck and improper initialization
+        """
+        test_deck = PackedDeck()
+        self.assertEqual(test_deck.cards_left, 0)
+        self.assertEqual(test_deck.card_list, [])
+        self.assertFalse(test_deck.deal_card())
+        with self.assertRaises(IndexError) as context:
+            test_deck.show_top()
+        with self.assertRaises(TypeError) as context:
+            PackedDeck(card_list=self.card_init_list + ['nonsense'])
+
+    def test_shuffle_keeps_cards(self):
+        """Test shuffle keeps the same cards and is reproducible
+        """
+        first_deck = PackedDeck(card_list=self.large_init_list)
+        second_deck = PackedDeck(card_list=self.large_init_list)
+        first_deck.shuffle(rng=random.Random(3))
+        second_deck.shuffle(rng=random.Random(3))
+        self.assertEqual(first_deck.to_codes(), second_deck.to_codes())
+        self.assertEqual(
+            sorted(first_deck.to_codes()),
+            sorted([encode_card(card) for card in self.large_init_list])
+        )
+        self.assertNotEqual(
+            list(first_deck.to_codes()),
+            [encode_card(card) for card in self.large_init_list]
+        )
+
+    def test_codes_round_trip(self):
+        """Test to_codes and from_codes round trip, top of the deck first
+        """
+        test_deck = PackedDeck(card_list=self.card_init_list)
+        codes = test_deck.to_codes()
+        self.assertEqual(list(codes), [257, 772, 1033])
+        copied_deck = PackedDeck.from_codes(codes, card_class=CompactCard)
+        self.assertEqual(copied_deck.deal_code(), 257)
+        self.assertTrue(isinstance(copied_deck.deal_card(), CompactCard))
+
+    def test_deck_of_cards_api(self):
+        """Test the DeckOfCards API runs the same on a PackedDeck
+        """
+        test_deck = PackedDeck(card_list=self.large_init_list)
+        check_deck = DeckOfCards(card_list=self.large_init_list)
+        self.assertEqual(test_deck._lazy, check_deck._lazy)
+        for deck in (test_deck, check_deck):
+            deck.shuffle(random.Random(5), lazy=True)
+            deck.shuffle(rng=random.Random(6))
+            deck.shuffle()
+        self.assertEqual(
+            sorted([encode_card(card) for card in test_deck.card_list]),
+            sorted([encode_card(card) for card in check_deck.card_list])
+        )
+        for deck in (test_deck, check_deck):
+            deck.card_list = self.card_init_list
+            deck.add_card(self.card_to_add, bottom_add=True)
+            deck.add_many([self.card_to_add])
+        self.assertEqual(test_deck.show_top(), check_deck.show_top())
+        self.assertEqual(test_deck.show_bottom(), check_deck.show_bottom())
+        self.assertSameCards(test_deck.deal_many(2, bottom_deal=True),
+                             check_deck.deal_many(2, bottom_deal=True))
+        self.assertSameCards(test_deck.card_list, check_deck.card_list)
+        self.assertEqual(test_deck.cards_left, check_deck.cards_left)
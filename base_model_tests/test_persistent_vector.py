@@ -0,0 +1,79 @@
+# tests for the PersistentVector class in persistent_vector.py
+
+import random
+import unittest
+
+from base_models.persistent_vector import PersistentVector
+
+
+class TestPersistentVector(unittest.TestCase):
+    """TestCase class containing unit tests for PersistentVector
+
+    i. vectors built from sequences of many sizes read back the same
+    ii. a random run of set, append and pop matches a list
+    iii. older versions are left unchanged and share structure
+    iv. bad indexes and pops raise IndexError
+    """
+    def test_build_sizes(self):
+        """vectors built from sequences of many sizes read back the same
+        """
+        for size in [0, 1, 31, 32, 33, 1024, 1056, 1057, 33825]:
+            vector = PersistentVector(range(size))
+            self.assertEqual(len(vector), size)
+            self.assertEqual(list(vector), list(range(size)))
+            if size:
+                self.assertEqual(vector[size - 1], size - 1)
+                self.assertEqual(vector[-1], size - 1)
+                self.assertEqual(vector[size // 2], size // 2)
+
+    def test_random_operations_match_list(self):
+        """a random run of set, append and pop matches a list
+        """
+        rng = random.Random(16)
+        vector = PersistentVector()
+        expected = []
+        for step in range(5000):
+            choice = rng.random()
+            if choice < 0.6:
+                vector = vector.append(step)
+                expected.append(step)
+            elif choice < 0.8 and expected:
+                vector = vector.pop()
+                expected.pop()
+            elif expected:
+                index = rng.randrange(len(expected))
+                vector = vector.set(index, -step)
+                expected[index] = -step
+        self.assertEqual(list(vector), expected)
+        self.assertEqual(vector, PersistentVector(expected))
+        while expected:
+            vector = vector.pop()
+            expected.pop()
+        self.assertEqual(list(vector), [])
+        self.assertEqual(vector.extend([1, 2]), PersistentVector([1, 2]))
+
+    def test_versions_share_structure(self):
+        """older versions are left unchanged and share structure
+        """
+        old_vector = PersistentVector(range(2000))
+        new_vector = old_vector.set(5, 'x')
+        self.assertEqual(old_vector[5], 5)
+        self.assertEqual(new_vector[5], 'x')
+        self.assertEqual(new_vector[4:7], [4, 'x', 6])
+        shared_nodes = [
+            old_child is new_child for old_child, new_child
+            in zip(old_vector._root, new_vector._root)
+        ]
+        self.assertEqual(shared_nodes.count(False), 1)
+        self.assertTrue(old_vector.append(1)._tail is not old_vector._tail)
+
+    def test_index_errors(self):
+        """bad indexes and pops raise IndexError
+        """
+        vector = PersistentVector([1, 2, 3])
+        with self.assertRaises(IndexError) as context:
+            vector[3]
+        with self.assertRaises(IndexError) as context:
+            vector.set(-4, 0)
+        with self.assertRaises(IndexError) as context:
+            PersistentVector().pop()
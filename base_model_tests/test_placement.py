@@ -0,0 +1,114 @@
+# tests for the PlacementIndex class in the placement.py module
+
+import random
+import unittest
+
+from base_models.grid import HexGrid
+from base_models.grid import SquareGrid
+from base_models.placement import PlacementIndex
+from base_models.tiles import EdgeTile
+from base_models.tiles import Tile
+
+
+def scan_placements(board, grid, tile):
+    """every (space, rotation) where tile fits, by checking them all
+    """
+    num_sides = grid.num_sides
+    found = []
+    for index, content in enumerate(board.spaces):
+        if isinstance(content, Tile):
+            continue
+        facing_tile = False
+        fits = [True] * num_sides
+        for side, neighbor in enumerate(grid.neighbors_of(index)):
+            if neighbor == -1 or not isinstance(board.spaces[neighbor], Tile):
+                continue
+            facing_tile = True
+            edges = getattr(board.spaces[neighbor], 'edges', None)
+            if edges is None:
+                continue
+            label = edges[(side + num_sides // 2) % num_sides]
+            for rotation in range(num_sides):
+                if tile.edges_at(rotation)[side] != label:
+                    fits[rotation] = False
+        if facing_tile:
+            found.extend([(index, rotation) for rotation in range(num_sides)
+                          if fits[rotation]])
+    return found
+
+
+class TestPlacementIndex(unittest.TestCase):
+    """TestCase class containing unit tests for PlacementIndex
+
+    i. placements match a scan of every space and rotation
+    ii. the index follows tiles being placed and removed
+    iii. tiles without edge labels only put spaces on the frontier
+    """
+    def setUp(self):
+        self.grid = SquareGrid(3, 3)
+        self.board = self.grid.new_board()
+        self.index = PlacementIndex(self.board, self.grid)
+
+    def test_placements(self):
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.placements(EdgeTile('abcd')), [])
+        self.board.place_tile(4, EdgeTile(edges='abcd'))
+        self.assertEqual(self.index.frontier, {
+            1: (None, None, 'a', None), 5: (None, None, None, 'b'),
+            7: ('c', None, None, None), 3: (None, 'd', None, None)
+        })
+        # 'a' has to face back down at the top space
+        self.assertEqual(self.index.placements(EdgeTile('axxx')), [(1, 2)])
+        placements = self.index.placements(EdgeTile('aaaa'))
+        self.assertEqual(placements, [(1, rotation) for rotation in range(4)])
+        self.assertEqual(self.index.placements_for_hand(
+            [EdgeTile('dbbb'), EdgeTile('xxxx')]
+        ), [[(3, 1), (5, 0), (5, 1), (5, 2)], []])
+        tile = EdgeTile('axxx')
+        self.board.place_tile(1, tile.rotated(2))
+        self.assertNotIn(1, self.index.frontier)
+        self.assertEqual(self.index.frontier[0], (None, 'x', None, None))
+        self.assertEqual(self.index.frontier[2], (None, None, None, 'x'))
+
+    def test_matches_scan(self):
+        rng = random.Random(5)
+        for grid in (HexGrid(2), SquareGrid(5, 4)):
+            board = grid.new_board()
+            index = PlacementIndex(board, grid)
+            board.place_tile(0, EdgeTile(
+                edges=[rng.choice('ab') for side in range(grid.num_sides)]
+            ))
+            hand = [EdgeTile(edges=[rng.choice('ab')
+                                    for side in range(grid.num_sides)])
+                    for tile in range(6)]
+            for move in range(12):
+                for tile in hand:
+                    self.assertEqual(index.placements(tile),
+                                     scan_placements(board, grid, tile))
+                tile = hand[move % len(hand)]
+                placements = index.placements(tile)
+                if not placements:
+                    continue
+                position, rotation = rng.choice(placements)
+                board.place_tile(position, tile.rotated(rotation))
+            board.remove_tile(0)
+            for tile in hand:
+                self.assertEqual(index.placements(tile),
+                                 scan_placements(board, grid, tile))
+            fresh = PlacementIndex(board, grid)
+            self.assertEqual(fresh.frontier, index.frontier)
+            index.close()
+            fresh.close()
+
+    def test_unlabelled_tiles(self):
+        self.board.place_tile(0, Tile())
+        self.assertEqual(self.index.frontier,
+                         {1: (None,) * 4, 3: (None,) * 4})
+        self.assertEqual(self.index.placements(EdgeTile('abcd')),
+                         [(1, rotation) for rotation in range(4)] +
+                         [(3, rotation) for rotation in range(4)])
+        self.board.remove_tile(0)
+        self.assertEqual(len(self.index), 0)
+        self.index.close()
+        self.board.place_tile(0, Tile())
+        self.assertEqual(len(self.index), 0)
@@ -0,0 +1,127 @@
+# tests for the table driven hand evaluator in the poker.py module
+
+import unittest
+from array import array
+from collections import Counter
+from itertools import combinations
+
+from base_models.cards import Card
+from base_models.packed_deck import encode_card
+from base_models.poker import evaluate
+from base_models.poker import evaluate_codes
+from base_models.poker import evaluate_many
+from base_models.poker import hand_category
+from base_models.poker import hand_name
+from base_models.registry import standard_deck
+
+
+def hand(description):
+    """cards from a description like 'As Kd 10h', suits in registry order
+    """
+    faces = dict(zip(['2', '3', '4', '5', '6', '7', '8', '9', '10',
+                      'J', 'Q', 'K', 'A'], range(2, 15)))
+    suits = {'c': 1, 'd': 2, 'h': 3, 's': 4}
+    return [Card(rank=suits[text[-1]], value=faces[text[:-1]])
+            for text in description.split()]
+
+
+class TestHandEvaluator(unittest.TestCase):
+    """TestCase class containing unit tests for the hand evaluator
+
+    i. each category beats the one below it
+    ii. kickers and the wheel straight are ordered correctly
+    iii. seven card hands find the best five cards, including flushes
+    iv. every five card hand from two suits has the expected counts
+    v. evaluate_many matches evaluate for nested and flat batches
+    vi. bad hands raise a ValueError
+    """
+    def test_category_order(self):
+        """each category beats the one below it
+        """
+        hands = [
+            'As Ks Qs Js 10s', '9c 9d 9h 9s 2c', '3c 3d 3h 2s 2c',
+            '2h 7h 9h Jh Kh', '5c 6d 7h 8s 9c', 'Qc Qd Qh 2s 3c',
+            'Jc Jd 4h 4s Ac', '10c 10d 2h 5s 7c', 'Ac Kd 9h 5s 3c'
+        ]
+        values = [evaluate(hand(text)) for text in hands]
+        self.assertEqual(values, sorted(values, reverse=True))
+        self.assertEqual(
+            [hand_category(value) for value in values],
+            list(range(8, -1, -1))
+        )
+        self.assertEqual(hand_name(values[0]), 'straight flush')
+
+    def test_kickers_and_wheel(self):
+        """kickers and the wheel straight are ordered correctly
+        """
+        self.assertTrue(evaluate(hand('Ac 2d 3h 4s 5c')) <
+                        evaluate(hand('2c 3d 4h 5s 6c')))
+        self.assertTrue(evaluate(hand('Ac Ad Kh 5s 3c')) >
+                        evaluate(hand('Ac Ad Qh Js 10c')))
+        self.assertEqual(evaluate(hand('Ac Ad Kh 5s 3c')),
+                         evaluate(hand('Ah As Kc 5d 3h')))
+        self.assertTrue(evaluate(hand('Kc Kd 2h 2s Ac')) >
+                        evaluate(hand('Qc Qd Jh Js Ac')))
+
+    def test_seven_card_hands(self):
+        """seven card hands find the best five cards, including flushes
+        """
+        self.assertEqual(
+            evaluate(hand('2h 7h 9h Jh Kh Kd Ks')),
+            evaluate(hand('2h 7h 9h Jh Kh'))
+        )
+        self.assertEqual(
+            hand_name(evaluate(hand('3c 3d 3h 2s 2c 2d 9s'))), 'full house'
+        )
+        self.assertEqual(
+            hand_name(evaluate(hand('4h 5h 6h 7h 8c 8h 9d'))),
+            'straight flush'
+        )
+        self.assertEqual(
+            evaluate(hand('Ac Kd 9h 5s 3c 2d 7h')),
+            evaluate(hand('Ac Kd 9h 7h 5s'))
+        )
+        self.assertEqual(
+            evaluate(hand('Ac Ad Kh Ks Qc Qd 2h')),
+            evaluate(hand('Ac Ad Kh Ks Qc'))
+        )
+
+    def test_every_hand_has_a_category(self):
+        """every five card hand from two suits has the expected counts
+
+        with two suits there are no trips, ten straight flushes and
+        1277 other flushes per suit, and 10 * 30 off suit straights
+        """
+        codes = [encode_card(card) for card in standard_deck().card_list]
+        half_deck = codes[:26]
+        counter = Counter([
+            hand_category(evaluate_codes(five_cards))
+            for five_cards in combinations(half_deck, 5)
+        ])
+        self.assertEqual(sum(counter.values()), 65780)
+        self.assertEqual(set(counter.keys()), set([0, 1, 2, 4, 5, 8]))
+        self.assertEqual(counter[8], 20)
+        self.assertEqual(counter[5], 2554)
+        self.assertEqual(counter[4], 300)
+
+    def test_evaluate_many(self):
+        """evaluate_many matches evaluate for nested and flat batches
+        """
+        hands = [hand('As Ks Qs Js 10s 2c 3d'), hand('5c 6d 7h 8s 9c 9d Kh')]
+        code_hands = [[encode_card(card) for card in cards]
+                      for cards in hands]
+        expected = [evaluate(cards) for cards in hands]
+        self.assertEqual(list(evaluate_many(code_hands)), expected)
+        flat_codes = array('H', code_hands[0] + code_hands[1])
+        self.assertEqual(list(evaluate_many(flat_codes, hand_size=7)),
+                         expected)
+
+    def test_bad_hands_raise_value_error(self):
+        """bad hands raise a ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            evaluate(hand('As Ks Qs Js'))
+        with self.assertRaises(ValueError) as context:
+            evaluate(hand('As As Qs Js 10s'))
+        with self.assertRaises(ValueError) as context:
+            evaluate([Card(rank=5, value=2)] * 5)
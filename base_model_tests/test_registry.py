@@ -0,0 +1,115 @@
+# tests for the interning CardRegistry in the registry.py module
+# and the immutable FrozenCard and FrozenTile classes
+
+import copy
+import pickle
+import unittest
+
+from base_models.cards import Card
+from base_models.cards import FrozenCard
+from base_models.registry import CardRegistry
+from base_models.registry import intern_card
+from base_models.registry import intern_tile
+from base_models.registry import standard_deck
+from base_models.tiles import FrozenTile
+from base_models.tiles import Tile
+
+
+class TestCardRegistry(unittest.TestCase):
+    """TestCase class containing unit tests for the CardRegistry methods
+
+    i. equal cards and tiles come back as one shared object
+    ii. intern maps mutable cards and tiles to the shared objects
+    iii. decks from one registry share their card objects
+    iv. the standard deck has 52 distinct cards in suit order
+    v. frozen cards and tiles cannot be changed
+    vi. frozen cards survive pickling and copying as the shared cards
+    """
+    def setUp(self):
+        self.registry = CardRegistry()
+
+    def test_equal_cards_are_shared(self):
+        """equal cards and tiles come back as one shared object
+        """
+        first_card = self.registry.card(rank=2, value=11)
+        self.assertTrue(first_card is self.registry.card(2, 11))
+        self.assertFalse(first_card is self.registry.card(2, 10))
+        first_tile = self.registry.tile(num_edges=6, rank=2, value=11)
+        self.assertTrue(first_tile is self.registry.tile(6, 2, 11))
+        self.assertFalse(first_tile is first_card)
+        self.assertEqual(len(self.registry), 3)
+        self.assertTrue(isinstance(first_card, Card))
+        self.assertTrue(isinstance(first_tile, Tile))
+        self.assertEqual(len(set([first_card, self.registry.card(2, 11)])), 1)
+
+    def test_intern(self):
+        """intern maps mutable cards and tiles to the shared objects
+        """
+        shared_card = self.registry.intern(Card(rank=1, value=4))
+        shared_tile = self.registry.intern(Tile(num_edges=6, rank=1, value=4))
+        self.assertTrue(shared_card is self.registry.card(1, 4))
+        self.assertTrue(shared_tile is self.registry.tile(6, 1, 4))
+        with self.assertRaises(TypeError) as context:
+            self.registry.intern('nonsense')
+
+    def test_decks_share_cards(self):
+        """decks from one registry share their card objects
+        """
+        first_deck = self.registry.standard_deck()
+        second_deck = self.registry.standard_deck()
+        first_deck.shuffle()
+        self.assertEqual(
+            set([id(card) for card in first_deck.card_list]),
+            set([id(card) for card in second_deck.card_list])
+        )
+        self.assertEqual(len(self.registry), 52)
+
+    def test_standard_deck(self):
+        """the standard deck has 52 distinct cards in suit order
+        """
+        test_deck = standard_deck()
+        self.assertEqual(test_deck.cards_left, 52)
+        self.assertEqual(test_deck.show_top(), {'rank': 1, 'value': 2})
+        self.assertEqual(test_deck.show_bottom(), {'rank': 4, 'value': 14})
+        self.assertEqual(len(set(test_deck.card_list)), 52)
+        self.assertTrue(test_deck.card_list[0] is standard_deck().deal_card())
+
+    def test_frozen_objects_are_immutable(self):
+        """frozen cards and tiles cannot be changed
+        """
+        test_card = FrozenCard(rank=2, value=11)
+        test_tile = FrozenTile(num_edges=6, rank=2, value=11)
+        with self.assertRaises(AttributeError) as context:
+            test_card.value = 3
+        with self.assertRaises(AttributeError) as context:
+            del test_card.rank
+        with self.assertRaises(AttributeError) as context:
+            test_tile.num_edges = 4
+        self.assertEqual(test_card.to_dict(), {'rank': 2, 'value': 11})
+        self.assertEqual(
+            test_tile.to_dict(), {'rank': 2, 'value': 11, 'num_edges': 6}
+        )
+
+    def test_frozen_cards_pickle(self):
+        """frozen cards survive pickling
+        """
+        test_card = pickle.loads(pickle.dumps(self.registry.card(3, 7)))
+        test_tile = pickle.loads(pickle.dumps(self.registry.tile(6, 3, 7)))
+        self.assertEqual(test_card.to_dict(), {'rank': 3, 'value': 7})
+        self.assertEqual(test_tile.num_edges, 6)
+        # copies of shared cards are the shared cards themselves
+        shared_card = intern_card(3, 7)
+        shared_tile = intern_tile(6, 3, 7)
+        self.assertTrue(test_card is shared_card)
+        self.assertTrue(test_tile is shared_tile)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(
+                pickle.loads(pickle.dumps(shared_card, protocol)),
+                shared_card
+            )
+        self.assertTrue(copy.copy(shared_card) is shared_card)
+        self.assertEqual(copy.deepcopy(shared_card), shared_card)
+        self.assertTrue(copy.deepcopy(shared_tile) is shared_tile)
+        hand = [shared_card, shared_card]
+        self.assertEqual(copy.deepcopy(hand), hand)
+        self.assertEqual(pickle.loads(pickle.dumps(hand)), hand)
@@ -0,0 +1,145 @@
+# tests for the binary Board, deck and dice format in serialization.py
+
+import pickle
+import random
+import unittest
+
+from base_models.board import Board
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.dice import DiceRoller
+from base_models.packed_deck import PackedDeck
+from base_models.registry import standard_deck
+from base_models.serialization import BoardView
+from base_models.serialization import decode_board
+from base_models.serialization import decode_deck
+from base_models.serialization import decode_dice
+from base_models.serialization import encode_board
+from base_models.serialization import encode_deck
+from base_models.serialization import encode_dice
+from base_models.shoe import Shoe
+from base_models.tiles import Tile
+
+
+def board_state(board):
+    """plain description of a board for comparing states
+    """
+    def describe(obj):
+        if isinstance(obj, Card):
+            return (type(obj).__name__, obj.to_dict())
+        return obj
+    return (
+        [describe(space) for space in board.spaces],
+        [describe(tile) for tile in board.tiles],
+        [(type(deck).__name__, [card.to_dict() for card in deck.card_list])
+         for deck in board.decks],
+        [([die.face_value for die in roller.dice], roller.num_sides,
+          roller.roll_value) for roller in board.dice_rollers],
+        [describe(token) for token in board.tokens],
+        board.score
+    )
+
+
+class TestSerialization(unittest.TestCase):
+    """TestCase class containing unit tests for the serialization module
+
+    i. a board round trips through encode_board and decode_board
+    ii. BoardView reads single values without decoding the rest
+    iii. decks and dice round trip on their own
+    iv. the blob is several times smaller than a pickle
+    v. bad data raises ValueError
+    """
+    def setUp(self):
+        deck = standard_deck()
+        deck.shuffle(rng=random.Random(17))
+        self.test_board = Board(
+            spaces=[0, 5, None, True, 'road', -2, 2 ** 40, [1, 2],
+                    Tile(num_edges=6, rank=3, value=4),
+                    Card(rank=2, value=9)],
+            tiles=[Tile(num_edges=6, rank=1, value=i) for i in range(5)],
+            decks=[deck,
+                   PackedDeck(card_list=deck.card_list[:5]),
+                   Shoe(templates=[deck]),
+                   DeckOfCards(card_list=[Card(rank=300, value=1)])],
+            tokens=['chip', 7],
+            dice_rollers=[DiceRoller(), DiceRoller(num_sides=20,
+                                                   num_dice=3)],
+            score=31
+        )
+
+    def test_board_round_trip(self):
+        """a board round trips through encode_board and decode_board
+        """
+        data = encode_board(self.test_board)
+        decoded_board = decode_board(data)
+        self.assertEqual(board_state(decoded_board),
+                         board_state(self.test_board))
+        self.assertEqual(board_state(decode_board(bytearray(data))),
+                         board_state(self.test_board))
+        self.assertEqual(board_state(decode_board(encode_board(Board()))),
+                         board_state(Board()))
+
+    def test_view_reads_single_values(self):
+        """BoardView reads single values without decoding the rest
+        """
+        view = BoardView(memoryview(encode_board(self.test_board)))
+        self.assertEqual(view.num_spaces, 10)
+        self.assertEqual(view.space(1), 5)
+        self.assertEqual(view.space(8).to_dict(),
+                         {'num_edges': 6, 'rank': 3, 'value': 4})
+        self.assertEqual(view.space(4), 'road')
+        self.assertEqual(view.num_decks, 4)
+        self.assertEqual(
+            list(view.deck_codes(0)),
+            [card.rank << 8 | card.value
+             for card in self.test_board.decks[0].card_list]
+        )
+        self.assertEqual(list(view.deck_codes(3)), [300 << 8 | 1])
+        self.assertTrue(isinstance(view.deck(1), PackedDeck))
+        self.assertEqual(
+            list(view.dice_faces(1)),
+            [die.face_value for die in self.test_board.dice_rollers[1].dice]
+        )
+        self.assertEqual(view.score, 31)
+        self.assertEqual(view.tokens, ['chip', 7])
+        with self.assertRaises(IndexError) as context:
+            view.space(10)
+
+    def test_deck_and_dice_round_trip(self):
+        """decks and dice round trip on their own
+        """
+        deck = self.test_board.decks[0]
+        self.assertEqual(
+            [card.to_dict() for card in decode_deck(encode_deck(deck))
+             .card_list],
+            [card.to_dict() for card in deck.card_list]
+        )
+        roller = self.test_board.dice_rollers[1]
+        decoded_roller = decode_dice(encode_dice(roller))
+        self.assertEqual(decoded_roller.num_sides, 20)
+        self.assertEqual(decoded_roller.roll_value, roller.roll_value)
+        self.assertEqual(
+            [die.face_value for die in decoded_roller.dice],
+            [die.face_value for die in roller.dice]
+        )
+
+    def test_smaller_than_pickle(self):
+        """the blob is several times smaller than a pickle
+        """
+        test_board = Board(
+            spaces=[0] * 20, decks=[standard_deck()],
+            dice_rollers=[DiceRoller()], score=0
+        )
+        data = encode_board(test_board)
+        self.assertTrue(3 * len(data) < len(pickle.dumps(test_board, 2)))
+
+    def test_bad_data(self):
+        """bad data raises ValueError
+        """
+        data = encode_board(self.test_board)
+        with self.assertRaises(ValueError) as context:
+            BoardView(b'XXXX' + data[4:])
+        with self.assertRaises(ValueError) as context:
+            BoardView(data[:4] + b'\x63' + data[5:])
+        with self.assertRaises(ValueError) as context:
+            BoardView(b'BG')
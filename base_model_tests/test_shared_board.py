@@ -0,0 +1,188 @@
+# tests for the shared memory Board store in the shared_board.py module
+
+from multiprocessing import Pool
+import threading
+import unittest
+
+from base_models.board import Board
+from base_models.dice import DiceRoller
+from base_models.registry import standard_deck
+from base_models.shared_board import COUNTER
+from base_models.shared_board import HEADER
+from base_models.shared_board import SEQUENCE_OFFSET
+from base_models.shared_board import attach_store
+from base_models.shared_board import shared_memory
+from base_models.shared_board import SharedBoardStore
+
+
+def count_top_cards(store_and_count):
+    """read the top card codes of the published deck in a worker
+    """
+    store, num_cards = store_and_count
+    version, view = store.view()
+    codes = list(view.deck_codes(0)[:num_cards])
+    current = store.is_current(version)
+    del view
+    store.close()
+    return version, codes, current
+
+
+@unittest.skipIf(shared_memory is None, "needs shared_memory")
+class TestSharedBoardStore(unittest.TestCase):
+    """TestCase class containing unit tests for SharedBoardStore
+
+    i. a published board is read back through a view and load_board
+    ii. each publish makes a new version seen by attached readers
+    iii. attached readers cannot publish or write to the memory
+    iv. worker processes read the store without it being copied
+    v. boards too big for the store raise ValueError
+    vi. reads torn by a publish are retried, errors on a whole one raise
+    vii. boards read while another thread publishes are never mixed
+    """
+    def setUp(self):
+        self.test_board = Board(
+            spaces=[0, 3, None, 'road'],
+            decks=[standard_deck()],
+            dice_rollers=[DiceRoller()],
+            score=4
+        )
+        self.store = SharedBoardStore(capacity=4096)
+
+    def tearDown(self):
+        self.store.close()
+        self.store.unlink()
+
+    def test_publish_and_read(self):
+        """a published board is read back through a view and load_board
+        """
+        with self.assertRaises(ValueError) as context:
+            self.store.view()
+        self.assertEqual(self.store.publish(self.test_board), 1)
+        version, view = self.store.view()
+        self.assertEqual(version, 1)
+        self.assertEqual(view.space(3), 'road')
+        self.assertEqual(view.deck_codes(0)[0], (1 << 8) | 2)
+        self.assertTrue(self.store.is_current(version))
+        del view
+        board = self.store.load_board()
+        self.assertEqual(board.score, 4)
+        self.assertEqual(board.decks[0].cards_left, 52)
+
+    def test_versions(self):
+        """each publish makes a new version seen by attached readers
+        """
+        self.store.publish(self.test_board)
+        reader = attach_store(self.store.name)
+        version, view = reader.view()
+        del view
+        self.test_board.deal_card(0)
+        self.test_board.set_score(9)
+        self.store.publish(self.test_board)
+        self.assertFalse(reader.is_current(version))
+        self.assertEqual(reader.wait_for(version, timeout=1), 2)
+        self.assertEqual(reader.wait_for(2, timeout=0.01), None)
+        board = reader.load_board()
+        self.assertEqual(board.score, 9)
+        self.assertEqual(board.decks[0].cards_left, 51)
+        reader.close()
+
+    def test_readers_are_read_only(self):
+        """attached readers cannot publish or write to the memory
+        """
+        self.store.publish(self.test_board)
+        reader = attach_store(self.store.name)
+        with self.assertRaises(ValueError) as context:
+            reader.publish(self.test_board)
+        with self.assertRaises(TypeError) as context:
+            reader._buf[0] = 0
+        reader.close()
+
+    def test_worker_processes(self):
+        """worker processes read the store without it being copied
+        """
+        self.store.publish(self.test_board)
+        pool = Pool(2)
+        try:
+            results = pool.map(count_top_cards, [(self.store, 3)] * 4)
+        finally:
+            pool.close()
+            pool.join()
+        for version, codes, current in results:
+            self.assertEqual(version, 1)
+            self.assertEqual(codes, [258, 259, 260])
+            self.assertTrue(current)
+
+    def test_board_too_big(self):
+        """boards too big for the store raise ValueError
+        """
+        big_board = Board(spaces=['x'] * 5000)
+        with self.assertRaises(ValueError) as context:
+            self.store.publish(big_board)
+        self.assertEqual(self.store.version, 0)
+
+    def test_torn_reads(self):
+        """reads torn by a publish are retried, errors on a whole one raise
+        """
+        store = self.store
+        store.publish(self.test_board)
+        buf = store._buf
+        blob = bytes(buf[HEADER.size:HEADER.size + 8])
+        sequence = store._sequence()
+
+        def finish_publish():
+            buf[HEADER.size:HEADER.size + 8] = blob
+            COUNTER.pack_into(buf, SEQUENCE_OFFSET, sequence + 2)
+
+        # a publish under way leaves the counter odd and the blob torn
+        COUNTER.pack_into(buf, SEQUENCE_OFFSET, sequence + 1)
+        buf[HEADER.size:HEADER.size + 4] = b'torn'
+        timer = threading.Timer(0.05, finish_publish)
+        timer.start()
+        board = store.load_board()
+        timer.join()
+        self.assertEqual(board.score, 4)
+        self.assertEqual(store.view()[0], 2)
+        # a torn blob the counter says is whole is a real error
+        buf[HEADER.size:HEADER.size + 4] = b'torn'
+        with self.assertRaises(ValueError) as context:
+            store.view()
+        with self.assertRaises(ValueError) as context:
+            store.load_board()
+
+    def test_reads_during_publishes(self):
+        """boards read while another thread publishes are never mixed
+        """
+        store = SharedBoardStore(capacity=1 << 16)
+        boards = [
+            Board(spaces=['road'] * 200, score=1),
+            Board(spaces=[('city', 2)] * 300, tokens=['chip'], score=2),
+        ]
+        states = [(list(board.spaces), board.tokens, board.score)
+                  for board in boards]
+        store.publish(boards[0])
+
+        def publish_many():
+            for count in range(300):
+                store.publish(boards[count % 2])
+
+        writer = threading.Thread(target=publish_many)
+        writer.start()
+        try:
+            while writer.is_alive():
+                board = store.load_board()
+                self.assertTrue(
+                    (board.spaces, board.tokens, board.score) in states
+                )
+                version, view = store.view()
+                try:
+                    spaces = view.spaces
+                except (IndexError, ValueError):
+                    # values read in place while a publish overwrote them
+                    spaces = None
+                if store.is_current(version):
+                    self.assertTrue(spaces in [states[0][0], states[1][0]])
+                del view
+        finally:
+            writer.join()
+            store.close()
+            store.unlink()
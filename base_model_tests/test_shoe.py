@@ -0,0 +1,166 @@
+# tests for the count based Shoe in the shoe.py module
+
+import copy
+import pickle
+import random
+import unittest
+from collections import Counter
+from fractions import Fraction
+
+from base_models.board import Board
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.shoe import Shoe
+
+
+class TestShoeMethods(unittest.TestCase):
+    """TestCase class containing unit tests for the Shoe methods
+
+    i. a shoe built from copies of a template has the expected counts
+    ii. dealing every card empties the shoe with the right composition
+    iii. probability_of_next follows the counts left
+    iv. show_top and show_bottom match the next deals
+    v. add_card returns cards to the shoe
+    vi. a seeded shuffle makes the deals reproducible
+    vii. a shoe is accepted in Board.decks
+    viii. remove_card takes out a given card
+    ix. a shuffled shoe deep copies and pickles
+    """
+    def setUp(self):
+        self.template_cards = [
+            Card(rank=suit, value=face)
+            for suit in range(1, 5) for face in range(1, 14)
+        ]
+        self.template = DeckOfCards(card_list=self.template_cards)
+
+    def test_copies_of_template(self):
+        """a shoe built from copies of a template has the expected counts
+        """
+        test_shoe = Shoe(templates=[self.template], num_copies=6)
+        self.assertEqual(test_shoe.cards_left, 312)
+        composition = test_shoe.composition()
+        self.assertEqual(len(composition), 52)
+        self.assertEqual(set(composition.values()), set([6]))
+        self.assertEqual(len(test_shoe.card_list), 312)
+        self.assertTrue(isinstance(test_shoe, DeckOfCards))
+        self.assertEqual(test_shoe._lazy, None)
+
+    def test_deal_every_card(self):
+        """dealing every card empties the shoe with the right composition
+        """
+        test_shoe = Shoe(templates=[self.template, self.template])
+        dealt_cards = test_shoe.deal_many(200)
+        self.assertEqual(len(dealt_cards), 104)
+        self.assertEqual(test_shoe.cards_left, 0)
+        self.assertFalse(test_shoe.deal_card())
+        dealt_counter = Counter(
+            [(card.rank, card.value) for card in dealt_cards]
+        )
+        self.assertEqual(set(dealt_counter.values()), set([2]))
+
+    def test_probability_of_next(self):
+        """probability_of_next follows the counts left
+        """
+        test_shoe = Shoe(templates=[self.template], num_copies=8)
+        self.assertEqual(test_shoe.probability_of_next(value=1),
+                         Fraction(1, 13))
+        self.assertEqual(test_shoe.probability_of_next(rank=2, value=5),
+                         Fraction(1, 52))
+        self.assertEqual(test_shoe.probability_of_next(), 1)
+        test_shoe.card_list = [Card(rank=1, value=10)] * 3 + [Card()]
+        self.assertEqual(test_shoe.probability_of_next(value=10),
+                         Fraction(3, 4))
+        test_shoe.deal_many(4)
+        self.assertEqual(test_shoe.probability_of_next(), 0)
+        self.assertEqual(Shoe().probability_of_next(value=10), 0)
+
+    def test_show_matches_deal(self):
+        """show_top and show_bottom match the next deals
+        """
+        test_shoe = Shoe(templates=[self.template])
+        top_attributes = test_shoe.show_top()
+        bottom_attributes = test_shoe.show_bottom()
+        self.assertEqual(test_shoe.cards_left, 52)
+        self.assertEqual(test_shoe.show_top(), top_attributes)
+        next_probability = test_shoe.probability_of_next(
+            rank=top_attributes['rank'], value=top_attributes['value']
+        )
+        self.assertEqual(next_probability, 1)
+        self.assertEqual(test_shoe.deal_card().to_dict(), top_attributes)
+        self.assertEqual(
+            test_shoe.deal_card(bottom_deal=True).to_dict(),
+            bottom_attributes
+        )
+        self.assertEqual(test_shoe.cards_left, 50)
+        with self.assertRaises(IndexError) as context:
+            Shoe().show_top()
+
+    def test_add_card(self):
+        """add_card returns cards to the shoe
+        """
+        test_shoe = Shoe(templates=[self.template])
+        dealt_card = test_shoe.deal_card()
+        key = (dealt_card.rank, dealt_card.value)
+        self.assertFalse(key in test_shoe.composition())
+        test_shoe.add_card(dealt_card)
+        test_shoe.add_many([Card(rank=9, value=9)])
+        self.assertEqual(test_shoe.composition()[key], 1)
+        self.assertEqual(test_shoe.composition()[(9, 9)], 1)
+        self.assertEqual(test_shoe.cards_left, 53)
+        with self.assertRaises(TypeError) as context:
+            test_shoe.add_card('nonsense')
+
+    def test_seeded_shuffle_is_reproducible(self):
+        """a seeded shuffle makes the deals reproducible
+        """
+        first_shoe = Shoe(templates=[self.template], num_copies=4)
+        second_shoe = Shoe(templates=[self.template], num_copies=4)
+        first_shoe.shuffle(rng=random.Random(21))
+        second_shoe.shuffle(rng=random.Random(21))
+        self.assertEqual(
+            [card.to_dict() for card in first_shoe.deal_many(30)],
+            [card.to_dict() for card in second_shoe.deal_many(30)]
+        )
+
+    def test_shoe_in_board(self):
+        """a shoe is accepted in Board.decks
+        """
+        test_shoe = Shoe(templates=[self.template])
+        test_board = Board(decks=[test_shoe])
+        self.assertEqual(test_board.decks, [test_shoe])
+
+    def test_remove_card(self):
+        """remove_card takes out a given card
+        """
+        test_shoe = Shoe(templates=[self.template], num_copies=2)
+        card = self.template.card_list[0]
+        key = (card.rank, card.value)
+        self.assertTrue(test_shoe.remove_card(card) is card)
+        self.assertEqual(test_shoe.composition()[key], 1)
+        test_shoe.remove_card(Card(rank=card.rank, value=card.value))
+        self.assertFalse(key in test_shoe.composition())
+        self.assertEqual(test_shoe.cards_left, 102)
+        with self.assertRaises(ValueError) as context:
+            test_shoe.remove_card(card)
+
+    def test_copy_and_pickle(self):
+        """a shuffled shoe deep copies and pickles
+        """
+        for rng in (None, random.Random(3)):
+            test_shoe = Shoe(templates=[self.template], num_copies=2)
+            test_shoe.shuffle(rng=rng)
+            test_shoe.show_top()
+            for other in (copy.deepcopy(test_shoe),
+                          pickle.loads(pickle.dumps(test_shoe))):
+                self.assertEqual(other.composition(),
+                                 test_shoe.composition())
+                self.assertEqual(other.show_top(), test_shoe.show_top())
+                if rng is not None:
+                    self.assertEqual(
+                        [card.to_dict() for card in other.deal_many(10)],
+                        [card.to_dict() for card in
+                         copy.deepcopy(test_shoe).deal_many(10)]
+                    )
+        board = Board(decks=[Shoe(templates=[self.template])])
+        board.deal_card(0)
+        self.assertEqual(copy.deepcopy(board).decks[0].cards_left, 51)
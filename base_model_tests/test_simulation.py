@@ -0,0 +1,125 @@
+# tests for the seeded Monte Carlo runner in simulation.py
+# and the rng arguments taken by the deck and dice classes
+
+import random
+import unittest
+from collections import Counter
+
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.dice import DiceRoller
+from base_models.dice import SingleDie
+from base_models.simulation import MonteCarloRunner
+from base_models.simulation import derive_seed
+
+
+def deal_and_roll_trial(rng):
+    """deal the top card of a shuffled deck and roll two dice
+
+    module level so that worker processes can unpickle it
+    """
+    test_deck = DeckOfCards(
+        card_list=[Card(rank=1, value=i) for i in range(1, 11)]
+    )
+    test_deck.shuffle(rng=rng)
+    dice_roller = DiceRoller()
+    return Counter({
+        ('card', test_deck.deal_card().value): 1,
+        ('roll', dice_roller.roll(rng=rng)): 1
+    })
+
+
+class TestRngInjection(unittest.TestCase):
+    """TestCase class for the rng arguments on decks and dice
+
+    i. equal seeds shuffle decks into the same order
+    ii. equal seeds roll the same dice values
+    """
+    def test_seeded_shuffle_is_reproducible(self):
+        """Equal seeds shuffle decks into the same order
+        """
+        card_list = [Card(rank=1, value=i) for i in range(1, 101)]
+        first_deck = DeckOfCards(card_list=card_list)
+        second_deck = DeckOfCards(card_list=card_list)
+        first_deck.shuffle(rng=random.Random(7))
+        second_deck.shuffle(rng=random.Random(7))
+        self.assertEqual(first_deck.card_list, second_deck.card_list)
+        self.assertNotEqual(first_deck.card_list, card_list)
+
+    def test_seeded_rolls_are_reproducible(self):
+        """Equal seeds roll the same dice values
+        """
+        first_rng = random.Random(11)
+        second_rng = random.Random(11)
+        test_die = SingleDie(num_sides=20)
+        dice_roller = DiceRoller(num_sides=12, num_dice=3)
+        first_rolls = [test_die.roll(rng=first_rng) for i in range(50)]
+        second_rolls = [test_die.roll(rng=second_rng) for i in range(50)]
+        self.assertEqual(first_rolls, second_rolls)
+        first_rolls = [dice_roller.roll(rng=first_rng) for i in range(50)]
+        second_rolls = [dice_roller.roll(rng=second_rng) for i in range(50)]
+        self.assertEqual(first_rolls, second_rolls)
+        first_faces, first_sums = dice_roller.roll_many(20, rng=first_rng)
+        second_faces, second_sums = dice_roller.roll_many(20, rng=second_rng)
+        self.assertEqual(list(first_sums), list(second_sums))
+
+
+class TestMonteCarloRunner(unittest.TestCase):
+    """TestCase class containing unit tests for MonteCarloRunner
+
+    i. a fixed seed gives the same result with one or two workers
+    ii. different seeds give different results
+    iii. the merged result counts every trial
+    iv. derived seeds differ between streams
+    v. a runner with no workers raises a ValueError
+    """
+    def test_same_result_for_any_worker_count(self):
+        """A fixed seed gives the same result with one or two workers
+        """
+        single_runner = MonteCarloRunner(
+            deal_and_roll_trial, initial=Counter(), block_size=70
+        )
+        pool_runner = MonteCarloRunner(
+            deal_and_roll_trial, initial=Counter(), num_workers=2,
+            block_size=70
+        )
+        single_result = single_runner.run(500, seed=2024)
+        pool_result = pool_runner.run(500, seed=2024)
+        self.assertEqual(single_result, pool_result)
+        self.assertEqual(single_runner.run(500, seed=2024), single_result)
+
+    def test_different_seeds_differ(self):
+        """Different seeds give different results
+        """
+        runner = MonteCarloRunner(deal_and_roll_trial, initial=Counter())
+        self.assertNotEqual(runner.run(300, seed=1), runner.run(300, seed=2))
+        unseeded_result = runner.run(300)
+        self.assertEqual(runner.run(300, seed=runner.last_seed),
+                         unseeded_result)
+
+    def test_result_counts_every_trial(self):
+        """The merged result counts every trial
+        """
+        runner = MonteCarloRunner(
+            deal_and_roll_trial, initial=Counter(), block_size=64
+        )
+        result = runner.run(1000, seed=5)
+        card_total = sum(
+            [count for key, count in result.items() if key[0] == 'card']
+        )
+        roll_values = [key[1] for key in result.keys() if key[0] == 'roll']
+        self.assertEqual(card_total, 1000)
+        self.assertEqual(sorted(roll_values), list(range(2, 13)))
+
+    def test_derived_seeds_differ(self):
+        """Derived seeds differ between streams
+        """
+        seeds = set([derive_seed(99, i) for i in range(100)])
+        self.assertEqual(len(seeds), 100)
+        self.assertEqual(derive_seed(99, 3), derive_seed(99, 3))
+
+    def test_no_workers_raises_value_error(self):
+        """A runner with no workers raises a ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            MonteCarloRunner(deal_and_roll_trial, num_workers=0)
@@ -0,0 +1,154 @@
+# tests for the immutable Board snapshots in the snapshot.py module
+
+import random
+import unittest
+
+from base_models.board import Board
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.dice import DiceRoller
+from base_models.journal import MoveJournal
+from base_models.shoe import Shoe
+from base_models.snapshot import BoardSnapshot
+from base_models.snapshot import DeckSnapshot
+from base_models.tiles import Tile
+
+
+def snapshot_state(snapshot):
+    """plain description of a snapshot for comparing states
+    """
+    return (
+        list(snapshot.spaces),
+        list(snapshot.tiles),
+        [[card.to_dict() for card in deck.card_list]
+         for deck in snapshot.decks],
+        list(snapshot.dice),
+        list(snapshot.tokens),
+        snapshot.score
+    )
+
+
+class TestBoardSnapshot(unittest.TestCase):
+    """TestCase class containing unit tests for BoardSnapshot
+
+    i. Board.snapshot tracks every kind of change and matches a snapshot
+        made from scratch
+    ii. earlier snapshots are left as they were
+    iii. unchanged structure is shared between snapshots
+    iv. DeckSnapshot deals and adds at both ends
+    v. snapshot methods make new snapshots and to_board rebuilds a Board
+    """
+    def setUp(self):
+        self.tiles = [Tile(rank=1, value=i) for i in range(3)]
+        card_list = [Card(rank=1, value=i) for i in range(1, 11)]
+        self.test_board = Board(
+            spaces=[0] * 100,
+            tiles=list(self.tiles),
+            decks=[DeckOfCards(card_list=card_list),
+                   Shoe(templates=[DeckOfCards(card_list=card_list)])],
+            tokens=['chip'],
+            dice_rollers=[DiceRoller()],
+            score=0
+        )
+
+    def test_tracks_changes(self):
+        """Board.snapshot tracks every kind of change and matches a
+        snapshot made from scratch
+        """
+        board = self.test_board
+        rng = random.Random(2)
+        journal = MoveJournal(board)
+        board.snapshot()
+        journal.mark()
+        board.place_tile(10, self.tiles[0])
+        board.remove_tile(10, empty=0)
+        board.place_tile(50, self.tiles[1])
+        board.add_card(0, board.deal_card(0), bottom_add=True)
+        board.deal_card(0, bottom_deal=True)
+        board.add_card(0, board.deal_card(1))
+        board.shuffle_deck(0, rng=rng)
+        board.roll_dice(0, rng=rng)
+        board.add_token('house')
+        board.remove_token('chip')
+        board.set_score(2)
+        self.assertEqual(
+            snapshot_state(board.snapshot()),
+            snapshot_state(BoardSnapshot.from_board(board))
+        )
+        journal.undo()
+        self.assertEqual(
+            snapshot_state(board.snapshot()),
+            snapshot_state(BoardSnapshot.from_board(board))
+        )
+
+    def test_earlier_snapshots_unchanged(self):
+        """earlier snapshots are left as they were
+        """
+        board = self.test_board
+        first_snapshot = board.snapshot()
+        self.assertTrue(board.snapshot() is first_snapshot)
+        first_state = snapshot_state(first_snapshot)
+        board.set_space(3, 'road')
+        board.deal_card(0)
+        board.add_token('house')
+        second_snapshot = board.snapshot()
+        self.assertEqual(snapshot_state(first_snapshot), first_state)
+        self.assertEqual(second_snapshot.spaces[3], 'road')
+        self.assertEqual(second_snapshot.decks[0].cards_left, 9)
+        board.spaces[4] = 'city'
+        board.refresh_hash()
+        self.assertEqual(board.snapshot().spaces[4], 'city')
+
+    def test_structure_shared(self):
+        """unchanged structure is shared between snapshots
+        """
+        board = self.test_board
+        first_snapshot = board.snapshot()
+        board.set_space(0, 'road')
+        second_snapshot = board.snapshot()
+        self.assertTrue(second_snapshot.tiles is first_snapshot.tiles)
+        self.assertTrue(second_snapshot.decks is first_snapshot.decks)
+        self.assertTrue(
+            second_snapshot.spaces._root[1] is first_snapshot.spaces._root[1]
+        )
+
+    def test_deck_snapshot(self):
+        """DeckSnapshot deals and adds at both ends
+        """
+        cards = [Card(rank=2, value=i) for i in range(5)]
+        deck = DeckSnapshot(cards)
+        card, dealt_deck = deck.deal_card()
+        self.assertTrue(card is cards[0])
+        card, dealt_deck = dealt_deck.deal_card(bottom_deal=True)
+        self.assertTrue(card is cards[4])
+        added_deck = dealt_deck.add_card(cards[0], bottom_add=True)
+        added_deck = added_deck.add_card(cards[4], bottom_add=True)
+        added_deck = added_deck.add_card(cards[1])
+        self.assertEqual(
+            added_deck.card_list,
+            [cards[1], cards[1], cards[2], cards[3], cards[0], cards[4]]
+        )
+        self.assertEqual(deck.card_list, cards)
+        self.assertEqual(DeckSnapshot().deal_card()[0], None)
+
+    def test_snapshot_methods_and_to_board(self):
+        """snapshot methods make new snapshots and to_board rebuilds a Board
+        """
+        snapshot = self.test_board.snapshot()
+        changed = snapshot.place_tile(1, self.tiles[2])
+        card, changed = changed.deal_card(0)
+        changed = changed.add_card(0, card, bottom_add=True)
+        changed = changed.add_token('house').remove_token('chip')
+        changed = changed.set_score(7).remove_tile(1, empty=0)
+        self.assertEqual(list(snapshot.tiles), self.tiles)
+        new_board = changed.to_board()
+        self.assertEqual(new_board.score, 7)
+        self.assertEqual(new_board.tokens, ['house'])
+        self.assertEqual(new_board.tiles,
+                         [self.tiles[0], self.tiles[1], self.tiles[2]])
+        self.assertEqual(new_board.decks[0].show_bottom(),
+                         {'rank': 1, 'value': 1})
+        self.assertEqual(new_board.decks[1].cards_left, 10)
+        self.assertEqual(
+            snapshot_state(new_board.snapshot()), snapshot_state(changed)
+        )
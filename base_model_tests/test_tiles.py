@@ -3,7 +3,11 @@
 
 import unittest
 
+from base_models.cards import Card
+from base_models.tiles import CompactTile
+from base_models.tiles import EdgeTile
 from base_models.tiles import Tile
+from base_models.tiles import rotation_key
 
 
 class TestTileMethods(unittest.TestCase):
@@ -17,6 +21,8 @@ class TestTileMethods(unittest.TestCase):
         expected output when not default initialization
     iii. get a reasonable error when I initialize with an unreasonable initial
         condition set
+    iv. a CompactTile holds its attributes in slots, not in a dict
+    v. an EdgeTile turns its edge labels and shares a key with its turns
     """
     def test_default_initialization(self):
         """Test that when I initialize with no args I get a Tile object
@@ -58,3 +64,33 @@ class TestTileMethods(unittest.TestCase):
         }
         with self.assertRaises(TypeError) as context:
             Tile(**initial_attributes)
+
+    def test_compact_tile_uses_slots(self):
+        """Test a CompactTile holds its attributes in slots, not a dict
+        """
+        test_tile = CompactTile(rank=2, value=11, num_edges=6)
+        self.assertTrue(isinstance(test_tile, Tile))
+        self.assertTrue(isinstance(test_tile, Card))
+        self.assertEqual(test_tile.num_edges, 6)
+        self.assertEqual(
+            test_tile.to_dict(), {'rank': 2, 'value': 11, 'num_edges': 6}
+        )
+        self.assertFalse(hasattr(test_tile, '__dict__'))
+
+    def test_edge_tile_rotation(self):
+        """Test an EdgeTile turns its labels and keys all turns alike
+        """
+        test_tile = EdgeTile(edges=('city', 'road', 'field', 'road'))
+        self.assertTrue(isinstance(test_tile, Tile))
+        self.assertEqual(test_tile.num_edges, 4)
+        self.assertEqual(test_tile.edges_at(1),
+                         ('road', 'city', 'road', 'field'))
+        self.assertEqual(test_tile.edges_at(4), test_tile.edges)
+        turned = test_tile.rotated(3)
+        self.assertEqual(turned.edges, ('road', 'field', 'road', 'city'))
+        self.assertEqual(turned.rotation_key, test_tile.rotation_key)
+        self.assertNotEqual(EdgeTile(edges='abcd').rotation_key,
+                            EdgeTile(edges='abdc').rotation_key)
+        key, shift = rotation_key(('b', None, 'a', None))
+        self.assertEqual(key, (None, 'a', None, 'b'))
+        self.assertEqual(shift, 1)
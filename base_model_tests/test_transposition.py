@@ -0,0 +1,139 @@
+# tests for the fixed size transposition table in transposition.py
+
+import pickle
+import unittest
+
+from base_models.board import Board
+from base_models.transposition import LOWER
+from base_models.transposition import TranspositionTable
+from base_models.transposition import attach_table
+from base_models.transposition import shared_memory
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """TestCase class containing unit tests for TranspositionTable
+
+    i. stored entries are found again and unknown keys miss
+    ii. Boards can be used as keys through hash_key
+    iii. each replacement policy keeps the entries it should
+    iv. the counters track hits, misses, evictions and rejections
+    v. clear and pickling behave for a local table
+    vi. a shared table is seen by a second handle on the same block
+    """
+    def test_store_and_probe(self):
+        """stored entries are found again and unknown keys miss
+        """
+        table = TranspositionTable(num_entries=64, ways=4)
+        self.assertTrue(table.store(12345, 0.5, depth=3, bound=LOWER))
+        entry = table.probe(12345)
+        self.assertEqual(entry, (0.5, 3, LOWER))
+        self.assertEqual(entry.depth, 3)
+        self.assertEqual(table.probe(54321), None)
+        self.assertEqual(table.probe(12345, min_depth=4), None)
+        table.store(2 ** 64 + 12345, -1.25)
+        self.assertEqual(table.probe(12345).value, -1.25)
+        self.assertEqual(len(table), 1)
+        self.assertEqual(table.num_entries, 64)
+
+    def test_board_keys(self):
+        """Boards can be used as keys through hash_key
+        """
+        table = TranspositionTable(num_entries=16)
+        test_board = Board(spaces=[0, 0, 0])
+        table.store(test_board, 7.0, depth=1)
+        test_board.set_space(0, 'x')
+        self.assertEqual(table.probe(test_board), None)
+        test_board.set_space(0, 0)
+        self.assertEqual(table.probe(test_board).value, 7.0)
+
+    def test_always_policy(self):
+        """always policy replaces the slot picked by the key
+        """
+        table = TranspositionTable(num_entries=2, ways=2)
+        table.store(0, 1.0)
+        table.store(1, 2.0)
+        self.assertTrue(table.store(2, 3.0))
+        self.assertEqual(table.probe(0), None)
+        self.assertEqual(table.probe(2).value, 3.0)
+        self.assertEqual(table.stats['evictions'], 1)
+
+    def test_depth_policy(self):
+        """depth policy keeps the deeper entries
+        """
+        table = TranspositionTable(num_entries=2, ways=2, policy='depth')
+        table.store(0, 1.0, depth=5)
+        table.store(1, 2.0, depth=2)
+        self.assertFalse(table.store(2, 3.0, depth=1))
+        self.assertFalse(table.store(0, 9.0, depth=4))
+        self.assertTrue(table.store(2, 3.0, depth=2))
+        self.assertEqual(table.probe(1), None)
+        self.assertEqual(table.probe(0).value, 1.0)
+        self.assertEqual(table.stats['rejections'], 2)
+
+    def test_clock_policy(self):
+        """clock policy gives up entries not used since the last sweep
+        """
+        table = TranspositionTable(num_entries=3, ways=3, policy='clock')
+        for key in range(3):
+            table.store(key, float(key))
+        table.store(3, 3.0)
+        self.assertEqual(table.probe(0), None)
+        table.probe(1)
+        table.store(4, 4.0)
+        self.assertEqual(table.probe(2), None)
+        self.assertEqual(table.probe(1).value, 1.0)
+        self.assertEqual(table.probe(4).value, 4.0)
+
+    def test_counters(self):
+        """the counters track hits, misses, evictions and rejections
+        """
+        table = TranspositionTable(num_entries=8, ways=2)
+        table.store(1, 1.0)
+        table.probe(1)
+        table.probe(2)
+        table.probe(3)
+        self.assertEqual(table.stats, {
+            'hits': 1, 'misses': 2, 'stores': 1,
+            'evictions': 0, 'rejections': 0
+        })
+        table.reset_stats()
+        self.assertEqual(table.hits, 0)
+
+    def test_clear_and_pickle(self):
+        """clear and pickling behave for a local table
+        """
+        table = TranspositionTable(num_entries=8, policy='depth')
+        table.store(5, 0.25, depth=2)
+        copied_table = pickle.loads(pickle.dumps(table))
+        self.assertEqual(copied_table.policy, 'depth')
+        self.assertEqual(copied_table.probe(5).value, 0.25)
+        table.clear()
+        self.assertEqual(len(table), 0)
+        self.assertEqual(copied_table.probe(5).depth, 2)
+
+    def test_bad_arguments(self):
+        """bad policies and sizes raise ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            TranspositionTable(policy='random')
+        with self.assertRaises(ValueError) as context:
+            TranspositionTable(num_entries=2, ways=4)
+        with self.assertRaises(ValueError) as context:
+            TranspositionTable(ways=0)
+
+    @unittest.skipIf(shared_memory is None, "needs shared_memory")
+    def test_shared_table(self):
+        """a shared table is seen by a second handle on the same block
+        """
+        table = TranspositionTable(num_entries=32, shared=True)
+        try:
+            other_table = attach_table(table.name)
+            other_table.store(99, 4.5, depth=6)
+            self.assertEqual(table.probe(99), (4.5, 6, 0))
+            unpickled_table = pickle.loads(pickle.dumps(table))
+            self.assertEqual(unpickled_table.probe(99).value, 4.5)
+            other_table.close()
+            unpickled_table.close()
+        finally:
+            table.close()
+            table.unlink()
@@ -3,6 +3,7 @@
 import unittest
 
 from base_models.utils import list_type_check
+from base_models.utils import LRUCache
 from base_models.cards import Card
 
 
@@ -43,3 +44,29 @@ class TestListTypeCheck(unittest.TestCase):
         """
         with self.assertRaises(TypeError) as context:
             list_type_check(self.card_list_incorrect, Card, error=True)
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the bounded LRUCache
+
+    i. entries beyond maxsize evict the least recently used entry
+    ii. a zero maxsize raises ValueError
+    """
+    def test_least_recently_used_is_evicted(self):
+        """Entries beyond maxsize evict the least recently used entry
+        """
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertEqual(cache.get('b', 'missing'), 'missing')
+
+    def test_zero_maxsize_raises_value_error(self):
+        """A zero maxsize raises ValueError
+        """
+        with self.assertRaises(ValueError) as context:
+            LRUCache(maxsize=0)
@@ -0,0 +1,160 @@
+# tests for the incremental Zobrist hash of Board state
+# kept by the zobrist.py module
+
+import random
+import unittest
+
+from base_models.board import Board
+from base_models.cards import Card
+from base_models.cards import DeckOfCards
+from base_models.shoe import Shoe
+from base_models.tiles import Tile
+from base_models.zobrist import ZobristKeys
+from base_models.zobrist import state_key
+
+
+class TestZobristHash(unittest.TestCase):
+    """TestCase class containing unit tests for Board.hash_key
+
+    i. keys are deterministic 64-bit values
+    ii. a run of changes keeps the hash equal to a full recompute
+    iii. returning to an earlier state returns to the earlier hash
+    iv. tokens and reserve tiles hash as multisets
+    v. refresh_hash picks up direct changes to the attributes
+    vi. count based decks hash by composition
+    vii. the board dict only gains hash state once hash_key is used
+    viii. objects hash through a state_key method or raise TypeError
+    """
+    def setUp(self):
+        self.card_list = [Card(rank=1, value=i) for i in range(1, 11)]
+        self.tiles = [Tile(num_edges=6, rank=1, value=i) for i in range(3)]
+
+    def make_board(self):
+        return Board(
+            spaces=[0] * 5,
+            tiles=list(self.tiles),
+            decks=[DeckOfCards(card_list=self.card_list), DeckOfCards()],
+            tokens=['chip'],
+            score=0
+        )
+
+    def test_keys_are_deterministic(self):
+        """keys are deterministic 64-bit values
+        """
+        first_keys = ZobristKeys()
+        second_keys = ZobristKeys()
+        key = first_keys.key('space', 0, state_key(Card(rank=1, value=2)))
+        self.assertEqual(
+            key, second_keys.key('space', 0, ('card', 1, 2))
+        )
+        self.assertTrue(0 <= key < 2 ** 64)
+        self.assertNotEqual(key, first_keys.key('space', 1, ('card', 1, 2)))
+        self.assertNotEqual(key, ZobristKeys(salt='x').key(
+            'space', 0, ('card', 1, 2)
+        ))
+
+    def test_changes_match_full_recompute(self):
+        """a run of changes keeps the hash equal to a full recompute
+        """
+        test_board = self.make_board()
+        test_board.set_hash_debug()
+        rng = random.Random(12)
+        test_board.place_tile(2, self.tiles[0])
+        test_board.set_space(0, 'road')
+        card = test_board.deal_card(0)
+        test_board.add_card(1, card)
+        test_board.deal_card(0, bottom_deal=True)
+        test_board.add_card(0, card, bottom_add=True)
+        test_board.shuffle_deck(0, rng=rng)
+        test_board.add_token('house')
+        test_board.remove_token('chip')
+        test_board.set_score(3)
+        test_board.remove_tile(2, empty=0)
+        self.assertEqual(
+            test_board.hash_key,
+            test_board._zobrist.full_hash(test_board)
+        )
+
+    def test_earlier_state_has_earlier_hash(self):
+        """returning to an earlier state returns to the earlier hash
+        """
+        test_board = self.make_board()
+        start_key = test_board.hash_key
+        card = test_board.deal_card(0)
+        test_board.place_tile(4, self.tiles[1])
+        test_board.set_score(10)
+        changed_key = test_board.hash_key
+        self.assertNotEqual(changed_key, start_key)
+        test_board.add_card(0, card)
+        test_board.remove_tile(4, empty=0)
+        test_board.set_score(0)
+        self.assertEqual(test_board.hash_key, start_key)
+        self.assertEqual(self.make_board().hash_key, start_key)
+
+    def test_multisets(self):
+        """tokens and reserve tiles hash as multisets
+        """
+        first_board = Board(tokens=['a', 'b', 'a'])
+        second_board = Board(tokens=['b', 'a', 'a'])
+        third_board = Board(tokens=['a', 'b'])
+        self.assertEqual(first_board.hash_key, second_board.hash_key)
+        self.assertNotEqual(first_board.hash_key, third_board.hash_key)
+        third_board.add_token('a')
+        self.assertEqual(third_board.hash_key, first_board.hash_key)
+        doubled_board = Board(tiles=[self.tiles[0], Tile(6, 1, 0)])
+        self.assertNotEqual(doubled_board.hash_key, Board().hash_key)
+
+    def test_refresh_after_direct_change(self):
+        """refresh_hash picks up direct changes to the attributes
+        """
+        test_board = self.make_board()
+        start_key = test_board.hash_key
+        test_board.spaces[0] = 'city'
+        self.assertEqual(test_board.hash_key, start_key)
+        self.assertNotEqual(test_board.refresh_hash(), start_key)
+        test_board.spaces[0] = 0
+        self.assertEqual(test_board.refresh_hash(), start_key)
+
+    def test_shoe_hashes_by_composition(self):
+        """count based decks hash by composition
+        """
+        template = DeckOfCards(card_list=self.card_list)
+        test_board = Board(decks=[Shoe(templates=[template], num_copies=2)])
+        test_board.set_hash_debug()
+        start_key = test_board.hash_key
+        card = test_board.deal_card(0)
+        self.assertNotEqual(test_board.hash_key, start_key)
+        test_board.add_card(0, card)
+        self.assertEqual(test_board.hash_key, start_key)
+
+    def test_board_dict_untouched_until_used(self):
+        """the board dict only gains hash state once hash_key is used
+        """
+        test_board = self.make_board()
+        test_board.set_space(1, 'road')
+        self.assertEqual(
+            sorted(test_board.__dict__.keys()),
+            ['decks', 'dice_rollers', 'score', 'spaces', 'tiles', 'tokens']
+        )
+        test_board.hash_key
+        self.assertTrue('_zobrist' in test_board.__dict__)
+
+    def test_objects_need_a_state_key(self):
+        """objects hash through a state_key method or raise TypeError
+        """
+        class Piece(object):
+            def __init__(self, colour):
+                self.colour = colour
+
+            def state_key(self):
+                return ('piece', self.colour)
+
+        first_board = Board(tokens=[Piece('red')])
+        second_board = Board(tokens=[Piece('red')])
+        self.assertEqual(first_board.hash_key, second_board.hash_key)
+        self.assertEqual(state_key([Piece('red'), None]),
+                         (('piece', 'red'), None))
+        with self.assertRaises(TypeError) as context:
+            state_key(object())
+        with self.assertRaises(TypeError) as context:
+            Board(spaces=[object()]).hash_key
@@ -0,0 +1,302 @@
+# module for bitboards, Board.spaces of a rectangular grid held as one
+# Python int per kind of piece with bit y * width + x set where the piece
+# sits, in the same row by row order as grid.SquareGrid
+# occupancy, neighbor and line checks then become a few shifts, ANDs and
+# ORs over the whole board at once instead of loops over the spaces list
+
+DIRECTIONS = (
+    (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)
+)
+# one direction per line through a cell: rows, columns and diagonals
+LINE_DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
+def bits_of(mask):
+    """indexes of the set bits of mask, lowest first
+    """
+    indexes = []
+    while mask:
+        low = mask & -mask
+        indexes.append(low.bit_length() - 1)
+        mask ^= low
+    return indexes
+
+
+def popcount(mask):
+    return bin(mask).count('1')
+
+
+class BitGrid(object):
+    """Masks and shifts for a width by height grid of cells
+
+    Precomputed on creation:
+    i. full: every cell; rows and columns: one mask per row and column
+    ii. neighborhoods: the up to eight cells around each cell
+    iii. line masks of a given length, built on first use and kept,
+        with the lines through each cell for checking the last move
+
+    shift moves every bit of a mask one step, or a few, in a direction
+    and drops bits that would leave the grid, so patterns are found
+    across the whole board at once.
+    """
+    def __init__(self, width=8, height=8):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.full = (1 << self.size) - 1
+        row = (1 << width) - 1
+        self.rows = [row << (y * width) for y in range(height)]
+        column = 0
+        for y in range(height):
+            column |= 1 << (y * width)
+        self.columns = [column << x for x in range(width)]
+        # masks of the columns a shift by dx may land in
+        self._keep = {0: self.full}
+        for dx in range(1, width):
+            self._keep[dx] = self.full
+            self._keep[-dx] = self.full
+            for x in range(dx):
+                self._keep[dx] &= ~self.columns[x]
+                self._keep[-dx] &= ~self.columns[width - 1 - x]
+        self.neighborhoods = [self.neighbors(1 << index)
+                              for index in range(self.size)]
+        self._lines = {}
+        self._lines_through = {}
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def coord(self, index):
+        return index % self.width, index // self.width
+
+    def shift(self, mask, dx, dy):
+        """mask with every bit moved dx columns and dy rows
+        """
+        if abs(dx) >= self.width:
+            return 0
+        offset = dy * self.width + dx
+        if offset >= 0:
+            mask = mask << offset
+        else:
+            mask = mask >> -offset
+        return mask & self._keep[dx]
+
+    def neighbors(self, mask, directions=DIRECTIONS):
+        """cells one step from a cell of mask in any of directions
+        """
+        spread = 0
+        for dx, dy in directions:
+            spread |= self.shift(mask, dx, dy)
+        return spread
+
+    def has_line(self, mask, length):
+        """True if mask holds length cells in a row, column or diagonal
+        """
+        for dx, dy in LINE_DIRECTIONS:
+            run = mask
+            for step in range(length - 1):
+                run &= self.shift(run, dx, dy)
+                if not run:
+                    break
+            if run:
+                return True
+        return False
+
+    def line_ends(self, mask, length):
+        """mask of the cells ending a line of length cells of mask
+
+        the end being the cell furthest along the line direction
+        """
+        ends = 0
+        for dx, dy in LINE_DIRECTIONS:
+            run = mask
+            for step in range(length - 1):
+                run &= self.shift(run, dx, dy)
+            ends |= run
+        return ends
+
+    def matches(self, masks, offsets):
+        """cells c where masks[k] holds c + offsets[k] for every k
+
+        masks and offsets pair up, offsets being (dx, dy); for instance
+        an own piece, an enemy piece and an empty cell in a row
+        """
+        found = self.full
+        for mask, (dx, dy) in zip(masks, offsets):
+            found &= self.shift(mask, -dx, -dy)
+        return found
+
+    def lines(self, length):
+        """masks of every line of length cells
+        """
+        if length not in self._lines:
+            lines = []
+            through = [[] for index in range(self.size)]
+            for dx, dy in LINE_DIRECTIONS:
+                for y in range(self.height):
+                    for x in range(self.width):
+                        end_x = x + dx * (length - 1)
+                        end_y = y + dy * (length - 1)
+                        if not (0 <= end_x < self.width and
+                                0 <= end_y < self.height):
+                            continue
+                        cells = [self.index(x + dx * step, y + dy * step)
+                                 for step in range(length)]
+                        line = 0
+                        for cell in cells:
+                            line |= 1 << cell
+                        for cell in cells:
+                            through[cell].append(line)
+                        lines.append(line)
+            self._lines[length] = lines
+            self._lines_through[length] = through
+        return self._lines[length]
+
+    def lines_through(self, index, length):
+        """masks of the lines of length cells that pass through index
+        """
+        self.lines(length)
+        return self._lines_through[length][index]
+
+    def completes_line(self, mask, index, length):
+        """True if mask holds a line of length cells through index,
+        the check to make after a piece is put on index
+        """
+        for line in self.lines_through(index, length):
+            if mask & line == line:
+                return True
+        return False
+
+
+class BitBoard(object):
+    """Contents of Board.spaces on a BitGrid as one mask per piece
+
+    Every distinct value in spaces other than empty is a piece with its
+    own mask, so a board holding 'X' and 'O' or (player, kind) tuples
+    gets one mask per player or per kind; to_spaces gives back an equal
+    list. Pieces need not be hashable, unhashable ones are found by
+    equality.
+
+    i. mask(*pieces): the cells holding any of pieces
+    ii. occupied, empty: the cells holding a piece or not
+    iii. get, set: one cell at a time, keeping the masks in step
+    iv. from_board: a BitBoard that follows changes made through the
+        Board mutators until close is called
+    """
+    def __init__(self, grid, spaces=None, empty=0):
+        self.grid = grid
+        self.empty_value = empty
+        self.pieces = []
+        self.masks = []
+        self._piece_ids = {}
+        self.board = None
+        if spaces is None:
+            spaces = [empty] * grid.size
+        self.load(spaces)
+
+    @classmethod
+    def from_board(cls, board, grid, empty=0):
+        """BitBoard of board.spaces kept up to date with board
+        """
+        bitboard = cls(grid, board.spaces, empty=empty)
+        bitboard.board = board
+        board._attach(bitboard)
+        return bitboard
+
+    def load(self, spaces):
+        """replace the masks with ones describing spaces
+        """
+        if len(spaces) != self.grid.size:
+            raise ValueError(
+                "Grid has {} cells for {} spaces".format(
+                    self.grid.size, len(spaces)
+                )
+            )
+        self.pieces = []
+        self.masks = []
+        self._piece_ids = {}
+        for index, content in enumerate(spaces):
+            if content != self.empty_value:
+                self.masks[self._piece_id(content)] |= 1 << index
+
+    def _find(self, piece):
+        """number of piece among self.pieces, None if it is new
+        """
+        try:
+            return self._piece_ids.get(piece)
+        except TypeError:
+            for number, known in enumerate(self.pieces):
+                if known == piece:
+                    return number
+            return None
+
+    def _piece_id(self, piece):
+        number = self._find(piece)
+        if number is None:
+            number = len(self.pieces)
+            self.pieces.append(piece)
+            self.masks.append(0)
+            try:
+                self._piece_ids[piece] = number
+            except TypeError:
+                pass
+        return number
+
+    def mask(self, *pieces):
+        """cells holding any of pieces
+        """
+        found = 0
+        for piece in pieces:
+            number = self._find(piece)
+            if number is not None:
+                found |= self.masks[number]
+        return found
+
+    @property
+    def occupied(self):
+        found = 0
+        for mask in self.masks:
+            found |= mask
+        return found
+
+    @property
+    def empty(self):
+        return self.grid.full & ~self.occupied
+
+    def get(self, index):
+        bit = 1 << index
+        for number, mask in enumerate(self.masks):
+            if mask & bit:
+                return self.pieces[number]
+        return self.empty_value
+
+    def set(self, index, content):
+        bit = 1 << index
+        for number, mask in enumerate(self.masks):
+            if mask & bit:
+                self.masks[number] = mask & ~bit
+        if content != self.empty_value:
+            self.masks[self._piece_id(content)] |= bit
+
+    def to_spaces(self):
+        """list of the contents of every cell, as Board.spaces
+        """
+        spaces = [self.empty_value] * self.grid.size
+        for number, mask in enumerate(self.masks):
+            piece = self.pieces[number]
+            for index in bits_of(mask):
+                spaces[index] = piece
+        return spaces
+
+    def board_changed(self, board, event):
+        """follow a space changed through a Board mutator
+        """
+        if event[0] == 'space':
+            self.set(event[1], event[3])
+
+    def close(self):
+        """stop following the board
+        """
+        if self.board is not None:
+            self.board._detach(self)
+            self.board = None
@@ -18,10 +18,14 @@
 #   Development card deck;
 # etc. for other games to elaborate as reasonable
 
+import random
+
 from cards import DeckOfCards
 from tiles import Tile
 from dice import DiceRoller
 from utils import list_type_check
+from snapshot import SnapshotTracker
+from zobrist import ZobristTracker
 
 
 class Board(object):
@@ -42,7 +46,26 @@ class Board(object):
         score: to be worked out --  this will be None for early development
 
     Additional attributes may be added later.
+
+    Description of methods that change the board:
+    i. set_space: put any content in a space
+    ii. place_tile: move a tile (from the reserve if held there) to a space
+    iii. remove_tile: move the tile in a space back to the reserve
+    iv. deal_card / add_card / shuffle_deck: act on one of the decks
+    v. roll_dice: roll one of the dice rollers
+    vi. add_token / remove_token: change the tokens
+    vii. set_score: change the score
+
+    Changes made through these methods are reported to any trackers
+    attached to the board, such as the ones behind hash_key and
+    snapshot or a MoveJournal; after changing the attributes directly
+    call refresh_hash.
     """
+    _trackers = ()
+    _zobrist = None
+    _snapshots = None
+    _record_rng = False
+
     def __init__(self,
                  spaces=[],
                  tiles=[],
@@ -51,7 +74,8 @@ class Board(object):
                  dice_rollers=[],
                  score=None
                  ):
-        self.spaces = spaces
+        # copy so that the mutators never write into a shared default
+        self.spaces = list(spaces)
         self.tiles = []
         if tiles:
             tiles_type_check = list_type_check(tiles, Tile, error=True)
@@ -69,5 +93,185 @@ class Board(object):
             )
             self.dice_rollers.extend([obj for obj in dice_rollers])
 
-        self.tokens = tokens
+        self.tokens = list(tokens)
+        self.score = score
+
+    def _attach(self, tracker):
+        """report every later change to tracker.board_changed
+        """
+        self._trackers = self._trackers + (tracker,)
+        self._record_rng = self._record_rng or getattr(
+            tracker, 'records_rng', False
+        )
+
+    def _detach(self, tracker):
+        """stop reporting changes to tracker
+        """
+        self._trackers = tuple([
+            attached for attached in self._trackers
+            if attached is not tracker
+        ])
+        self._record_rng = any([
+            getattr(attached, 'records_rng', False)
+            for attached in self._trackers
+        ])
+
+    def _note_rng(self, rng):
+        """report the state of rng before it is drawn from, for trackers
+        that set records_rng
+        """
+        if self._record_rng:
+            # None stands for the global random module, which cannot be
+            # copied or pickled along with the trackers
+            state_source = random if rng is None else rng
+            self._changed(('rng', rng, state_source.getstate()))
+
+    def _note_pins(self, deck_index):
+        """report the cards pinned at the ends of a count based deck
+        before a deal or add can change them, for trackers that set
+        records_rng
+        """
+        if self._record_rng:
+            self._changed(('pins', deck_index) +
+                          tuple(self.decks[deck_index].pinned_cards()))
+
+    def _changed(self, event):
+        """report one change, a tuple starting with its kind, to trackers
+        """
+        for tracker in self._trackers:
+            tracker.board_changed(self, event)
+
+    @property
+    def hash_key(self):
+        """64-bit Zobrist hash of spaces, tiles, decks, tokens and score
+
+        tracking starts on first use and is then kept up to date by the
+        mutator methods in O(1) per change for most changes
+        """
+        if self._zobrist is None:
+            self._zobrist = ZobristTracker(self)
+            self._attach(self._zobrist)
+        return self._zobrist.key
+
+    def refresh_hash(self):
+        """recompute hash_key, and the snapshot if one is tracked, after
+        the attributes were changed directly
+        """
+        if self._zobrist is not None:
+            self._zobrist.reset(self)
+        if self._snapshots is not None:
+            self._snapshots.reset(self)
+        return self.hash_key
+
+    def snapshot(self):
+        """immutable BoardSnapshot of the board as it is now
+
+        tracking starts on first use, after which each change makes the
+        next snapshot from the last in O(log n) and sharing its
+        structure, so taking a snapshot is O(1)
+        """
+        if self._snapshots is None:
+            self._snapshots = SnapshotTracker(self)
+            self._attach(self._snapshots)
+        return self._snapshots.current
+
+    def set_hash_debug(self, debug=True):
+        """check hash_key against a full recompute after every change
+        """
+        self.hash_key
+        self._zobrist.debug = debug
+
+    def set_space(self, index, content):
+        """put content in spaces[index] and return what was there
+        """
+        old_content = self.spaces[index]
+        self.spaces[index] = content
+        self._changed(('space', index, old_content, content))
+        return old_content
+
+    def place_tile(self, index, tile):
+        """move tile to spaces[index], out of the reserve if it is there
+
+        returns what was in the space before
+        """
+        if not isinstance(tile, Tile):
+            raise TypeError("Can only place Tile objects on the Board")
+        for position, reserve_tile in enumerate(self.tiles):
+            if reserve_tile is tile:
+                del self.tiles[position]
+                self._changed(('reserve_remove', position, tile))
+                break
+        return self.set_space(index, tile)
+
+    def remove_tile(self, index, empty=None):
+        """move the tile in spaces[index] to the reserve, leaving empty
+        """
+        tile = self.spaces[index]
+        if not isinstance(tile, Tile):
+            raise ValueError("No tile in space {}".format(index))
+        self.set_space(index, empty)
+        self.tiles.append(tile)
+        self._changed(('reserve_add', len(self.tiles) - 1, tile))
+        return tile
+
+    def deal_card(self, deck_index, bottom_deal=False):
+        """deal a card from decks[deck_index], default to 'top deal'
+        """
+        deck = self.decks[deck_index]
+        if not deck.ordered:
+            self._note_rng(deck.rng)
+            self._note_pins(deck_index)
+        card = deck.deal_card(bottom_deal=bottom_deal)
+        if card is not None:
+            self._changed(('deal', deck_index, card, bottom_deal))
+        return card
+
+    def add_card(self, deck_index, card, bottom_add=False):
+        """add a card to decks[deck_index], default to 'top add'
+        """
+        if not self.decks[deck_index].ordered:
+            self._note_pins(deck_index)
+        self.decks[deck_index].add_card(card, bottom_add=bottom_add)
+        self._changed(('add', deck_index, card, bottom_add))
+
+    def shuffle_deck(self, deck_index, rng=None):
+        """shuffle decks[deck_index]; rng is an optional random.Random
+        """
+        deck = self.decks[deck_index]
+        # reading card_list copies the deck, so only do it for trackers
+        old_order = deck.card_list if self._trackers else None
+        self._note_rng(rng)
+        deck.shuffle(rng=rng)
+        self._changed(('order', deck_index, old_order))
+
+    def roll_dice(self, roller_index, rng=None):
+        """roll dice_rollers[roller_index] and return the roll value
+        """
+        roller = self.dice_rollers[roller_index]
+        old_faces = [die.face_value for die in roller.dice]
+        old_value = roller.roll_value
+        self._note_rng(rng)
+        roll_value = roller.roll(rng=rng)
+        self._changed(('roll', roller_index, old_faces, old_value))
+        return roll_value
+
+    def add_token(self, token):
+        """append a token to tokens
+        """
+        self.tokens.append(token)
+        self._changed(('token_add', len(self.tokens) - 1, token))
+
+    def remove_token(self, token):
+        """remove the first token equal to token from tokens
+        """
+        position = self.tokens.index(token)
+        del self.tokens[position]
+        self._changed(('token_remove', position, token))
+
+    def set_score(self, score):
+        """replace the score and return the old one
+        """
+        old_score = self.score
         self.score = score
+        self._changed(('score', old_score, score))
+        return old_score
@@ -2,13 +2,19 @@
 # both are written into the cards.py module in this project
 # the intention is that cards are a base class to a future tiles class
 # which will enable the construction of flexible playing boards later
+from abc import ABCMeta
 from collections import deque
 import random
 
 from utils import list_type_check
 
+# Card is built on ABCMeta so that the slotted classes below can be
+# registered as Cards and pass Card type checks without inheriting the
+# instance __dict__ of Card
+_Registrable = ABCMeta('_Registrable', (object,), {})
 
-class Card(object):
+
+class Card(_Registrable):
     """Base class for all card or tile objects in board_game project
 
     base attributes are only 'rank' and 'value'
@@ -18,6 +24,162 @@ class Card(object):
         self.rank = rank
         self.value = value
 
+    def to_dict(self):
+        """return the attributes of the card as dict
+        """
+        return self.__dict__
+
+
+class CompactCard(object):
+    """Card with its attributes held in slots rather than in a __dict__
+
+    Behaves as a Card and is registered as one, so it passes Card type
+    checks, but it does not inherit from Card and has no instance dict,
+    which cuts the memory held per card when very many cards are alive
+    at once
+    """
+    __slots__ = ('rank', 'value')
+
+    def __init__(self, rank=0, value=0):
+        self.rank = rank
+        self.value = value
+
+    def to_dict(self):
+        """return the attributes of the card as dict
+        """
+        return {'rank': self.rank, 'value': self.value}
+
+
+Card.register(CompactCard)
+
+
+class FrozenCard(CompactCard):
+    """Immutable CompactCard meant to be shared between decks
+
+    Attributes cannot be changed once set; build these through a
+    CardRegistry so that equal cards are one shared object and can be
+    compared and hashed by identity
+    """
+    __slots__ = ()
+
+    def __init__(self, rank=0, value=0):
+        object.__setattr__(self, 'rank', rank)
+        object.__setattr__(self, 'value', value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenCard objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenCard objects are immutable")
+
+    def __reduce__(self):
+        # unpickle to the shared card of the default registry, as equal
+        # frozen cards are compared by identity
+        from registry import intern_card
+        return (intern_card, (self.rank, self.value))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class _LazyShuffle(object):
+    """Fisher-Yates shuffle of a deque that is resolved as it is dealt
+
+    Position p of the shuffled deck holds cards[swaps.get(p, p)]. The
+    deck still holds positions top to bottom - 1; positions free_top to
+    free_bottom - 1 have not been drawn yet, so each deal or peek at an
+    end draws one of them and records the swap. The cards are copied to
+    a list up front, as indexing a deque toward the middle is O(n).
+
+    Draws come from a generator of the shuffle's own, seeded from rng
+    when the shuffle starts, so dealing or finishing the shuffle later
+    never draws from rng.
+
+    restart shuffles the deck again in O(1): every position left is
+    marked undrawn, and as a uniform shuffle of any arrangement is
+    uniform, the cards they hold now need not be resolved first.
+    """
+    def __init__(self, cards, rng):
+        self.cards = list(cards)
+        self.swaps = {}
+        self.top = 0
+        self.bottom = len(self.cards)
+        self.restart(rng)
+
+    def restart(self, rng):
+        """start a new shuffle of the positions left, seeded from rng
+        """
+        self.rng = random.Random(rng.getrandbits(64))
+        self.free_top = self.top
+        self.free_bottom = self.bottom
+
+    def __len__(self):
+        return self.bottom - self.top
+
+    def _card_at(self, position):
+        return self.cards[self.swaps.get(position, position)]
+
+    def _swap(self, first, second):
+        swaps = self.swaps
+        first_source = swaps.get(first, first)
+        swaps[first] = swaps.get(second, second)
+        swaps[second] = first_source
+
+    def peek_top(self):
+        """draw the card for the top position if needed and return it
+        """
+        if self.top == self.bottom:
+            raise IndexError("peek into an empty deck")
+        if self.top == self.free_top < self.free_bottom:
+            chosen = self.rng.randrange(self.free_top, self.free_bottom)
+            self._swap(self.free_top, chosen)
+            self.free_top += 1
+        return self._card_at(self.top)
+
+    def peek_bottom(self):
+        """draw the card for the bottom position if needed and return it
+        """
+        if self.top == self.bottom:
+            raise IndexError("peek into an empty deck")
+        if self.free_top < self.free_bottom == self.bottom:
+            chosen = self.rng.randrange(self.free_top, self.free_bottom)
+            self._swap(self.free_bottom - 1, chosen)
+            self.free_bottom -= 1
+        return self._card_at(self.bottom - 1)
+
+    def deal_top(self):
+        card = self.peek_top()
+        self.swaps.pop(self.top, None)
+        self.top += 1
+        return card
+
+    def deal_bottom(self):
+        card = self.peek_bottom()
+        self.bottom -= 1
+        self.swaps.pop(self.bottom, None)
+        return card
+
+    def materialize(self):
+        """finish the shuffle and return the cards left as a deque
+
+        the positions never drawn are a uniformly random arrangement of
+        the cards not yet drawn, so shuffling them in one go completes
+        the same Fisher-Yates shuffle
+        """
+        remaining = [
+            self._card_at(position)
+            for position in range(self.top, self.bottom)
+        ]
+        free_start = self.free_top - self.top
+        free_stop = self.free_bottom - self.top
+        undrawn = remaining[free_start:free_stop]
+        self.rng.shuffle(undrawn)
+        remaining[free_start:free_stop] = undrawn
+        return deque(remaining)
+
 
 class DeckOfCards(object):
     """Base class for all collections of card objects
@@ -31,11 +193,18 @@ class DeckOfCards(object):
     iii. shuffle: reorder the list randomly
     iv. show_top: print the attributes of the first card as dict
     v. show_bottom: print the attributes of the last card as dict
+    vi. deal_many: deal k cards at once, same order as repeated deal_card
+    vii. add_many: add a sequence of cards, same as repeated add_card
 
     Intended attributes:
     i. card_list: list of cards
     ii. cards_left: list the length of the card list
 
+    card_list is read as a new list, so changing that list leaves the
+    deck alone; to change the cards directly, change the list and
+    assign it back to card_list, or use the methods above. cards_left
+    is read only and follows the cards held.
+
 
     Need to make a choice on 'top' versus 'bottom' convention:
         For the purposes here the 'top' of the deck will be card_list[0]
@@ -43,47 +212,138 @@ class DeckOfCards(object):
         default is 'top add' and 'top deal', in other words LIFO
         keyword option to specify other choice
 
-    TO-DO: is there a way to use the deque class to optimize performance?
+    The cards are held in a deque so that deals and adds at either end
+    of the deck are O(1); card_list builds a list copy when read
+
+    shuffle(lazy=True) only records that the deck is shuffled; each deal
+    or show at the top or bottom then draws just the card it needs, so
+    dealing k cards costs O(k) rather than O(n). Reading card_list or
+    adding a card completes the shuffle first. A lazy shuffle draws one
+    seed from rng when it starts and nothing from it afterwards, so
+    code that reads card_list, such as hashing or serializing the deck,
+    leaves the rng stream alone. Shuffling lazily again while a lazy
+    shuffle is pending costs O(1); only the first copies the cards.
+
+    ordered is True when card_list order is part of the deck's state;
+    count based decks such as Shoe set it to False
     """
+    ordered = True
+
     def __init__(self, card_list=[]):
-        self.card_list = []
+        self._cards = deque()
+        self._lazy = None
         if card_list:
             type_check = list_type_check(card_list, Card, error=True)
-            self.card_list.extend([card for card in card_list])
+            self._cards.extend(card_list)
 
-        # update the cards_left count
-        self.cards_left = len(self.card_list)
+    def _settle(self):
+        """complete a pending lazy shuffle
+        """
+        if self._lazy is not None:
+            self._cards = self._lazy.materialize()
+            self._lazy = None
+
+    @property
+    def card_list(self):
+        """new list of the cards in the deck, top of the deck first; O(n)
+
+        assign a list to card_list to replace the cards
+        """
+        self._settle()
+        return list(self._cards)
+
+    @card_list.setter
+    def card_list(self, card_list):
+        type_check = list_type_check(card_list, Card, error=True)
+        self._cards = deque(card_list)
+        self._lazy = None
+
+    @property
+    def cards_left(self):
+        """number of cards left in the deck
+        """
+        if self._lazy is not None:
+            return len(self._lazy)
+        return len(self._cards)
 
     def show_top(self):
         """print the attributes of the first card as dict
         """
-        return self.card_list[0].__dict__
+        if self._lazy is not None:
+            return self._lazy.peek_top().to_dict()
+        return self._cards[0].to_dict()
 
     def show_bottom(self):
         """print the attributes of the last card as dict
         """
-        return self.card_list[self.cards_left - 1].__dict__
+        if self._lazy is not None:
+            return self._lazy.peek_bottom().to_dict()
+        return self._cards[-1].to_dict()
 
-    def shuffle(self):
+    def shuffle(self, rng=None, lazy=False):
         """reorder the card_list randomly
+
+        rng is an optional random.Random instance to draw from in place
+        of the global random module, for reproducible simulations;
+        lazy=True defers the work to the cards actually dealt
         """
-        # print statement below for earlier debugging
-        # print 'shuffling the deck'
-        random.shuffle(self.card_list)
+        if rng is None:
+            rng = random
+        if lazy:
+            if self._lazy is not None:
+                # shuffle the cards left again without resolving them
+                self._lazy.restart(rng)
+            else:
+                self._lazy = _LazyShuffle(self._cards, rng)
+            return
+        self._settle()
+        # shuffling a deque in place indexes into the middle of it,
+        # so shuffle a list copy and swap it in
+        shuffled = list(self._cards)
+        rng.shuffle(shuffled)
+        self._cards = deque(shuffled)
 
     def deal_card(self, bottom_deal=False):
         """deal a card from the deck, default to 'top deal'
         """
-        if self.cards_left < 1:
+        if self._lazy is not None:
+            return self._deal_lazy(bottom_deal)
+        if not self._cards:
             return None
-        elif self.cards_left == 1 or bottom_deal:
-            dealt_card = self.card_list.pop()
-            self.cards_left = len(self.card_list)
-            return dealt_card
+        elif bottom_deal:
+            return self._cards.pop()
         else:
-            dealt_card = self.card_list.pop(0)
-            self.cards_left = len(self.card_list)
-            return dealt_card
+            return self._cards.popleft()
+
+    def _deal_lazy(self, bottom_deal):
+        """deal from a pending lazy shuffle
+        """
+        lazy = self._lazy
+        if not len(lazy):
+            return None
+        if bottom_deal:
+            dealt_card = lazy.deal_bottom()
+        else:
+            dealt_card = lazy.deal_top()
+        if not len(lazy):
+            self._cards = deque()
+            self._lazy = None
+        return dealt_card
+
+    def deal_many(self, num_cards, bottom_deal=False):
+        """deal up to num_cards cards from the deck as a list
+
+        cards are listed in the order repeated deal_card calls
+        would return them; fewer are returned when the deck runs out
+        """
+        num_cards = min(num_cards, self.cards_left)
+        if self._lazy is not None:
+            return [self._deal_lazy(bottom_deal) for i in range(num_cards)]
+        if bottom_deal:
+            pop_card = self._cards.pop
+        else:
+            pop_card = self._cards.popleft
+        return [pop_card() for i in range(num_cards)]
 
     def add_card(self, card_to_add, bottom_add=False):
         """add a card object to the deck, default to 'top add'
@@ -91,10 +351,25 @@ class DeckOfCards(object):
         if not isinstance(card_to_add, Card):
             raise TypeError("Can only add Card objects to Deck")
 
-        if self.cards_left < 1 or bottom_add:
-            self.card_list.append(card_to_add)
+        self._settle()
+        if bottom_add:
+            self._cards.append(card_to_add)
         else:
-            self.card_list.insert(0, card_to_add)
+            self._cards.appendleft(card_to_add)
+
+    def add_many(self, cards_to_add, bottom_add=False):
+        """add a sequence of card objects, same as repeated add_card calls
 
-        # update the cards_left count
-        self.cards_left = len(self.card_list)
+        with the default 'top add' the last card in the sequence
+        ends up on top of the deck
+        """
+        cards_to_add = list(cards_to_add)
+        type_check = list_type_check(cards_to_add, Card)
+        if not type_check:
+            raise TypeError("Can only add Card objects to Deck")
+
+        self._settle()
+        if bottom_add:
+            self._cards.extend(cards_to_add)
+        else:
+            self._cards.extendleft(cards_to_add)
@@ -0,0 +1,247 @@
+# module for a Codenames board, word tiles with agent cards covering the
+# ones that have been guessed
+# which words belong to each team, the assassin and the guessed words are
+# held as bit masks over the tiles, and the word embeddings as one matrix,
+# so every candidate clue is scored against every word in one matrix
+# product; only the filtering by mask depends on the guesses made
+# numpy is optional; without it the same scores come from plain loops
+
+from array import array
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from bitboard import bits_of
+from bitboard import popcount
+from board import Board
+from cards import Card
+from tiles import Tile
+from utils import LRUCache
+
+# agent card identities, the rank of the agent cards
+RED = 1
+BLUE = 2
+NEUTRAL = 3
+ASSASSIN = 4
+IDENTITIES = (RED, BLUE, NEUTRAL, ASSASSIN)
+
+
+class WordTile(Tile):
+    """Tile showing one word of a Codenames board
+    """
+    def __init__(self, word='', num_edges=4, rank=0, value=0):
+        super(WordTile, self).__init__(
+            num_edges=num_edges, rank=rank, value=value
+        )
+        self.word = word
+
+
+def _unit(vector):
+    """vector scaled to length one, so dot products are cosines
+    """
+    vector = [float(component) for component in vector]
+    length = math.sqrt(sum([component * component for component in vector]))
+    if length:
+        vector = [component / length for component in vector]
+    return vector
+
+
+class CodenamesBoard(object):
+    """Codenames board of word tiles with masks of who owns which word
+
+    Builds a Board whose spaces are a WordTile per word; guessing a
+    word covers it with an agent card, the token (index, Card) with the
+    identity as rank, added through Board.add_token. The masks, bit i
+    standing for space i, follow the tokens of the board, so undoing a
+    guess with a MoveJournal uncovers the word in the masks too.
+
+    i. team_masks, assassin_mask, neutral_mask: fixed at the start
+    ii. revealed: the words covered so far; unrevealed(identity) the
+        words of an identity still to be found
+    iii. score_clues: candidate clues ranked for a team, from the clue
+        to word similarities worked out once for the whole game; the
+        ranking for each team and set of covered words is cached
+
+    embeddings maps words to vectors; clues lists the candidate clue
+    words, by default every embedded word that is not on the board.
+    """
+    def __init__(self, words, identities, embeddings, clues=None,
+                 cache_size=64):
+        if len(words) != len(identities):
+            raise ValueError("Need one identity for each word")
+        unknown = set(identities).difference(IDENTITIES)
+        if unknown:
+            raise ValueError(
+                "Unknown identities {}".format(sorted(unknown))
+            )
+        self.words = list(words)
+        self.identities = list(identities)
+        self.board = Board(spaces=[WordTile(word=word) for word in words])
+        self.identity_masks = dict([(identity, 0)
+                                    for identity in IDENTITIES])
+        for index, identity in enumerate(identities):
+            self.identity_masks[identity] |= 1 << index
+        self.team_masks = {RED: self.identity_masks[RED],
+                           BLUE: self.identity_masks[BLUE]}
+        self.assassin_mask = self.identity_masks[ASSASSIN]
+        self.neutral_mask = self.identity_masks[NEUTRAL]
+        self.full = (1 << len(words)) - 1
+        self.revealed = 0
+        on_board = set(self.words)
+        if clues is None:
+            clues = sorted([word for word in embeddings
+                            if word not in on_board])
+        self.clues = [clue for clue in clues if clue not in on_board]
+        self.dimensions = len(embeddings[self.words[0]]) if words else 0
+        self.word_matrix = self._matrix(
+            [embeddings[word] for word in self.words]
+        )
+        self.clue_matrix = self._matrix(
+            [embeddings[clue] for clue in self.clues]
+        )
+        self._similarities = None
+        self._rankings = LRUCache(maxsize=cache_size)
+        self.board._attach(self)
+
+    def _matrix(self, vectors):
+        """unit vectors as rows of one contiguous matrix
+        """
+        rows = [_unit(vector) for vector in vectors]
+        if np is not None:
+            return np.array(rows, dtype=np.float64).reshape(
+                len(rows), self.dimensions
+            )
+        flat = array('d')
+        for row in rows:
+            flat.extend(row)
+        return flat
+
+    @property
+    def similarities(self):
+        """clue by word matrix of cosine similarities, worked out once
+        """
+        if self._similarities is None:
+            if np is not None:
+                self._similarities = self.clue_matrix.dot(
+                    self.word_matrix.T
+                )
+            else:
+                self._similarities = self._loop_similarities()
+        return self._similarities
+
+    def _loop_similarities(self):
+        dimensions = self.dimensions
+        words = [self.word_matrix[start:start + dimensions]
+                 for start in range(0, len(self.word_matrix), dimensions)]
+        rows = []
+        for start in range(0, len(self.clue_matrix), dimensions):
+            clue = self.clue_matrix[start:start + dimensions]
+            rows.append(array('d', [
+                sum([a * b for a, b in zip(clue, word)]) for word in words
+            ]))
+        return rows
+
+    def _agent_index(self, token):
+        """index of the word an agent card token covers, None for any
+        other token
+        """
+        if not (isinstance(token, tuple) and len(token) == 2):
+            return None
+        index, card = token
+        if (isinstance(index, int) and 0 <= index < len(self.words) and
+                isinstance(card, Card) and
+                getattr(card, 'rank', None) in IDENTITIES):
+            return index
+        return None
+
+    def board_changed(self, board, event):
+        """cover or uncover a word as agent card tokens come and go;
+        other tokens are left alone
+        """
+        if event[0] not in ('token_add', 'token_remove'):
+            return
+        index = self._agent_index(event[2])
+        if index is None:
+            return
+        if event[0] == 'token_add':
+            self.revealed |= 1 << index
+        else:
+            self.revealed &= ~(1 << index)
+
+    def reveal(self, index):
+        """cover word number index with its agent card, return the
+        identity of the word
+        """
+        if self.revealed >> index & 1:
+            raise ValueError("Word {} is already revealed".format(index))
+        identity = self.identities[index]
+        self.board.add_token((index, Card(rank=identity)))
+        return identity
+
+    def unrevealed(self, identity=None):
+        """mask of the words not yet covered, of one identity or all
+        """
+        if identity is None:
+            return self.full & ~self.revealed
+        return self.identity_masks[identity] & ~self.revealed
+
+    def remaining(self, identity):
+        return popcount(self.unrevealed(identity))
+
+    def score_clues(self, team, limit=10, margin=0.0):
+        """best clues for team as (clue, targets) pairs, best first
+
+        targets are the uncovered words of the team closer to the clue,
+        by more than margin, than every other uncovered word; clues are
+        ranked by the number of targets, then by the total lead of the
+        targets over the closest other word
+        """
+        cache_key = (team, self.revealed, margin)
+        ranking = self._rankings.get(cache_key)
+        if ranking is None:
+            ranking = self._rank(team, margin)
+            self._rankings.put(cache_key, ranking)
+        return ranking[:limit]
+
+    def _rank(self, team, margin):
+        own = bits_of(self.unrevealed(team))
+        others = bits_of(self.unrevealed() & ~self.team_masks[team])
+        if not own or not self.clues:
+            return []
+        similarities = self.similarities
+        scored = []
+        if np is not None:
+            own_scores = similarities[:, own]
+            if others:
+                danger = similarities[:, others].max(axis=1)
+            else:
+                danger = np.full(len(self.clues), -np.inf)
+            leads = own_scores - (danger + margin)[:, np.newaxis]
+            hits = leads > 0
+            counts = hits.sum(axis=1)
+            totals = np.where(hits, leads, 0.0).sum(axis=1)
+            for clue in np.flatnonzero(counts):
+                targets = [own[column] for column
+                           in np.argsort(-own_scores[clue])
+                           if hits[clue, column]]
+                scored.append((-int(counts[clue]), -float(totals[clue]),
+                               self.clues[clue], targets))
+        else:
+            for clue, row in enumerate(similarities):
+                if others:
+                    threshold = max([row[index] for index in others])
+                else:
+                    threshold = float('-inf')
+                threshold += margin
+                targets = [index for index in own if row[index] > threshold]
+                if not targets:
+                    continue
+                targets.sort(key=lambda index: -row[index])
+                total = sum([row[index] - threshold for index in targets])
+                scored.append((-len(targets), -total, self.clues[clue],
+                               targets))
+        scored.sort()
+        return [(clue, targets) for count, total, clue, targets in scored]
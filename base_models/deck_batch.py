@@ -0,0 +1,146 @@
+# module for DeckBatch, many equal sized decks held together as a matrix
+# of packed card codes so that every deck can be shuffled and dealt from
+# in one pass; numpy is optional, without it each row is an array('H')
+# and shuffled with the rng in turn
+
+from array import array
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from cards import Card
+from cards import DeckOfCards
+from packed_deck import CODE_TYPECODE
+from packed_deck import PackedDeck
+from packed_deck import decode_card
+from packed_deck import encode_card
+
+
+class DeckBatch(object):
+    """Holds num_decks decks of deck_size cards as a 2-D matrix of codes
+
+    Row i is deck i listed top first, in the packed_deck encoding. All
+    decks are dealt in step: position counts the cards already dealt
+    from the top of every deck, so the cards left are the columns from
+    position onwards.
+
+    Description of methods:
+    i. from_decks: class method building a batch from DeckOfCards objects
+    ii. from_deck: class method repeating one deck num_decks times
+    iii. shuffle: reorder the cards left in every deck at once
+    iv. deal: deal the next num_cards columns as a matrix
+    v. reset: gather the dealt cards back so every deck is full again
+    vi. to_decks: list of DeckOfCards with the cards left in each deck
+
+    Attributes:
+    i. rows: numpy uint16 matrix, or list of array('H') rows without numpy
+    ii. num_decks, deck_size, position, cards_left
+    """
+    def __init__(self, rows):
+        rows = [list(row) for row in rows]
+        if not rows:
+            raise ValueError("Expect at least one deck in a DeckBatch")
+        self.deck_size = len(rows[0])
+        if any([len(row) != self.deck_size for row in rows]):
+            raise ValueError("Expect every deck in a DeckBatch to match size")
+        self.num_decks = len(rows)
+        if np is not None:
+            self.rows = np.array(rows, dtype=np.uint16).reshape(
+                (self.num_decks, self.deck_size)
+            )
+        else:
+            self.rows = [array(CODE_TYPECODE, row) for row in rows]
+        self.position = 0
+
+    @classmethod
+    def from_decks(cls, decks):
+        """Build a DeckBatch from a list of equal sized DeckOfCards
+        """
+        rows = []
+        for deck in decks:
+            if isinstance(deck, PackedDeck):
+                rows.append(deck.to_codes())
+            elif isinstance(deck, DeckOfCards):
+                rows.append([encode_card(card) for card in deck.card_list])
+            else:
+                raise TypeError("Expect list to only contain DeckOfCards")
+        return cls(rows)
+
+    @classmethod
+    def from_deck(cls, deck, num_decks):
+        """Build a DeckBatch holding num_decks copies of one deck
+        """
+        return cls.from_decks([deck] * num_decks)
+
+    @property
+    def cards_left(self):
+        """number of cards left in each deck
+        """
+        return self.deck_size - self.position
+
+    def shuffle(self, rng=None):
+        """reorder the cards left in every deck independently
+
+        with numpy every row is permuted by the argsort of one random
+        matrix; rng is an optional random.Random seeding the draw
+        """
+        position = self.position
+        if np is not None:
+            if rng is None:
+                keys = np.random.random_sample(
+                    (self.num_decks, self.cards_left)
+                )
+            else:
+                state = np.random.RandomState(rng.getrandbits(32))
+                keys = state.random_sample((self.num_decks, self.cards_left))
+            order = np.argsort(keys, axis=1)
+            remaining = self.rows[:, position:]
+            self.rows[:, position:] = np.take_along_axis(
+                remaining, order, axis=1
+            )
+            return
+        if rng is None:
+            rng = random
+        for row in self.rows:
+            remaining = row[position:]
+            rng.shuffle(remaining)
+            row[position:] = remaining
+
+    def deal(self, num_cards=1):
+        """deal the next num_cards cards from the top of every deck
+
+        Returns:
+            matrix of codes with one row per deck, a numpy array or a
+            list of array('H'); fewer columns when the decks run out
+        """
+        start = self.position
+        stop = min(start + num_cards, self.deck_size)
+        self.position = stop
+        if np is not None:
+            return self.rows[:, start:stop].copy()
+        return [row[start:stop] for row in self.rows]
+
+    def reset(self):
+        """gather the dealt cards back so every deck is full again
+        """
+        self.position = 0
+
+    def to_decks(self, packed=False, card_class=Card):
+        """list with a deck of the cards left in each row, top first
+
+        packed=True returns PackedDeck objects, otherwise DeckOfCards
+        of card_class cards
+        """
+        decks = []
+        for row in self.rows:
+            codes = [int(code) for code in row[self.position:]]
+            if packed:
+                decks.append(PackedDeck.from_codes(codes, card_class))
+            else:
+                decks.append(DeckOfCards(
+                    [decode_card(code, card_class) for code in codes]
+                ))
+        return decks
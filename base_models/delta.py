@@ -0,0 +1,257 @@
+# module for deltas between two Board states, for sending a changed board
+# to many clients without resending all of it
+# both states are BoardSnapshot objects, whose persistent vectors share
+# every node that did not change, so diff skips shared nodes by identity
+# and costs about as much as the changes rather than the board size
+
+from board import Board
+from persistent_vector import BITS
+from snapshot import DeckSnapshot
+
+VECTOR_FIELDS = ('spaces', 'tiles', 'tokens')
+
+
+class Viewer(object):
+    """Which decks one client may see the cards of
+
+    hidden_decks lists decks whose cards nobody sees, such as draw
+    piles; hands maps a deck index to the player holding it, seen only
+    by that player. For decks the viewer cannot see a delta carries
+    just the number of cards left.
+    """
+    def __init__(self, player=None, hidden_decks=(), hands=None):
+        self.player = player
+        self.hidden_decks = frozenset(hidden_decks)
+        self.hands = dict(hands or {})
+
+    def can_see(self, deck_index):
+        if deck_index in self.hidden_decks:
+            return False
+        owner = self.hands.get(deck_index, self.player)
+        return owner == self.player
+
+
+def _as_snapshot(state):
+    if isinstance(state, Board):
+        return state.snapshot()
+    return state
+
+
+def _items_differ(old_item, new_item):
+    return old_item is not new_item and old_item != new_item
+
+
+def _walk(old_node, new_node, level, base, stop, changes):
+    """positions below stop where two trees of equal height differ
+    """
+    if old_node is new_node or base >= stop:
+        return
+    if not level:
+        for offset in range(min(len(old_node), len(new_node),
+                                stop - base)):
+            if _items_differ(old_node[offset], new_node[offset]):
+                changes.append(base + offset)
+        return
+    for child in range(min(len(old_node), len(new_node))):
+        _walk(old_node[child], new_node[child], level - BITS,
+              base + (child << level), stop, changes)
+
+
+def changed_positions(old, new):
+    """positions where two PersistentVectors differ, over their common
+    length, skipping the nodes they share
+    """
+    if old is new:
+        return []
+    common = min(len(old), len(new))
+    changes = []
+    start = 0
+    if old._shift == new._shift:
+        start = min(old._tail_offset(), new._tail_offset(), common)
+        _walk(old._root, new._root, old._shift, 0, start, changes)
+    for position in range(start, common):
+        if _items_differ(old[position], new[position]):
+            changes.append(position)
+    return changes
+
+
+def _vector_delta(old, new):
+    """dict of the new length and the (position, item) pairs that changed
+    """
+    if old is new:
+        return None
+    changes = changed_positions(old, new)
+    changes.extend(range(min(len(old), len(new)), len(new)))
+    if not changes and len(old) == len(new):
+        return None
+    return {
+        'length': len(new),
+        'set': [(position, new[position]) for position in changes]
+    }
+
+
+def _apply_vector(vector, delta):
+    while len(vector) > delta['length']:
+        vector = vector.pop()
+    for position, item in delta['set']:
+        if position < len(vector):
+            vector = vector.set(position, item)
+        else:
+            vector = vector.append(item)
+    return vector
+
+
+def _deck_delta(old, new, visible):
+    """delta turning DeckSnapshot old into new, None if they match
+
+    cards taken from or put on either end of the deck are sent as
+    such; anything else, or anything bigger than the whole deck, sends
+    the whole deck top first
+    """
+    if old is new:
+        return None
+    if not visible:
+        if old.cards_left == new.cards_left:
+            return None
+        return {'cards_left': new.cards_left}
+    old_cards, new_cards = old._cards, new._cards
+    old_start, new_start = old._start, new._start
+    live_start = max(old_start, new_start)
+    first = min(len(old_cards), len(new_cards))
+    for position in changed_positions(old_cards, new_cards):
+        if position >= live_start:
+            first = position
+            break
+    # a change below the cards both decks still hold, such as new being
+    # rebuilt by a shuffle after old was dealt from the bottom, leaves
+    # nothing to share: new may not even reach the positions old_start
+    # - 1 down to new_start that bottom_added would be read from
+    if first < live_start or old.ordered != new.ordered:
+        return {'cards': new.card_list, 'ordered': new.ordered}
+    delta = {
+        'top_removed': len(old_cards) - first,
+        'top_added': [new_cards[position] for position
+                      in range(len(new_cards) - 1, first - 1, -1)],
+        'bottom_removed': max(new_start - old_start, 0),
+        'bottom_added': [new_cards[position] for position
+                         in range(old_start - 1, new_start - 1, -1)],
+    }
+    num_added = len(delta['top_added']) + len(delta['bottom_added'])
+    if num_added and num_added >= new.cards_left:
+        return {'cards': new.card_list, 'ordered': new.ordered}
+    if not (delta['top_removed'] or delta['top_added'] or
+            delta['bottom_removed'] or delta['bottom_added']):
+        return None
+    return delta
+
+
+def _apply_deck(deck, delta):
+    if 'cards' in delta:
+        return DeckSnapshot(delta['cards'], ordered=delta['ordered'])
+    if 'cards_left' in delta:
+        difference = delta['cards_left'] - deck.cards_left
+        for card in range(difference):
+            deck = deck.add_card(None)
+        for card in range(-difference):
+            deck = deck.deal_card()[1]
+        return deck
+    for card in range(delta['top_removed']):
+        deck = deck.deal_card()[1]
+    for card in range(delta['bottom_removed']):
+        deck = deck.deal_card(bottom_deal=True)[1]
+    for card in reversed(delta['top_added']):
+        deck = deck.add_card(card)
+    for card in delta['bottom_added']:
+        deck = deck.add_card(card, bottom_add=True)
+    return deck
+
+
+def diff(old, new, viewer=None):
+    """delta from the old to the new state of a board, as a dict
+
+    old and new are BoardSnapshot objects or Boards, whose snapshot is
+    used; with a Viewer the decks it cannot see only send the number
+    of cards left. Keys are only present for parts that changed:
+    i. spaces, tiles, tokens: new length and changed (position, item)
+    ii. decks: deck index to cards dealt and added at each end, the
+        whole deck or, for unseen decks, the number of cards left
+    iii. dice: (index, dice state) for the rollers that changed
+    iv. score: the new score
+    """
+    old = _as_snapshot(old)
+    new = _as_snapshot(new)
+    delta = {}
+    if old is new:
+        return delta
+    for field in VECTOR_FIELDS:
+        vector_delta = _vector_delta(getattr(old, field), getattr(new, field))
+        if vector_delta is not None:
+            delta[field] = vector_delta
+    if old.decks is not new.decks:
+        deck_deltas = {}
+        for index, new_deck in enumerate(new.decks):
+            visible = viewer is None or viewer.can_see(index)
+            if index < len(old.decks):
+                deck_delta = _deck_delta(old.decks[index], new_deck, visible)
+            else:
+                deck_delta = _deck_delta(DeckSnapshot(), new_deck, visible)
+            if deck_delta is not None:
+                deck_deltas[index] = deck_delta
+        if deck_deltas:
+            delta['decks'] = deck_deltas
+        if len(old.decks) != len(new.decks):
+            delta['num_decks'] = len(new.decks)
+    if old.dice != new.dice:
+        delta['dice'] = [
+            (index, dice_state) for index, dice_state in enumerate(new.dice)
+            if index >= len(old.dice) or old.dice[index] != dice_state
+        ]
+        if len(old.dice) != len(new.dice):
+            delta['num_dice'] = len(new.dice)
+    if _items_differ(old.score, new.score):
+        delta['score'] = new.score
+    return delta
+
+
+def apply_delta(snapshot, delta):
+    """new BoardSnapshot made by applying a delta from diff to snapshot
+    """
+    snapshot = _as_snapshot(snapshot)
+    changes = {}
+    for field in VECTOR_FIELDS:
+        if field in delta:
+            changes[field] = _apply_vector(getattr(snapshot, field),
+                                           delta[field])
+    if 'decks' in delta or 'num_decks' in delta:
+        decks = list(snapshot.decks)
+        num_decks = delta.get('num_decks', len(decks))
+        decks = decks[:num_decks]
+        decks.extend([DeckSnapshot()] * (num_decks - len(decks)))
+        for index, deck_delta in delta.get('decks', {}).items():
+            decks[index] = _apply_deck(decks[index], deck_delta)
+        changes['decks'] = tuple(decks)
+    if 'dice' in delta:
+        dice = list(snapshot.dice)[:delta.get('num_dice', len(snapshot.dice))]
+        for index, dice_state in delta['dice']:
+            if index < len(dice):
+                dice[index] = dice_state
+            else:
+                dice.append(dice_state)
+        changes['dice'] = tuple(dice)
+    if 'score' in delta:
+        changes['score'] = delta['score']
+    return snapshot.replace(**changes)
+
+
+def view_of(snapshot, viewer):
+    """snapshot as viewer sees it, with None for each card it cannot see
+
+    deltas from diff with viewer apply to this view
+    """
+    snapshot = _as_snapshot(snapshot)
+    decks = tuple([
+        deck if viewer.can_see(index) else
+        DeckSnapshot([None] * deck.cards_left, ordered=deck.ordered)
+        for index, deck in enumerate(snapshot.decks)
+    ])
+    return snapshot.replace(decks=decks)
@@ -1,7 +1,42 @@
 # module to contain class that models a single die of variable sides
 # and a class that use multiple dice to model random rolls
+# numpy is optional; when it is missing batch rolls fall back to the
+# standard library array module
 
-from random import randint
+from array import array
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from distributions import roll_distribution
+from utils import array_typecode
+
+
+def _draw_faces(num_sides, shape, rng=None):
+    """draw a batch of face values between one and num_sides
+
+    with numpy the batch comes from a single vectorized draw in the
+    requested shape, otherwise a flat array of the matching length;
+    a random.Random rng seeds the numpy draw so batches stay reproducible
+    """
+    if np is not None:
+        if rng is None:
+            return np.random.randint(1, num_sides + 1, size=shape)
+        state = np.random.RandomState(rng.getrandbits(32))
+        return state.randint(1, num_sides + 1, size=shape)
+    if rng is None:
+        rng = random
+    rand = rng.random
+    count = 1
+    for length in shape:
+        count *= length
+    return array(
+        array_typecode(num_sides),
+        [int(rand() * num_sides) + 1 for i in range(count)]
+    )
 
 
 class SingleDie(object):
@@ -15,18 +50,41 @@ class SingleDie(object):
         self.face_value = 0
         self.roll()
 
-    def roll(self):
+    def roll(self, rng=None):
         """Rolls the SingleDie
 
         Args:
             self: the class instance object SingleDie
+            rng: optional random.Random instance used in place of the
+                global random module
 
         Returns:
             face_value: a random integer between one and num_sides
         """
-        self.face_value = randint(1, self.num_sides)
+        if rng is None:
+            rng = random
+        self.face_value = rng.randint(1, self.num_sides)
         return self.face_value
 
+    def roll_many(self, num_rolls, rng=None):
+        """Rolls the SingleDie num_rolls times in one batch
+
+        Args:
+            self: the class instance object SingleDie
+            num_rolls: the number of rolls to make
+            rng: optional random.Random instance used in place of the
+                global random module
+
+        Returns:
+            faces: numpy array (or array module array) of num_rolls
+                random integers between one and num_sides; face_value
+                is left at the last roll
+        """
+        faces = _draw_faces(self.num_sides, (num_rolls,), rng=rng)
+        if num_rolls:
+            self.face_value = int(faces[-1])
+        return faces
+
 
 class DiceRoller(object):
     """Models a container for multiple dice
@@ -42,15 +100,73 @@ class DiceRoller(object):
         self.roll_value = 0
         self.roll()
 
-    def roll(self):
+    def roll(self, rng=None):
         """Rolls the DiceRoller
 
         Args:
             self: the class instance object SingleDie
+            rng: optional random.Random instance used in place of the
+                global random module
 
         Returns:
             face_value: a random integer between num_dice
                 and num_dice * num_sides
         """
-        self.roll_value = sum([die.roll() for die in self.dice])
+        self.roll_value = sum([die.roll(rng) for die in self.dice])
+        return self.roll_value
+
+    @property
+    def distribution(self):
+        """exact RollDistribution of the roll sum for these dice
+        """
+        return roll_distribution(self.num_sides, self.num_dice)
+
+    def sample_sum(self, rng=None):
+        """Draws a roll sum in O(1) from the exact sum distribution
+
+        Args:
+            self: the class instance object DiceRoller
+            rng: optional random.Random instance used in place of the
+                global random module
+
+        Returns:
+            roll_value: a random integer between num_dice and
+                num_dice * num_sides, distributed as for roll; the
+                individual dice are not rolled and keep their faces
+        """
+        self.roll_value = self.distribution.sample(rng=rng)
         return self.roll_value
+
+    def roll_many(self, num_rolls, rng=None):
+        """Rolls the DiceRoller num_rolls times in one batch
+
+        Args:
+            self: the class instance object DiceRoller
+            num_rolls: the number of rolls to make
+            rng: optional random.Random instance used in place of the
+                global random module
+
+        Returns:
+            (faces, sums): with numpy, faces has shape
+                (num_rolls, num_dice) and sums has shape (num_rolls,);
+                without numpy, faces is a flat array module array laid
+                out roll by roll and sums an array of num_rolls values.
+                The dice and roll_value are left at the last roll
+        """
+        num_dice = self.num_dice
+        faces = _draw_faces(self.num_sides, (num_rolls, num_dice), rng=rng)
+        if np is not None:
+            sums = faces.sum(axis=1)
+            last_faces = faces[-1] if num_rolls else []
+        else:
+            sums = array(
+                array_typecode(self.num_sides * num_dice),
+                [sum(faces[i:i + num_dice])
+                 for i in range(0, num_rolls * num_dice, num_dice)]
+            )
+            last_faces = faces[len(faces) - num_dice:] if num_rolls else []
+        if num_rolls:
+            for die, face_value in zip(self.dice, last_faces):
+                die.face_value = int(face_value)
+            self.roll_value = int(sums[-1])
+        return faces, sums
@@ -0,0 +1,203 @@
+# module for exact distributions of the sum of a pool of dice
+# the pmf of a pool is built by repeated convolution of single die
+# outcome counts; results are kept in a bounded least recently used cache
+# and an alias table gives O(1) sampling of sums
+
+from fractions import Fraction
+import random
+
+from utils import LRUCache
+
+
+_distribution_cache = LRUCache(maxsize=256)
+
+
+class AliasSampler(object):
+    """Draws from a fixed discrete distribution in O(1) per sample
+
+    Built with Vose's alias method from a list of outcomes and their
+    (non-negative) weights; each draw costs one uniform random number
+    """
+    def __init__(self, outcomes, weights):
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("Expect matching, non-empty outcomes and weights")
+        total_weight = float(sum(weights))
+        if total_weight <= 0:
+            raise ValueError("Expect a positive total weight")
+        num_outcomes = len(outcomes)
+        scaled = [weight * num_outcomes / total_weight for weight in weights]
+        small = [i for i, scale in enumerate(scaled) if scale < 1.0]
+        large = [i for i, scale in enumerate(scaled) if scale >= 1.0]
+        self.outcomes = list(outcomes)
+        self.probabilities = [1.0] * num_outcomes
+        self.aliases = list(range(num_outcomes))
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # anything left over is within rounding of a full column
+
+    def sample(self, rng=None):
+        """draw one outcome
+
+        the integer part of the scaled uniform picks the column, the
+        fractional part decides between the column and its alias
+        """
+        if rng is None:
+            rng = random
+        draw = rng.random() * len(self.outcomes)
+        column = int(draw)
+        if draw - column < self.probabilities[column]:
+            return self.outcomes[column]
+        return self.outcomes[self.aliases[column]]
+
+    def sample_many(self, num_samples, rng=None):
+        """draw num_samples outcomes as a list
+        """
+        if rng is None:
+            rng = random
+        rand = rng.random
+        outcomes = self.outcomes
+        probabilities = self.probabilities
+        aliases = self.aliases
+        num_outcomes = len(outcomes)
+        samples = []
+        for i in range(num_samples):
+            draw = rand() * num_outcomes
+            column = int(draw)
+            if draw - column < probabilities[column]:
+                samples.append(outcomes[column])
+            else:
+                samples.append(outcomes[aliases[column]])
+        return samples
+
+
+class RollDistribution(object):
+    """Exact distribution of the sum of a pool of dice
+
+    Attributes:
+        sides: sorted tuple with the number of sides of each die
+        min_sum, max_sum: the smallest and largest possible sums
+        counts: tuple, counts[i] is the number of ways to roll min_sum + i
+        total_outcomes: the number of equally likely face combinations
+
+    Probabilities are returned as exact Fractions
+    """
+    def __init__(self, sides, counts):
+        self.sides = tuple(sides)
+        self.min_sum = len(self.sides)
+        self.max_sum = sum(self.sides)
+        self.counts = tuple(counts)
+        self.total_outcomes = sum(self.counts)
+        cumulative = []
+        running_total = 0
+        for count in self.counts:
+            running_total += count
+            cumulative.append(running_total)
+        self._cumulative = tuple(cumulative)
+        self._sampler = None
+
+    def count(self, value):
+        """number of face combinations that sum to value
+        """
+        if self.min_sum <= value <= self.max_sum:
+            return self.counts[value - self.min_sum]
+        return 0
+
+    def probability(self, value):
+        """exact probability of rolling a sum of value
+        """
+        return Fraction(self.count(value), self.total_outcomes)
+
+    def cdf(self, value):
+        """exact probability of rolling a sum of value or less
+        """
+        if value < self.min_sum:
+            return Fraction(0)
+        if value >= self.max_sum:
+            return Fraction(1)
+        cumulative = self._cumulative[value - self.min_sum]
+        return Fraction(cumulative, self.total_outcomes)
+
+    def pmf(self):
+        """dict of every possible sum to its exact probability
+        """
+        return dict(
+            (self.min_sum + i, Fraction(count, self.total_outcomes))
+            for i, count in enumerate(self.counts)
+        )
+
+    def mean(self):
+        """exact expected value of the sum
+        """
+        return Fraction(sum(self.sides) + len(self.sides), 2)
+
+    def sampler(self):
+        """alias sampler over the possible sums, built once on first use
+        """
+        if self._sampler is None:
+            self._sampler = AliasSampler(
+                list(range(self.min_sum, self.max_sum + 1)), self.counts
+            )
+        return self._sampler
+
+    def sample(self, rng=None):
+        """draw one sum in O(1) without rolling the individual dice
+        """
+        return self.sampler().sample(rng=rng)
+
+
+def _convolve_die(counts, num_sides):
+    """convolve outcome counts with one die of num_sides sides
+
+    a running window sum over the last num_sides counts keeps this
+    linear in the length of the result
+    """
+    result = []
+    window = 0
+    for i in range(len(counts) + num_sides - 1):
+        if i < len(counts):
+            window += counts[i]
+        if i >= num_sides:
+            window -= counts[i - num_sides]
+        result.append(window)
+    return result
+
+
+def pool_distribution(sides):
+    """exact RollDistribution for a mixed pool of dice
+
+    Args:
+        sides: iterable with the number of sides of each die in the pool
+
+    Returns:
+        RollDistribution, shared through the module cache with any other
+            request for the same pool in any order
+    """
+    pool = tuple(sorted(sides))
+    if not pool:
+        raise ValueError("Expect a pool with at least one die")
+    if pool[0] < 1:
+        raise ValueError("Expect every die to have at least one side")
+    distribution = _distribution_cache.get(pool)
+    if distribution is None:
+        counts = [1]
+        for num_sides in pool:
+            # sums start at the number of dice, so each die shifts the
+            # window by one and only the counts themselves are convolved
+            counts = _convolve_die(counts, num_sides)
+        distribution = RollDistribution(pool, counts)
+        _distribution_cache.put(pool, distribution)
+    return distribution
+
+
+def roll_distribution(num_sides=6, num_dice=2):
+    """exact RollDistribution for num_dice dice of num_sides sides each
+    """
+    return pool_distribution((num_sides,) * num_dice)
@@ -0,0 +1,370 @@
+# module for hold'em equity of player hole cards against a partial board
+# every remaining run-out of the community cards is counted exactly when
+# there are few enough of them, otherwise run-outs are sampled through the
+# seeded MonteCarloRunner
+# the exact count scores run-outs without flushes once per face multiset,
+# weighted by the number of run-outs with those faces, then corrects the
+# run-outs with three or more board cards of one suit; those are indexed
+# with the combinatorial number system so that any contiguous range of
+# them can be handed to a worker process and started without walking the
+# ones before it
+
+import math
+import multiprocessing
+
+import poker
+from poker import FACE_BIT
+from poker import FLUSH_CHECK_ADD
+from poker import FLUSH_CHECK_MASK
+from poker import NUM_SUITS
+from poker import RANK_KEY
+from poker import SUIT_COUNT
+from poker import SUIT_INDEX
+from poker import card_codes
+from poker import evaluate_codes
+from registry import standard_deck
+from simulation import MonteCarloRunner
+
+
+BOARD_SIZE = 5
+TASKS_PER_WORKER = 4
+CONFIDENCE_Z = 1.96
+
+
+def _choose(n, k):
+    """binomial coefficient, zero when k is out of range
+    """
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    result = 1
+    for i in range(1, k + 1):
+        result = result * (n - k + i) // i
+    return result
+
+
+def _unrank_combination(rank, num_chosen):
+    """combination of the given colex rank as an increasing index list
+
+    colex rank of c[0] < c[1] < ... is the sum of choose(c[i], i + 1)
+    """
+    combination = [0] * num_chosen
+    for size in range(num_chosen, 0, -1):
+        index = size - 1
+        while _choose(index + 1, size) <= rank:
+            index += 1
+        combination[size - 1] = index
+        rank -= _choose(index, size)
+    return combination
+
+
+def _share_unit(num_players):
+    """least common multiple of 1 to num_players, so that a pot split
+    between any number of winners is a whole number of units
+    """
+    unit = 1
+    for i in range(2, num_players + 1):
+        a, b = unit, i
+        while b:
+            a, b = b, a % b
+        unit = unit * i // a
+    return unit
+
+
+def _showdown(hole_codes, hole_keys, hole_suits, key, suits, board_codes,
+              unit):
+    """share units won by each player for one complete board
+    """
+    rank_table = poker._rank_table
+    best_value = -1
+    winners = []
+    for player in range(len(hole_codes)):
+        player_suits = suits + hole_suits[player]
+        if (player_suits + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK:
+            value = evaluate_codes(hole_codes[player] + board_codes)
+        else:
+            value = rank_table[key + hole_keys[player]]
+        if value > best_value:
+            best_value = value
+            winners = [player]
+        elif value == best_value:
+            winners.append(player)
+    shares = [0] * len(hole_codes)
+    for player in winners:
+        shares[player] = unit // len(winners)
+    return shares
+
+
+def _hand_parts(codes):
+    """face multiset key and suit counter summed over codes
+    """
+    return (sum([RANK_KEY[code] for code in codes]),
+            sum([SUIT_COUNT[code] for code in codes]))
+
+
+def _face_groups(face_counts, num_cards, start=0):
+    """generate (face key, number of card sets) for every multiset of
+    num_cards faces that can be drawn from face_counts, a list of
+    (face key, cards of that face) pairs
+    """
+    if not num_cards:
+        yield 0, 1
+        return
+    for index in range(start, len(face_counts)):
+        face_key, count = face_counts[index]
+        for taken in range(1, min(count, num_cards) + 1):
+            ways = _choose(count, taken)
+            for key, weight in _face_groups(face_counts, num_cards - taken,
+                                            index + 1):
+                yield key + taken * face_key, weight * ways
+
+
+def _face_counts(codes):
+    """list of (face key, number of cards) over the faces in codes
+    """
+    counts = {}
+    for code in codes:
+        counts[RANK_KEY[code]] = counts.get(RANK_KEY[code], 0) + 1
+    return sorted(counts.items())
+
+
+def _shares(values, unit):
+    best_value = max(values)
+    share = unit // values.count(best_value)
+    return [share if value == best_value else 0 for value in values]
+
+
+def _count_runouts(task):
+    """share units per player, weighted by the number of run-outs, over
+    one piece of the exact count
+
+    With suit None the piece is every run-out scored without flushes,
+    grouped by face multiset. Otherwise it is the correction for the
+    run-outs whose suit cards are the colex ranks start to stop - 1 of
+    the unseen cards of that suit, size of them; module level so that
+    it can be sent to worker processes
+    """
+    hole_codes, board_codes, unseen, suit, size, start, stop = task
+    if poker._rank_table is None:
+        poker._build_tables()
+    rank_table = poker._rank_table
+    num_missing = BOARD_SIZE - len(board_codes)
+    unit = _share_unit(len(hole_codes))
+    hole_keys = [_hand_parts(codes)[0] for codes in hole_codes]
+    board_key = _hand_parts(board_codes)[0]
+    totals = [0] * len(hole_codes)
+    if suit is None:
+        for key, weight in _face_groups(_face_counts(unseen), num_missing):
+            key += board_key
+            shares = _shares([rank_table[key + hole_key]
+                              for hole_key in hole_keys], unit)
+            for player, share in enumerate(shares):
+                totals[player] += weight * share
+        return totals
+
+    def suit_parts(codes):
+        mask = 0
+        for code in codes:
+            if SUIT_INDEX[code] == suit:
+                mask |= FACE_BIT[code]
+        return mask, bin(mask).count('1')
+
+    suit_cards = [code for code in unseen if SUIT_INDEX[code] == suit]
+    groups = list(_face_groups(
+        _face_counts([code for code in unseen if SUIT_INDEX[code] != suit]),
+        num_missing - size
+    ))
+    board_mask, board_count = suit_parts(board_codes)
+    hole_parts = [suit_parts(codes) for codes in hole_codes]
+    flush_table = poker._flush_table
+    for rank in range(start, stop):
+        combination = _unrank_combination(rank, size)
+        suit_key = board_key
+        mask = board_mask
+        for index in combination:
+            suit_key += RANK_KEY[suit_cards[index]]
+            mask |= FACE_BIT[suit_cards[index]]
+        flush_values = [
+            flush_table[mask | hole_mask]
+            if hole_count + board_count + size >= 5 else -1
+            for hole_mask, hole_count in hole_parts
+        ]
+        for key, weight in groups:
+            key += suit_key
+            values = [rank_table[key + hole_key] for hole_key in hole_keys]
+            flushed = [max(pair) for pair in zip(values, flush_values)]
+            if flushed == values:
+                continue
+            old_shares = _shares(values, unit)
+            new_shares = _shares(flushed, unit)
+            for player in range(len(totals)):
+                totals[player] += weight * (new_shares[player] -
+                                            old_shares[player])
+    return totals
+
+
+class _SampledRunout(object):
+    """trial for MonteCarloRunner: share units and their squares for
+    one random run-out; a class so that it pickles for worker processes
+    """
+    def __init__(self, hole_codes, board_codes, unseen):
+        self.hole_codes = hole_codes
+        self.board_codes = board_codes
+        self.unseen = unseen
+
+    def __call__(self, rng):
+        if poker._rank_table is None:
+            poker._build_tables()
+        hole_codes = self.hole_codes
+        runout = rng.sample(self.unseen, BOARD_SIZE - len(self.board_codes))
+        full_board = self.board_codes + runout
+        key, suits = _hand_parts(full_board)
+        hole_parts = [_hand_parts(codes) for codes in hole_codes]
+        shares = _showdown(
+            hole_codes, [parts[0] for parts in hole_parts],
+            [parts[1] for parts in hole_parts], key, suits, full_board,
+            _share_unit(len(hole_codes))
+        )
+        return tuple(shares + [share * share for share in shares])
+
+
+def _add_vectors(total, vector):
+    return tuple([a + b for a, b in zip(total, vector)])
+
+
+class EquityResult(object):
+    """Equity of each player from an enumeration or a sample of run-outs
+
+    Attributes:
+        equities: list of the expected share of the pot for each player
+        margins: list of 95% confidence half-widths, zero when exact
+        num_runouts: number of run-outs enumerated or sampled
+        exact: True when every run-out was enumerated
+    """
+    def __init__(self, equities, margins, num_runouts, exact):
+        self.equities = equities
+        self.margins = margins
+        self.num_runouts = num_runouts
+        self.exact = exact
+
+
+def hand_equity(hole_cards,
+                board_cards=(),
+                unseen_cards=None,
+                max_enumeration=2000000,
+                num_samples=200000,
+                num_workers=1,
+                seed=None
+                ):
+    """Equity of each player's hole cards over the remaining run-outs
+
+    Args:
+        hole_cards: list with the hole cards of each player, as Card
+            objects or card codes in the registry.py convention
+        board_cards: community cards dealt so far (0 to 5)
+        unseen_cards: cards the run-out can come from, default the
+            standard deck less every hole and board card
+        max_enumeration: enumerate every run-out when there are at most
+            this many, otherwise sample num_samples of them
+        num_workers: number of worker processes
+        seed: master seed for the sampled estimate
+
+    Returns:
+        EquityResult
+    """
+    hole_codes = [card_codes(cards) for cards in hole_cards]
+    board_codes = card_codes(board_cards)
+    known_codes = board_codes + [code for codes in hole_codes
+                                 for code in codes]
+    if len(set(known_codes)) != len(known_codes):
+        raise ValueError("Expect no card to be dealt twice")
+    if len(board_codes) > BOARD_SIZE or len(hole_codes) < 2:
+        raise ValueError("Expect two or more players and at most five "
+                         "board cards")
+    if unseen_cards is None:
+        unseen_cards = standard_deck().card_list
+    known = set(known_codes)
+    unseen = [code for code in card_codes(unseen_cards) if code not in known]
+    num_missing = BOARD_SIZE - len(board_codes)
+    if len(unseen) < num_missing:
+        raise ValueError("Expect enough unseen cards to finish the board")
+
+    num_players = len(hole_codes)
+    unit = _share_unit(num_players)
+    total_runouts = _choose(len(unseen), num_missing)
+    if total_runouts <= max_enumeration:
+        tasks = [(hole_codes, board_codes, unseen, None, num_missing, 0, 1)]
+        board_suits = [0] * NUM_SUITS
+        for code in board_codes:
+            board_suits[SUIT_INDEX[code]] += 1
+        for suit in range(NUM_SUITS):
+            num_suited = len([code for code in unseen
+                              if SUIT_INDEX[code] == suit])
+            most_held = max([len([code for code in codes
+                                  if SUIT_INDEX[code] == suit])
+                             for codes in hole_codes])
+            # only run-outs leaving three or more board cards of the suit
+            # can make someone a flush in it, and only one suit can
+            lowest = max(3, 5 - most_held) - board_suits[suit]
+            for size in range(max(lowest, 0),
+                              min(num_missing, num_suited) + 1):
+                num_ranks = _choose(num_suited, size)
+                num_tasks = min(num_ranks, num_workers * TASKS_PER_WORKER)
+                bounds = [num_ranks * i // num_tasks
+                          for i in range(num_tasks + 1)]
+                tasks.extend([
+                    (hole_codes, board_codes, unseen, suit, size,
+                     bounds[i], bounds[i + 1])
+                    for i in range(num_tasks)
+                ])
+        totals = [0] * num_players
+        if num_workers == 1:
+            results = map(_count_runouts, tasks)
+        else:
+            pool = multiprocessing.Pool(num_workers)
+            try:
+                results = pool.map(_count_runouts, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        for task_totals in results:
+            totals = [a + b for a, b in zip(totals, task_totals)]
+        equities = [total / float(total_runouts * unit) for total in totals]
+        return EquityResult(equities, [0.0] * num_players, total_runouts,
+                            True)
+
+    runner = MonteCarloRunner(
+        _SampledRunout(hole_codes, board_codes, unseen),
+        reduce_function=_add_vectors,
+        initial=(0,) * (2 * num_players),
+        num_workers=num_workers
+    )
+    sums = runner.run(num_samples, seed=seed)
+    equities = []
+    margins = []
+    for player in range(num_players):
+        mean = sums[player] / float(num_samples * unit)
+        mean_square = sums[num_players + player] / float(
+            num_samples * unit * unit
+        )
+        variance = max(mean_square - mean * mean, 0.0)
+        equities.append(mean)
+        margins.append(CONFIDENCE_Z * math.sqrt(variance / num_samples))
+    return EquityResult(equities, margins, num_samples, False)
+
+
+def board_equity(board, hole_cards, deck_index=0, community_index=None,
+                 **options):
+    """Equity of each player's hole cards for the poker state of a Board
+
+    The unseen cards are those left in board.decks[deck_index]; the
+    community cards, if any, are the cards of
+    board.decks[community_index]. Other keyword options are passed on
+    to hand_equity.
+    """
+    unseen_cards = board.decks[deck_index].card_list
+    board_cards = []
+    if community_index is not None:
+        board_cards = board.decks[community_index].card_list
+    return hand_equity(hole_cards, board_cards=board_cards,
+                       unseen_cards=unseen_cards, **options)
@@ -0,0 +1,430 @@
+# module for an append-only binary log of the shuffles, deals, rolls and
+# other changes made to Boards across many games
+# every change is one or more fixed size records in path + '.log'; each
+# turn start is listed in the sidecar index path + '.idx' with the record
+# it starts at and the last full board checkpoint before it, and the
+# checkpoints themselves (boards in the serialization.py format) are
+# kept in path + '.blob', so a reader can rebuild the board at any turn
+# of any game by replaying the records after one checkpoint
+from bisect import bisect_left
+from collections import namedtuple
+import mmap
+import os
+import struct
+
+from cards import Card
+from serialization import CARD_TYPES
+from serialization import decode_board
+from serialization import encode_board
+from serialization import pack_value
+from serialization import unpack_value
+from tiles import Tile
+
+# game, turn, kind, flags, target and ten 16-bit payload words
+RECORD = struct.Struct('<IIBBH10H')
+PAYLOAD_WORDS = 10
+# game, turn, record of the turn start, record of the checkpoint
+INDEX = struct.Struct('<IIQQ')
+MAX_TARGET = 0xffff
+
+(GAME, TURN, CHECKPOINT, DEAL, ADD, ORDER, ORDER_MORE, ROLL, SPACE,
+ RESERVE_ADD, RESERVE_REMOVE, TOKEN_ADD, TOKEN_REMOVE, SCORE) = range(14)
+KIND_NAMES = (
+    'game', 'turn', 'checkpoint', 'deal', 'add', 'order', 'order_more',
+    'roll', 'space', 'reserve_add', 'reserve_remove', 'token_add',
+    'token_remove', 'score'
+)
+BOARD_KINDS = {
+    'space': SPACE,
+    'reserve_add': RESERVE_ADD,
+    'reserve_remove': RESERVE_REMOVE,
+    'token_add': TOKEN_ADD,
+    'token_remove': TOKEN_REMOVE,
+}
+
+LogRecord = namedtuple(
+    'LogRecord', ['game', 'turn', 'kind', 'flags', 'target', 'payload']
+)
+
+
+def _card_code(card):
+    """16-bit code of a plain card, None if it does not pack
+    """
+    if type(card) not in CARD_TYPES or (card.rank | card.value) >> 8:
+        return None
+    return card.rank << 8 | card.value
+
+
+def _split(number, num_words):
+    return [(number >> (16 * word)) & 0xffff for word in range(num_words)]
+
+
+def _join(words):
+    number = 0
+    for word in reversed(words):
+        number = number << 16 | word
+    return number
+
+
+class EventLogWriter(object):
+    """Appends the changes made to Boards to an event log
+
+    i. begin_game: checkpoint a board and record its later changes,
+        made through the Board mutator methods, as one game
+    ii. begin_turn: start the next turn of the current game; every
+        checkpoint_every turns also writes a checkpoint
+    iii. end_game: stop recording the board
+    iv. flush / close: write out the buffered records
+
+    Deals, adds, shuffles and rolls always fit in fixed size records;
+    changes to spaces, tiles, tokens and score do when the value packs
+    (small ints, None, bools, plain cards and tiles), and otherwise the
+    whole board is checkpointed after the change. Records are buffered
+    and written buffer_records at a time.
+    """
+    def __init__(self, path, buffer_records=4096, checkpoint_every=0):
+        self.path = path
+        self.buffer_records = buffer_records
+        self.checkpoint_every = checkpoint_every
+        self._log_file = open(path + '.log', 'ab')
+        self._index_file = open(path + '.idx', 'ab')
+        self._blob_file = open(path + '.blob', 'ab')
+        self._records = bytearray()
+        self._index = bytearray()
+        self._num_records = self._log_file.tell() // RECORD.size
+        self._blob_size = self._blob_file.tell()
+        self.board = None
+        self.game = -1
+        self.turn = 0
+        self._checkpoint = 0
+        index_size = self._index_file.tell()
+        if index_size:
+            with open(path + '.idx', 'rb') as index_file:
+                index_file.seek(index_size - INDEX.size)
+                self.game = INDEX.unpack(index_file.read(INDEX.size))[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, kind, flags=0, target=0, payload=()):
+        words = list(payload) + [0] * (PAYLOAD_WORDS - len(payload))
+        self._records += RECORD.pack(
+            self.game, self.turn, kind, flags, target, *words
+        )
+        self._num_records += 1
+        if len(self._records) >= self.buffer_records * RECORD.size:
+            self.flush()
+
+    def _write_checkpoint(self, board, kind=CHECKPOINT):
+        """store board in the blob file and record where it is
+        """
+        blob = encode_board(board)
+        self._blob_file.write(blob)
+        offset = self._blob_size
+        self._blob_size += len(blob)
+        self._checkpoint = self._num_records
+        self._write(kind, payload=_split(offset, 4) + _split(len(blob), 2))
+
+    def _write_index(self):
+        self._index += INDEX.pack(
+            self.game, self.turn, self._num_records, self._checkpoint
+        )
+
+    def begin_game(self, board, game=None):
+        """record board as the start of a game; game ids must increase
+        """
+        if game is None:
+            game = self.game + 1
+        if game <= self.game:
+            raise ValueError("Game ids must increase, got {}".format(game))
+        self.end_game()
+        self.game = game
+        self.turn = 0
+        self._write_checkpoint(board, kind=GAME)
+        self._write_index()
+        self.board = board
+        board._attach(self)
+
+    def begin_turn(self):
+        """start the next turn of the current game
+        """
+        if self.board is None:
+            raise ValueError("No game started")
+        self.turn += 1
+        if self.checkpoint_every and not self.turn % self.checkpoint_every:
+            self._write_checkpoint(self.board)
+        self._write_index()
+        self._write(TURN)
+
+    def end_game(self):
+        """stop recording changes to the current board
+        """
+        if self.board is not None:
+            self.board._detach(self)
+            self.board = None
+
+    def board_changed(self, board, event):
+        """write the records for one change reported by the Board
+        """
+        kind = event[0]
+        if kind in ('deal', 'add'):
+            index, card, at_bottom = event[1:]
+            code = _card_code(card)
+            if code is not None and index <= MAX_TARGET:
+                log_kind = DEAL if kind == 'deal' else ADD
+                self._write(log_kind, int(at_bottom), index, (code,))
+                return
+        elif kind == 'order':
+            index = event[1]
+            codes = [_card_code(card) for card in board.decks[index].card_list]
+            if (None not in codes and index <= MAX_TARGET and
+                    len(codes) <= 0xffff):
+                self._write(ORDER, 0, index, [len(codes)] + codes[:9])
+                for start in range(9, len(codes), PAYLOAD_WORDS):
+                    self._write(ORDER_MORE, 0, index,
+                                codes[start:start + PAYLOAD_WORDS])
+                return
+        elif kind == 'roll':
+            index = event[1]
+            roller = board.dice_rollers[index]
+            faces = [die.face_value for die in roller.dice]
+            if (len(faces) < PAYLOAD_WORDS - 1 and index <= MAX_TARGET and
+                    max(faces + [0]) <= 0xffff and
+                    0 <= roller.roll_value <= 0xffff):
+                self._write(ROLL, 0, index,
+                            [len(faces)] + faces + [roller.roll_value])
+                return
+        elif kind in BOARD_KINDS or kind == 'score':
+            if kind == 'score':
+                position, value = 0, event[2]
+            elif kind == 'space':
+                position, value = event[1], event[3]
+            else:
+                position, value = event[1:]
+            ref = pack_value(value)
+            if ref is not None and position <= MAX_TARGET:
+                log_kind = SCORE if kind == 'score' else BOARD_KINDS[kind]
+                self._write(log_kind, 0, position, _split(ref, 2))
+                return
+        else:
+            # rng states and other trackers' events are not logged
+            return
+        self._write_checkpoint(board)
+
+    def flush(self):
+        """write buffered records, then the index entries pointing at them
+        """
+        self._blob_file.flush()
+        self._log_file.write(self._records)
+        self._log_file.flush()
+        self._records = bytearray()
+        self._index_file.write(self._index)
+        self._index_file.flush()
+        self._index = bytearray()
+
+    def close(self):
+        self.end_game()
+        self.flush()
+        for log_file in (self._log_file, self._index_file, self._blob_file):
+            log_file.close()
+
+
+def _map(file_path):
+    """read only mmap of a file, None when it is empty or missing
+    """
+    if not os.path.exists(file_path) or not os.path.getsize(file_path):
+        return None
+    with open(file_path, 'rb') as map_file:
+        return mmap.mmap(map_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class EventLog(object):
+    """Reads an event log through mmap, as written by EventLogWriter
+
+    i. len and record: random access to the fixed size records
+    ii. iteration and records: stream LogRecord tuples for analytics
+    iii. turns: the (game, turn) pairs in the index
+    iv. find: the record a turn starts at, by binary search of the index
+    v. board_at: rebuild the board at the start of a turn from the last
+        checkpoint before it, without reading the rest of the log
+
+    The log is read as it was when the EventLog was opened.
+    """
+    def __init__(self, path, card_class=Card, tile_class=Tile):
+        self.path = path
+        self.card_class = card_class
+        self.tile_class = tile_class
+        self._log = _map(path + '.log')
+        self._index = _map(path + '.idx')
+        self._blobs = _map(path + '.blob')
+        self._num_records = 0
+        self._num_turns = 0
+        if self._log is not None:
+            self._num_records = len(self._log) // RECORD.size
+        if self._index is not None:
+            self._num_turns = len(self._index) // INDEX.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._num_records
+
+    def __iter__(self):
+        return self.records()
+
+    def close(self):
+        for mapped in (self._log, self._index, self._blobs):
+            if mapped is not None:
+                mapped.close()
+
+    def record(self, number):
+        """LogRecord number, counted from the start of the log
+        """
+        if not 0 <= number < self._num_records:
+            raise IndexError("Record number out of range")
+        fields = RECORD.unpack_from(self._log, number * RECORD.size)
+        return LogRecord(fields[0], fields[1], fields[2], fields[3],
+                         fields[4], fields[5:])
+
+    def records(self, start=0, stop=None):
+        """stream LogRecord tuples from record start up to stop
+        """
+        if stop is None or stop > self._num_records:
+            stop = self._num_records
+        log = self._log
+        unpack_from = RECORD.unpack_from
+        for offset in range(start * RECORD.size, stop * RECORD.size,
+                            RECORD.size):
+            fields = unpack_from(log, offset)
+            yield LogRecord(fields[0], fields[1], fields[2], fields[3],
+                            fields[4], fields[5:])
+
+    def _index_entry(self, position):
+        return INDEX.unpack_from(self._index, position * INDEX.size)
+
+    def turns(self):
+        """list of (game, turn) pairs in the order they were logged
+        """
+        return [self._index_entry(position)[:2]
+                for position in range(self._num_turns)]
+
+    def _find_entry(self, game, turn):
+        entries = _IndexKeys(self)
+        position = bisect_left(entries, (game, turn))
+        if position < self._num_turns:
+            entry = self._index_entry(position)
+            if entry[:2] == (game, turn):
+                return entry
+        raise KeyError("Turn {} of game {} is not in the log".format(
+            turn, game
+        ))
+
+    def find(self, game, turn=0):
+        """number of the record at which turn of game starts
+        """
+        return self._find_entry(game, turn)[2]
+
+    def _checkpoint_board(self, record):
+        words = record.payload
+        offset = _join(words[:4])
+        length = _join(words[4:6])
+        return decode_board(
+            self._blobs[offset:offset + length], self.card_class,
+            self.tile_class
+        )
+
+    def board_at(self, game, turn=0):
+        """new Board in the state it was at the start of turn of game
+        """
+        entry = self._find_entry(game, turn)
+        start, checkpoint = entry[2:]
+        board = self._checkpoint_board(self.record(checkpoint))
+        # a shuffle is an ORDER record and ORDER_MORE records after it
+        order = None
+        for record in self.records(checkpoint + 1, start):
+            if record.kind == ORDER_MORE:
+                order[2].extend(record.payload)
+                continue
+            if order is not None:
+                self._set_order(board, *order)
+                order = None
+            if record.kind == ORDER:
+                order = (record.target, record.payload[0],
+                         list(record.payload[1:]))
+            elif record.kind == CHECKPOINT:
+                board = self._checkpoint_board(record)
+            elif record.kind != TURN:
+                self._apply(board, record)
+        if order is not None:
+            self._set_order(board, *order)
+        return board
+
+    def _set_order(self, board, deck_index, num_cards, codes):
+        card_class = self.card_class
+        board.decks[deck_index].card_list = [
+            card_class(rank=code >> 8, value=code & 255)
+            for code in codes[:num_cards]
+        ]
+
+    def _apply(self, board, record):
+        """replay one record on board
+        """
+        kind = record.kind
+        target = record.target
+        payload = record.payload
+        if kind in (DEAL, ADD):
+            card = self.card_class(rank=payload[0] >> 8,
+                                   value=payload[0] & 255)
+            deck = board.decks[target]
+            if kind == ADD:
+                deck.add_card(card, bottom_add=bool(record.flags))
+            elif deck.ordered:
+                dealt_card = deck.deal_card(bottom_deal=bool(record.flags))
+                if _card_code(dealt_card) != payload[0]:
+                    raise ValueError(
+                        "Logged deal does not match deck {}".format(target)
+                    )
+            else:
+                deck.remove_card(card)
+            return
+        if kind == ROLL:
+            roller = board.dice_rollers[target]
+            num_dice = payload[0]
+            for die, face_value in zip(roller.dice, payload[1:]):
+                die.face_value = face_value
+            roller.roll_value = payload[num_dice + 1]
+            return
+        value = unpack_value(_join(payload[:2]), self.card_class,
+                             self.tile_class)
+        if kind == SPACE:
+            board.spaces[target] = value
+        elif kind == RESERVE_ADD:
+            board.tiles.insert(target, value)
+        elif kind == RESERVE_REMOVE:
+            del board.tiles[target]
+        elif kind == TOKEN_ADD:
+            board.tokens.insert(target, value)
+        elif kind == TOKEN_REMOVE:
+            del board.tokens[target]
+        elif kind == SCORE:
+            board.score = value
+
+
+class _IndexKeys(object):
+    """(game, turn) keys of an EventLog index, as a sequence for bisect
+    """
+    def __init__(self, event_log):
+        self.event_log = event_log
+
+    def __len__(self):
+        return self.event_log._num_turns
+
+    def __getitem__(self, position):
+        return self.event_log._index_entry(position)[:2]
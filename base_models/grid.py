@@ -0,0 +1,295 @@
+# module for spatial indexes over Board spaces laid out as a grid
+# HexGrid lays the spaces out as a hexagon of hexagonal cells in axial
+# coordinates (as on a Settlers board) and SquareGrid as a rectangle of
+# squares; both precompute which cells, corners (vertices) and sides
+# (edges) touch each other into flat arrays, so lookups are O(1) indexing
+# rather than scans of the spaces list
+# numpy is optional; with it value queries over many boards at once run
+# as one matrix product
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from board import Board
+
+# axial (q, r) steps to the neighbor across side k of a hex, side k
+# running from corner k to corner k + 1
+HEX_DIRECTIONS = ((1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1))
+# corners of a hex in cube coordinates (q, r, s) scaled by three, so the
+# corner shared by three hexes has the same integer key from each of them
+HEX_CORNERS = ((2, -1), (1, 1), (-1, 2), (-2, 1), (-1, -1), (1, -2))
+SQUARE_DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+SQUARE_CORNERS = ((0, 0), (1, 0), (1, 1), (0, 1))
+
+
+def cell_values(spaces):
+    """array of the value of each space for value queries
+
+    the value of a Tile or Card, an int space as it is, otherwise 0
+    """
+    values = []
+    for space in spaces:
+        value = getattr(space, 'value', space)
+        values.append(value if type(value) is int else 0)
+    return array('l', values)
+
+
+class GridIndex(object):
+    """Base class for grid indexes over the spaces of a Board
+
+    Built from the coordinate of each cell and three class tables:
+    directions, the neighbor step across each side; corners, the offset
+    of each corner; and corner_scale, the factor taking a coordinate to
+    the units of the corner offsets, chosen so that every cell meeting
+    at a corner gives it the same key. Precomputed, as flat arrays of ints
+    with -1 where a side has no neighbor:
+    i. neighbors, cell_vertices, cell_edges: num_sides entries per cell
+    ii. edge_vertices: the two vertices at the ends of each edge
+    iii. vertex_cells, vertex_neighbors, edge_cells: compressed rows
+        read through cells_of_vertex, vertices_next_to and cells_of_edge
+
+    Coordinates map to cell indexes, which are Board.spaces indexes,
+    through index and coord in O(1).
+    """
+    directions = ()
+    corners = ()
+    corner_scale = 1
+
+    def __init__(self, coords):
+        self.coords = list(coords)
+        self._index = dict(
+            [(coord, index) for index, coord in enumerate(self.coords)]
+        )
+        self.num_sides = len(self.directions)
+        self._build()
+
+    def corner_key(self, coord, corner):
+        """key of corner number corner of the cell at coord, the same
+        from every cell that meets there
+        """
+        offset = self.corners[corner]
+        scale = self.corner_scale
+        return (scale * coord[0] + offset[0], scale * coord[1] + offset[1])
+
+    def _build(self):
+        num_sides = self.num_sides
+        vertex_ids = {}
+        edge_ids = {}
+        self.neighbors = array('i')
+        self.cell_vertices = array('i')
+        self.cell_edges = array('i')
+        self.edge_vertices = array('i')
+        vertex_cells = []
+        edge_cells = []
+        vertex_neighbors = []
+        for index, coord in enumerate(self.coords):
+            keys = [self.corner_key(coord, corner)
+                    for corner in range(num_sides)]
+            vertices = []
+            for key in keys:
+                if key not in vertex_ids:
+                    vertex_ids[key] = len(vertex_ids)
+                    vertex_cells.append([])
+                    vertex_neighbors.append([])
+                vertex = vertex_ids[key]
+                vertex_cells[vertex].append(index)
+                vertices.append(vertex)
+            self.cell_vertices.extend(vertices)
+            for side, step in enumerate(self.directions):
+                neighbor = self._index.get(
+                    (coord[0] + step[0], coord[1] + step[1]), -1
+                )
+                self.neighbors.append(neighbor)
+                first = keys[side]
+                second = keys[(side + 1) % num_sides]
+                key = (first[0] + second[0], first[1] + second[1])
+                if key not in edge_ids:
+                    edge_ids[key] = len(edge_ids)
+                    edge_cells.append([])
+                    ends = (vertices[side], vertices[(side + 1) % num_sides])
+                    self.edge_vertices.extend(ends)
+                    vertex_neighbors[ends[0]].append(ends[1])
+                    vertex_neighbors[ends[1]].append(ends[0])
+                edge = edge_ids[key]
+                edge_cells[edge].append(index)
+                self.cell_edges.append(edge)
+        self.num_vertices = len(vertex_ids)
+        self.num_edges = len(edge_ids)
+        self._vertex_cells = self._compress(vertex_cells)
+        self._vertex_neighbors = self._compress(vertex_neighbors)
+        self._edge_cells = self._compress(edge_cells)
+        self._incidence = None
+
+    @staticmethod
+    def _compress(rows):
+        """(offsets, items) arrays holding a list of rows
+        """
+        offsets = array('i', [0])
+        items = array('i')
+        for row in rows:
+            items.extend(sorted(row))
+            offsets.append(len(items))
+        return offsets, items
+
+    @staticmethod
+    def _row(compressed, position):
+        offsets, items = compressed
+        return items[offsets[position]:offsets[position + 1]].tolist()
+
+    def __len__(self):
+        return len(self.coords)
+
+    def index(self, coord):
+        """index in Board.spaces of the cell at coord, KeyError if none
+        """
+        return self._index[tuple(coord)]
+
+    def coord(self, index):
+        return self.coords[index]
+
+    def __contains__(self, coord):
+        return tuple(coord) in self._index
+
+    def new_board(self, empty=0, **board_attributes):
+        """Board with one space, holding empty, per cell of the grid
+        """
+        return Board(spaces=[empty] * len(self.coords), **board_attributes)
+
+    def _side_row(self, table, index):
+        start = index * self.num_sides
+        return table[start:start + self.num_sides].tolist()
+
+    def neighbors_of(self, index):
+        """cells across each side of cell index, -1 where there is none
+        """
+        return self._side_row(self.neighbors, index)
+
+    def vertices_of(self, index):
+        """vertices at the corners of cell index, in corner order
+        """
+        return self._side_row(self.cell_vertices, index)
+
+    def edges_of(self, index):
+        """edges along the sides of cell index, in side order
+        """
+        return self._side_row(self.cell_edges, index)
+
+    def cells_of_vertex(self, vertex):
+        return self._row(self._vertex_cells, vertex)
+
+    def vertices_next_to(self, vertex):
+        """vertices one edge away from vertex
+        """
+        return self._row(self._vertex_neighbors, vertex)
+
+    def cells_of_edge(self, edge):
+        return self._row(self._edge_cells, edge)
+
+    def edge_ends(self, edge):
+        return self.edge_vertices[2 * edge], self.edge_vertices[2 * edge + 1]
+
+    def cells_with_value(self, values, value):
+        """cells whose entry in values (see cell_values) equals value
+        """
+        return [index for index, cell_value in enumerate(values)
+                if cell_value == value]
+
+    def vertex_hits(self, values, value):
+        """array counting, per vertex, the cells touching it with value
+
+        with values from cell_values(board.spaces) and value a roll,
+        this is how many producing tiles each vertex touches
+        """
+        hits = array('i', [0] * self.num_vertices)
+        num_sides = self.num_sides
+        cell_vertices = self.cell_vertices
+        for index, cell_value in enumerate(values):
+            if cell_value == value:
+                start = index * num_sides
+                for vertex in cell_vertices[start:start + num_sides]:
+                    hits[vertex] += 1
+        return hits
+
+    def vertices_with_value(self, values, value):
+        """sorted vertices touching at least one cell with value
+        """
+        hits = self.vertex_hits(values, value)
+        return [vertex for vertex in range(self.num_vertices)
+                if hits[vertex]]
+
+    def vertex_hits_many(self, value_rows, value):
+        """vertex_hits for many boards at once, one row of values each
+
+        with numpy returns a (boards, vertices) matrix from a single
+        product with the cell to vertex incidence matrix, otherwise a
+        list of arrays
+        """
+        if np is None:
+            return [self.vertex_hits(values, value) for values in value_rows]
+        if self._incidence is None:
+            incidence = np.zeros((len(self.coords), self.num_vertices),
+                                 dtype=np.int32)
+            cells = np.repeat(np.arange(len(self.coords)), self.num_sides)
+            np.add.at(incidence, (cells, np.asarray(self.cell_vertices)), 1)
+            self._incidence = incidence
+        matches = (np.asarray(value_rows) == value).astype(np.int32)
+        return matches.dot(self._incidence)
+
+
+class HexGrid(GridIndex):
+    """Hexagon of hexagonal cells, radius cells out from the center cell
+
+    Cells have axial coordinates (q, r), the third cube coordinate
+    being s = -q - r; radius 2 gives the 19 cells of a Settlers board,
+    with 54 vertices and 72 edges. Side k of a cell runs from corner k
+    to corner k + 1 and faces the neighbor HEX_DIRECTIONS[k].
+    """
+    directions = HEX_DIRECTIONS
+    corners = HEX_CORNERS
+    corner_scale = 3
+
+    def __init__(self, radius=2):
+        self.radius = radius
+        coords = []
+        for q in range(-radius, radius + 1):
+            for r in range(max(-radius, -q - radius),
+                           min(radius, -q + radius) + 1):
+                coords.append((q, r))
+        super(HexGrid, self).__init__(coords)
+
+    @staticmethod
+    def distance(first, second):
+        """number of steps between two axial coordinates
+        """
+        dq = first[0] - second[0]
+        dr = first[1] - second[1]
+        return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+
+
+class SquareGrid(GridIndex):
+    """Rectangle of square cells, width by height, indexed row by row
+
+    Cells have coordinates (x, y); side k of a cell runs from corner k
+    to corner k + 1 and faces the neighbor SQUARE_DIRECTIONS[k].
+    """
+    directions = SQUARE_DIRECTIONS
+    corners = SQUARE_CORNERS
+
+    def __init__(self, width=8, height=8):
+        self.width = width
+        self.height = height
+        super(SquareGrid, self).__init__(
+            [(x, y) for y in range(height) for x in range(width)]
+        )
+
+    def index(self, coord):
+        """index in Board.spaces of the cell at coord, KeyError if none
+        """
+        x, y = coord
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError(coord)
+        return y * self.width + x
@@ -0,0 +1,111 @@
+# module to canonicalize card states up to a relabelling of the suits
+# two states that differ only by a permutation of the suits (e.g. a hand
+# of two hearts against the same hand in spades) map to one canonical
+# state, so caches keyed on it hold each state once instead of up to 24
+# times; cards follow the registry convention (rank is the suit)
+
+from itertools import permutations
+
+from cards import Card
+from packed_deck import FIELD_BITS
+from packed_deck import FIELD_MASK
+from packed_deck import encode_card
+from registry import SUITS
+
+
+MAX_CODE = (max(SUITS) << FIELD_BITS) | FIELD_MASK
+SUIT_PERMUTATIONS = tuple(permutations(SUITS))
+_PERMUTATION_INDEX = dict(
+    (permutation, i) for i, permutation in enumerate(SUIT_PERMUTATIONS)
+)
+
+
+def _build_code_tables():
+    """one list per suit permutation mapping each code to its image
+    """
+    tables = []
+    for permutation in SUIT_PERMUTATIONS:
+        table = list(range(MAX_CODE + 1))
+        for suit in SUITS:
+            new_suit = permutation[suit - 1]
+            for face in range(FIELD_MASK + 1):
+                code = (suit << FIELD_BITS) | face
+                table[code] = (new_suit << FIELD_BITS) | face
+        tables.append(table)
+    return tables
+
+
+_PERMUTED_CODES = _build_code_tables()
+
+
+def _codes(cards):
+    codes = []
+    for card in cards:
+        if isinstance(card, Card):
+            card = encode_card(card)
+        if card >> FIELD_BITS not in SUITS:
+            raise ValueError("Expect standard cards, see registry.py")
+        codes.append(card)
+    return codes
+
+
+def canonicalize(groups):
+    """Canonical form of a card state under relabelling of the suits
+
+    Args:
+        groups: sequence of card collections that make up the state,
+            e.g. (hole cards, board cards) or (hand, remaining deck);
+            order within a group does not matter, order of the groups
+            does. Cards may be Card objects or packed card codes
+
+    Returns:
+        (canonical, permutation): canonical is a tuple with a sorted
+            tuple of codes per group, equal for any two states that
+            differ only by suits; permutation is the tuple p of new
+            suits, p[suit - 1], that maps the state onto canonical
+    """
+    code_groups = [_codes(group) for group in groups]
+    # each suit is described by the faces it holds in every group;
+    # ordering the suits by that signature fixes the relabelling, and
+    # suits with equal signatures are interchangeable
+    signatures = dict((suit, [0] * len(code_groups)) for suit in SUITS)
+    for group_index, codes in enumerate(code_groups):
+        for code in codes:
+            signatures[code >> FIELD_BITS][group_index] |= (
+                1 << (code & FIELD_MASK)
+            )
+    ordered_suits = sorted(
+        SUITS, key=lambda suit: signatures[suit], reverse=True
+    )
+    new_suits = dict(zip(ordered_suits, SUITS))
+    permutation = tuple([new_suits[suit] for suit in SUITS])
+    canonical = permute(code_groups, permutation)
+    return canonical, permutation
+
+
+def canonical_key(groups):
+    """only the canonical form of canonicalize, for use as a cache key
+    """
+    return canonicalize(groups)[0]
+
+
+def permute(groups, permutation):
+    """apply a suit permutation to groups of cards
+
+    Returns:
+        tuple with a sorted tuple of permuted codes per group
+    """
+    table = _PERMUTED_CODES[_PERMUTATION_INDEX[tuple(permutation)]]
+    return tuple([
+        tuple(sorted([table[code] for code in _codes(group)]))
+        for group in groups
+    ])
+
+
+def inverse_permutation(permutation):
+    """the suit permutation that undoes permutation
+    """
+    inverse = [0] * len(permutation)
+    for suit, new_suit in zip(SUITS, permutation):
+        inverse[new_suit - 1] = suit
+    return tuple(inverse)
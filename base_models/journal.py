@@ -0,0 +1,165 @@
+# module for the MoveJournal class, an undo log of Board changes
+# search code can make a move on a Board, look at the result and unmake
+# it again instead of deep copying the Board at every node; each change
+# is recorded as the small event tuple the Board mutators report, and
+# undoing a change costs about as much as making it
+import random
+
+
+class MoveJournal(object):
+    """Records the changes made to a Board so they can be undone
+
+    Attaches to a Board and records every change made through its
+    mutator methods, along with the state of any rng drawn from by a
+    dice roll, a shuffle or a deal from a count based deck, so undoing
+    those and repeating them with the same rng gives the same result.
+    Cards a count based deck holds at its ends after show_top or
+    show_bottom are recorded too and held there again on undo.
+
+    i. mark: start a new ply; undo reverts everything since the mark
+    ii. checkpoint: a position in the journal for rewind to return to,
+        several plies back if need be
+    iii. clear: forget the history, keeping the board as it is
+    iv. close: stop recording
+
+    Changes are undone through the same mutators, so other trackers
+    such as the one behind Board.hash_key stay in step. Changes made
+    directly to the Board attributes are not recorded, and decks are
+    expected to be shuffled eagerly, as Board.shuffle_deck does.
+    """
+    records_rng = True
+
+    def __init__(self, board):
+        self.board = board
+        self.entries = []
+        self._marks = []
+        self._undoing = False
+        board._attach(self)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def depth(self):
+        """number of plies marked and not yet undone
+        """
+        return len(self._marks)
+
+    def board_changed(self, board, event):
+        """record one change reported by a Board mutator
+        """
+        if not self._undoing:
+            self.entries.append(event)
+
+    def mark(self):
+        """start a ply that the next undo call will revert
+        """
+        self._marks.append(len(self.entries))
+
+    def checkpoint(self):
+        """return the current position in the journal, for rewind
+        """
+        return len(self.entries)
+
+    def undo(self):
+        """revert every change made since the last mark
+        """
+        if not self._marks:
+            raise IndexError("No marked ply to undo")
+        self.rewind(self._marks.pop())
+
+    def rewind(self, checkpoint):
+        """revert every change made since checkpoint, latest first
+        """
+        if not 0 <= checkpoint <= len(self.entries):
+            raise ValueError("Checkpoint {} is not in the journal".format(
+                checkpoint
+            ))
+        while self._marks and self._marks[-1] >= checkpoint:
+            self._marks.pop()
+        self._undoing = True
+        try:
+            while len(self.entries) > checkpoint:
+                self._revert(self.entries.pop())
+        finally:
+            self._undoing = False
+
+    def clear(self):
+        """forget every recorded change and mark
+        """
+        self.entries = []
+        self._marks = []
+
+    def close(self):
+        """detach from the board and stop recording
+        """
+        self.board._detach(self)
+        self.clear()
+
+    def _revert(self, event):
+        """undo one change, reporting the inverse change to the board
+        """
+        board = self.board
+        kind = event[0]
+        if kind == 'space':
+            index, old_content, new_content = event[1:]
+            board.set_space(index, old_content)
+        elif kind == 'reserve_remove':
+            position, tile = event[1:]
+            board.tiles.insert(position, tile)
+            board._changed(('reserve_add', position, tile))
+        elif kind == 'reserve_add':
+            position, tile = event[1:]
+            del board.tiles[position]
+            board._changed(('reserve_remove', position, tile))
+        elif kind == 'token_remove':
+            position, token = event[1:]
+            board.tokens.insert(position, token)
+            board._changed(('token_add', position, token))
+        elif kind == 'token_add':
+            position, token = event[1:]
+            del board.tokens[position]
+            board._changed(('token_remove', position, token))
+        elif kind == 'score':
+            board.set_score(event[1])
+        elif kind == 'deal':
+            index, card, bottom_deal = event[1:]
+            board.add_card(index, card, bottom_add=bottom_deal)
+        elif kind == 'add':
+            index, card, bottom_add = event[1:]
+            deck = board.decks[index]
+            if deck.ordered:
+                board.deal_card(index, bottom_deal=bottom_add)
+            else:
+                # a count based deck deals at random, so take out the
+                # same card rather than dealing one
+                deck.remove_card(card)
+                board._changed(('deal', index, card, bottom_add))
+        elif kind == 'order':
+            index, old_order = event[1:]
+            deck = board.decks[index]
+            new_order = deck.card_list
+            deck.card_list = old_order
+            board._changed(('order', index, new_order))
+        elif kind == 'pins':
+            # a count based deck dealt or took back a card held at an
+            # end by show_top or show_bottom, so hold it there again
+            index, top_card, bottom_card = event[1:]
+            deck = board.decks[index]
+            new_order = deck.card_list
+            deck.set_pinned_cards(top_card, bottom_card)
+            board._changed(('order', index, new_order))
+        elif kind == 'roll':
+            index, old_faces, old_value = event[1:]
+            roller = board.dice_rollers[index]
+            new_faces = [die.face_value for die in roller.dice]
+            new_value = roller.roll_value
+            for die, face_value in zip(roller.dice, old_faces):
+                die.face_value = face_value
+            roller.roll_value = old_value
+            board._changed(('roll', index, new_faces, new_value))
+        elif kind == 'rng':
+            rng, state = event[1:]
+            if rng is None:
+                rng = random
+            rng.setstate(state)
@@ -0,0 +1,126 @@
+# module for finite Markov chains held as sparse transition lists
+# transitions are gathered per state and then frozen into flat arrays of
+# (source, target, probability), so one step of power iteration walks
+# only the transitions that exist rather than a full square matrix
+# numpy is optional; with it each step is one bincount over the arrays
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MarkovChain(object):
+    """Sparse Markov chain over states numbered 0 to num_states - 1
+
+    i. add: gather the probability of moving from one state to another,
+        adding to any probability already given for the pair
+    ii. step: the distribution one move after a given one
+    iii. solve: the stationary distribution by power iteration, started
+        from a given distribution, such as the solution of a chain with
+        slightly different rules, or else from the last solution
+    """
+    def __init__(self, num_states):
+        self.num_states = num_states
+        self._rows = [dict() for state in range(num_states)]
+        self._arrays = None
+        self.stationary = None
+        self.iterations = 0
+
+    def add(self, source, target, probability):
+        row = self._rows[source]
+        row[target] = row.get(target, 0.0) + probability
+        self._arrays = None
+
+    def row(self, source):
+        """dict of each state reachable from source to its probability
+        """
+        return dict(self._rows[source])
+
+    def __len__(self):
+        """number of transitions with a probability
+        """
+        return sum([len(row) for row in self._rows])
+
+    def check(self, tolerance=1e-9):
+        """raise ValueError unless every row sums to one
+        """
+        for source, row in enumerate(self._rows):
+            total = sum(row.values())
+            if abs(total - 1.0) > tolerance:
+                raise ValueError(
+                    "Transitions from state {} sum to {}".format(
+                        source, total
+                    )
+                )
+
+    def _frozen(self):
+        """(sources, targets, probabilities) arrays of every transition
+        """
+        if self._arrays is None:
+            sources = array('i')
+            targets = array('i')
+            probabilities = array('d')
+            for source, row in enumerate(self._rows):
+                for target in sorted(row):
+                    sources.append(source)
+                    targets.append(target)
+                    probabilities.append(row[target])
+            if np is not None:
+                self._arrays = (np.asarray(sources), np.asarray(targets),
+                                np.asarray(probabilities))
+            else:
+                self._arrays = (sources, targets, probabilities)
+        return self._arrays
+
+    def step(self, distribution):
+        """distribution over states after one move from distribution
+        """
+        sources, targets, probabilities = self._frozen()
+        if np is not None:
+            return np.bincount(
+                targets, weights=np.asarray(distribution)[sources] *
+                probabilities, minlength=self.num_states
+            )
+        moved = [0.0] * self.num_states
+        for source, target, probability in zip(sources, targets,
+                                               probabilities):
+            moved[target] += distribution[source] * probability
+        return moved
+
+    def solve(self, start=None, tolerance=1e-12, max_iterations=100000):
+        """stationary distribution as a list of probabilities
+
+        iterates from start, the last solution or the uniform
+        distribution until no probability moves by more than tolerance
+        in total; raises ValueError if that takes over max_iterations
+        """
+        if start is None:
+            start = self.stationary
+        if start is None or len(start) != self.num_states:
+            start = [1.0 / self.num_states] * self.num_states
+        total = float(sum(start))
+        distribution = [probability / total for probability in start]
+        if np is not None:
+            distribution = np.asarray(distribution)
+        for iteration in range(1, max_iterations + 1):
+            moved = self.step(distribution)
+            if np is not None:
+                change = float(np.abs(moved - distribution).sum())
+            else:
+                change = sum([abs(new - old) for new, old
+                              in zip(moved, distribution)])
+            distribution = moved
+            if change <= tolerance:
+                break
+        else:
+            raise ValueError(
+                "No stationary distribution within {} iterations".format(
+                    max_iterations
+                )
+            )
+        self.iterations = iteration
+        self.stationary = [float(probability) for probability in distribution]
+        return list(self.stationary)
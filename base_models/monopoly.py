@@ -0,0 +1,241 @@
+# module for exact Monopoly landing probabilities as a Markov chain
+# a state is the square a token stands on after a roll along with the
+# doubles rolled in a row to get there, or a turn spent in jail; moves
+# come from the exact roll distribution of the dice, split into doubles
+# and other rolls, and from the Chance and Community Chest decks, each
+# card being equally likely to be drawn, so the stationary distribution
+# of the chain gives the long run share of rolls ending on each square
+# with no simulation
+
+from cards import Card
+from cards import DeckOfCards
+from dice import DiceRoller
+from markov import MarkovChain
+
+NUM_SQUARES = 40
+GO = 0
+JAIL = 10
+GO_TO_JAIL = 30
+CHANCE = (7, 22, 36)
+COMMUNITY_CHEST = (2, 17, 33)
+RAILROADS = (5, 15, 25, 35)
+UTILITIES = (12, 28)
+
+# what a card does, the rank of the card; its value is the square to
+# advance to or the number of squares to go back
+STAY = 0
+ADVANCE = 1
+GO_BACK = 2
+NEXT_RAILROAD = 3
+NEXT_UTILITY = 4
+TO_JAIL = 5
+
+
+def chance_deck():
+    """DeckOfCards of the 16 Chance cards as Card(rank=action, value)
+    """
+    return DeckOfCards([
+        Card(ADVANCE, GO), Card(ADVANCE, 24), Card(ADVANCE, 11),
+        Card(NEXT_UTILITY, 0), Card(NEXT_RAILROAD, 0),
+        Card(NEXT_RAILROAD, 0), Card(ADVANCE, 5), Card(ADVANCE, 39),
+        Card(GO_BACK, 3), Card(TO_JAIL, 0)
+    ] + [Card(STAY, 0) for card in range(6)])
+
+
+def community_chest_deck():
+    """DeckOfCards of the 16 Community Chest cards
+    """
+    return DeckOfCards([Card(ADVANCE, GO), Card(TO_JAIL, 0)] +
+                       [Card(STAY, 0) for card in range(14)])
+
+
+def card_target(card, square):
+    """square a card drawn on square sends the token to, None for jail
+    """
+    action = card.rank
+    if action == ADVANCE:
+        return card.value
+    if action == GO_BACK:
+        return (square - card.value) % NUM_SQUARES
+    if action in (NEXT_RAILROAD, NEXT_UTILITY):
+        stops = RAILROADS if action == NEXT_RAILROAD else UTILITIES
+        for stop in stops:
+            if stop > square:
+                return stop
+        return stops[0]
+    if action == TO_JAIL:
+        return None
+    return square
+
+
+def roll_outcomes(dice_roller):
+    """list of (roll sum, doubles, probability) for a DiceRoller
+
+    doubles being every die showing the same face; the counts come from
+    the exact distribution of the sum
+    """
+    distribution = dice_roller.distribution
+    num_dice = dice_roller.num_dice
+    num_sides = dice_roller.num_sides
+    total = float(distribution.total_outcomes)
+    outcomes = []
+    for roll_sum in range(distribution.min_sum, distribution.max_sum + 1):
+        count = distribution.count(roll_sum)
+        doubles = 0
+        if num_dice > 1 and roll_sum % num_dice == 0:
+            doubles = 1 if roll_sum // num_dice <= num_sides else 0
+        if doubles:
+            outcomes.append((roll_sum, True, doubles / total))
+        if count > doubles:
+            outcomes.append((roll_sum, False, (count - doubles) / total))
+    return outcomes
+
+
+class MonopolyChain(object):
+    """Markov chain of one token going round a Monopoly board
+
+    States are (square, doubles in a row) for every square and each
+    doubles count below doubles_to_jail, then one state per turn a
+    token may spend in jail. Rules:
+    i. dice_roller: the DiceRoller thrown each roll
+    ii. chance, community_chest: DeckOfCards drawn from on those
+        squares, as made by chance_deck and community_chest_deck
+    iii. doubles_to_jail: doubles in a row that send the token to jail,
+        0 to never do so and never roll again after doubles
+    iv. jail_turns: turns spent trying to roll doubles out of jail
+        before paying, 0 to pay at once on the next turn
+
+    landing_probabilities gives the share of rolls ending on each
+    square; with_rules makes a chain for changed rules and solves it
+    starting from this chain's solution, which takes fewer iterations.
+    """
+    def __init__(self, dice_roller=None, chance=None, community_chest=None,
+                 doubles_to_jail=3, jail_turns=3):
+        if dice_roller is None:
+            dice_roller = DiceRoller(6, 2)
+        if chance is None:
+            chance = chance_deck()
+        if community_chest is None:
+            community_chest = community_chest_deck()
+        self.dice_roller = dice_roller
+        self.chance = chance
+        self.community_chest = community_chest
+        self.doubles_to_jail = doubles_to_jail
+        self.jail_turns = jail_turns
+        self.streaks = max(doubles_to_jail, 1)
+        self.jail_state = NUM_SQUARES * self.streaks
+        self.chain = MarkovChain(self.jail_state + max(jail_turns, 1))
+        self._build()
+
+    def state(self, square, streak=0):
+        return square * self.streaks + streak
+
+    def square_of(self, state):
+        """square of a state, JAIL for the states in jail
+        """
+        if state >= self.jail_state:
+            return JAIL
+        return state // self.streaks
+
+    def _deck_on(self, square):
+        if square in CHANCE:
+            return self.chance
+        if square in COMMUNITY_CHEST:
+            return self.community_chest
+        return None
+
+    def _landings(self, square, streak):
+        """list of (state, probability) for a token reaching square,
+        following Go To Jail and any cards drawn there
+        """
+        if square == GO_TO_JAIL:
+            return [(self.jail_state, 1.0)]
+        deck = self._deck_on(square)
+        if deck is None or not deck.cards_left:
+            return [(self.state(square, streak), 1.0)]
+        card_list = deck.card_list
+        share = 1.0 / len(card_list)
+        landings = []
+        for card in card_list:
+            target = card_target(card, square)
+            if target is None:
+                landings.append((self.jail_state, share))
+            elif target == square:
+                landings.append((self.state(square, streak), share))
+            else:
+                landings.extend([
+                    (state, share * probability) for state, probability
+                    in self._landings(target, streak)
+                ])
+        return landings
+
+    def _add_roll(self, source, square, streak, free_doubles=False):
+        """add the moves of one roll from square with streak doubles
+        already rolled; free_doubles for rolls that end the turn
+        """
+        for roll_sum, doubles, probability in self._outcomes:
+            new_streak = 0
+            if doubles and self.doubles_to_jail and not free_doubles:
+                new_streak = streak + 1
+                if new_streak == self.doubles_to_jail:
+                    self.chain.add(source, self.jail_state, probability)
+                    continue
+            target = (square + roll_sum) % NUM_SQUARES
+            for state, share in self._landings(target, new_streak):
+                self.chain.add(source, state, probability * share)
+
+    def _build(self):
+        self._outcomes = roll_outcomes(self.dice_roller)
+        for square in range(NUM_SQUARES):
+            for streak in range(self.streaks):
+                self._add_roll(self.state(square, streak), square, streak)
+        if not self.jail_turns:
+            self._add_roll(self.jail_state, JAIL, 0)
+            return
+        for turn in range(self.jail_turns):
+            source = self.jail_state + turn
+            for roll_sum, doubles, probability in self._outcomes:
+                if not doubles and turn + 1 < self.jail_turns:
+                    self.chain.add(source, source + 1, probability)
+                    continue
+                target = (JAIL + roll_sum) % NUM_SQUARES
+                for state, share in self._landings(target, 0):
+                    self.chain.add(source, state, probability * share)
+
+    def solve(self, start=None, tolerance=1e-12):
+        """stationary distribution over the states of the chain
+        """
+        return self.chain.solve(start=start, tolerance=tolerance)
+
+    def landing_probabilities(self):
+        """list with the long run share of rolls ending on each square,
+        JAIL counting both visits and turns in jail
+        """
+        if self.chain.stationary is None:
+            self.solve()
+        landings = [0.0] * NUM_SQUARES
+        for state, probability in enumerate(self.chain.stationary):
+            landings[self.square_of(state)] += probability
+        return landings
+
+    def jail_probability(self):
+        """long run share of rolls made from jail or ending in it
+        """
+        if self.chain.stationary is None:
+            self.solve()
+        return sum(self.chain.stationary[self.jail_state:])
+
+    def with_rules(self, **rules):
+        """new chain with some rules changed, solved starting from this
+        chain's solution when both have the same states
+        """
+        settings = {
+            'dice_roller': self.dice_roller, 'chance': self.chance,
+            'community_chest': self.community_chest,
+            'doubles_to_jail': self.doubles_to_jail,
+            'jail_turns': self.jail_turns
+        }
+        settings.update(rules)
+        chain = MonopolyChain(**settings)
+        chain.solve(start=self.chain.stationary)
+        return chain
@@ -0,0 +1,190 @@
+# module for a packed integer encoding of cards and a deck type that
+# stores the codes in a typed array rather than as Card objects
+# each card is packed into 16 bits as (rank << 8) | value, so rank and
+# value must both be between 0 and 255
+
+from array import array
+import random
+
+from cards import Card
+from cards import DeckOfCards
+from utils import list_type_check
+
+
+CODE_TYPECODE = 'H'
+FIELD_BITS = 8
+FIELD_MASK = (1 << FIELD_BITS) - 1
+
+
+def encode_card(card):
+    """Pack the rank and value of a card into a single integer code
+
+    Args:
+        card: a Card (or Tile, whose num_edges is not encoded)
+
+    Returns:
+        integer (rank << 8) | value
+    """
+    rank = card.rank
+    value = card.value
+    if not (0 <= rank <= FIELD_MASK and 0 <= value <= FIELD_MASK):
+        message_base = "Card rank and value must be between 0 and {}"
+        raise ValueError(message_base.format(FIELD_MASK))
+    return (rank << FIELD_BITS) | value
+
+
+def decode_card(code, card_class=Card):
+    """Build a card object of card_class from an integer code
+    """
+    return card_class(rank=code >> FIELD_BITS, value=code & FIELD_MASK)
+
+
+class PackedDeck(DeckOfCards):
+    """Deck that holds packed card codes in an array('H')
+
+    Keeps the DeckOfCards API; Card objects (of card_class, default
+    Card) are only built when a card is dealt or inspected. The codes
+    are stored bottom first so that top deals and adds are O(1) array
+    appends and pops, bottom deals and adds are O(n).
+
+    Additional methods work on the codes directly:
+    i. deal_code: deal a card code without building a Card
+    ii. add_code: add a card code
+    iii. to_codes: array('H') of the codes, top of the deck first
+    iv. from_codes: class method building a deck from codes, top first
+    """
+    def __init__(self, card_list=[], card_class=Card):
+        # the base attributes stay empty, the cards live in the codes
+        super(PackedDeck, self).__init__()
+        self.card_class = card_class
+        self._codes = array(CODE_TYPECODE)
+        if card_list:
+            type_check = list_type_check(card_list, Card, error=True)
+            self._codes.extend(
+                [encode_card(card) for card in reversed(card_list)]
+            )
+
+    @classmethod
+    def from_codes(cls, codes, card_class=Card):
+        """Build a PackedDeck from card codes listed top of the deck first
+        """
+        deck = cls(card_class=card_class)
+        deck._codes = array(CODE_TYPECODE, reversed(list(codes)))
+        return deck
+
+    def to_codes(self):
+        """array('H') of the card codes, top of the deck first
+        """
+        codes = array(CODE_TYPECODE, self._codes)
+        codes.reverse()
+        return codes
+
+    @property
+    def card_list(self):
+        """list of the cards in the deck, top of the deck first
+        """
+        card_class = self.card_class
+        return [
+            decode_card(code, card_class) for code in reversed(self._codes)
+        ]
+
+    @card_list.setter
+    def card_list(self, card_list):
+        type_check = list_type_check(card_list, Card, error=True)
+        self._codes = array(
+            CODE_TYPECODE, [encode_card(card) for card in reversed(card_list)]
+        )
+
+    @property
+    def cards_left(self):
+        """number of cards left in the deck
+        """
+        return len(self._codes)
+
+    def show_top(self):
+        """print the attributes of the first card as dict
+        """
+        return decode_card(self._codes[-1], self.card_class).to_dict()
+
+    def show_bottom(self):
+        """print the attributes of the last card as dict
+        """
+        return decode_card(self._codes[0], self.card_class).to_dict()
+
+    def shuffle(self, rng=None, lazy=False):
+        """reorder the card codes randomly, in place
+
+        rng is an optional random.Random instance to draw from in place
+        of the global random module; lazy is accepted for DeckOfCards
+        compatibility, shuffling the packed codes is cheap enough to do
+        at once
+        """
+        if rng is None:
+            rng = random
+        rng.shuffle(self._codes)
+
+    def deal_code(self, bottom_deal=False):
+        """deal a card code from the deck, default to 'top deal'
+        """
+        if not self._codes:
+            return None
+        elif bottom_deal:
+            return self._codes.pop(0)
+        else:
+            return self._codes.pop()
+
+    def deal_card(self, bottom_deal=False):
+        """deal a card from the deck, default to 'top deal'
+        """
+        code = self.deal_code(bottom_deal=bottom_deal)
+        if code is None:
+            return None
+        return decode_card(code, self.card_class)
+
+    def deal_many(self, num_cards, bottom_deal=False):
+        """deal up to num_cards cards from the deck as a list
+
+        cards are listed in the order repeated deal_card calls
+        would return them; fewer are returned when the deck runs out
+        """
+        num_cards = min(num_cards, len(self._codes))
+        if bottom_deal:
+            codes = self._codes[:num_cards]
+            del self._codes[:num_cards]
+        else:
+            codes = self._codes[len(self._codes) - num_cards:]
+            del self._codes[len(self._codes) - num_cards:]
+            codes.reverse()
+        card_class = self.card_class
+        return [decode_card(code, card_class) for code in codes]
+
+    def add_code(self, code, bottom_add=False):
+        """add a card code to the deck, default to 'top add'
+        """
+        if bottom_add:
+            self._codes.insert(0, code)
+        else:
+            self._codes.append(code)
+
+    def add_card(self, card_to_add, bottom_add=False):
+        """add a card object to the deck, default to 'top add'
+        """
+        if not isinstance(card_to_add, Card):
+            raise TypeError("Can only add Card objects to Deck")
+        self.add_code(encode_card(card_to_add), bottom_add=bottom_add)
+
+    def add_many(self, cards_to_add, bottom_add=False):
+        """add a sequence of card objects, same as repeated add_card calls
+        """
+        cards_to_add = list(cards_to_add)
+        type_check = list_type_check(cards_to_add, Card)
+        if not type_check:
+            raise TypeError("Can only add Card objects to Deck")
+        codes = array(
+            CODE_TYPECODE, [encode_card(card) for card in cards_to_add]
+        )
+        if bottom_add:
+            codes.reverse()
+            self._codes = codes + self._codes
+        else:
+            self._codes.extend(codes)
@@ -0,0 +1,213 @@
+# module for the PersistentVector class, an immutable list that shares
+# structure between versions
+# the items live in the leaves of a tree of tuples 32 wide plus a tail
+# tuple of up to 32 items; a changed version copies only the path from
+# the root to the leaf it touches, so it shares everything else with
+# the version it was made from
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+
+def _new_path(level, node):
+    """chain of single child nodes from level down to node
+    """
+    while level:
+        node = (node,)
+        level -= BITS
+    return node
+
+
+class PersistentVector(object):
+    """Immutable sequence with O(log32 n) versions that share structure
+
+    Reads work like a tuple (len, indexing, iteration); the methods
+    below return a new vector and leave this one as it was:
+    i. set: replace the item at an index
+    ii. append: add an item at the end
+    iii. pop: drop the last item
+    iv. extend: add a sequence of items at the end
+    """
+    __slots__ = ('_count', '_shift', '_root', '_tail')
+
+    def __init__(self, items=()):
+        items = list(items)
+        count = len(items)
+        tail_offset = ((count - 1) >> BITS) << BITS if count else 0
+        nodes = [
+            tuple(items[start:start + WIDTH])
+            for start in range(0, tail_offset, WIDTH)
+        ]
+        shift = BITS
+        while len(nodes) > WIDTH:
+            nodes = [
+                tuple(nodes[start:start + WIDTH])
+                for start in range(0, len(nodes), WIDTH)
+            ]
+            shift += BITS
+        self._count = count
+        self._shift = shift
+        self._root = tuple(nodes)
+        self._tail = tuple(items[tail_offset:])
+
+    @classmethod
+    def _make(cls, count, shift, root, tail):
+        vector = cls.__new__(cls)
+        vector._count = count
+        vector._shift = shift
+        vector._root = root
+        vector._tail = tail
+        return vector
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return 'PersistentVector({!r})'.format(list(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, PersistentVector):
+            return NotImplemented
+        return len(self) == len(other) and list(self) == list(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def _tail_offset(self):
+        return self._count - len(self._tail)
+
+    def _index(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("PersistentVector index out of range")
+        return index
+
+    def _leaf_for(self, index):
+        """the tuple holding item index, a tree leaf or the tail
+        """
+        if index >= self._tail_offset():
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level:
+            node = node[(index >> level) & MASK]
+            level -= BITS
+        return node
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        index = self._index(index)
+        return self._leaf_for(index)[index & MASK]
+
+    def __iter__(self):
+        for leaf in self._leaves(self._root, self._shift):
+            for item in leaf:
+                yield item
+        for item in self._tail:
+            yield item
+
+    def _leaves(self, node, level):
+        if level == BITS:
+            for leaf in node:
+                yield leaf
+        else:
+            for child in node:
+                for leaf in self._leaves(child, level - BITS):
+                    yield leaf
+
+    def set(self, index, item):
+        """new vector with item at index
+        """
+        index = self._index(index)
+        if index >= self._tail_offset():
+            position = index & MASK
+            tail = self._tail
+            return self._make(
+                self._count, self._shift, self._root,
+                tail[:position] + (item,) + tail[position + 1:]
+            )
+        return self._make(
+            self._count, self._shift,
+            self._set_in(self._shift, self._root, index, item), self._tail
+        )
+
+    def _set_in(self, level, node, index, item):
+        position = (index >> level) & MASK
+        if level:
+            item = self._set_in(level - BITS, node[position], index, item)
+        return node[:position] + (item,) + node[position + 1:]
+
+    def append(self, item):
+        """new vector with item added at the end
+        """
+        count = self._count
+        if len(self._tail) < WIDTH:
+            return self._make(
+                count + 1, self._shift, self._root, self._tail + (item,)
+            )
+        shift = self._shift
+        if (count >> BITS) > (1 << shift):
+            # the tree is full, grow a new root above it
+            root = (self._root, _new_path(shift, self._tail))
+            shift += BITS
+        else:
+            root = self._push_tail(shift, self._root, self._tail)
+        return self._make(count + 1, shift, root, (item,))
+
+    def _push_tail(self, level, node, tail):
+        position = ((self._count - 1) >> level) & MASK
+        if level == BITS:
+            child = tail
+        elif position < len(node):
+            child = self._push_tail(level - BITS, node[position], tail)
+        else:
+            child = _new_path(level - BITS, tail)
+        return node[:position] + (child,) + node[position + 1:]
+
+    def extend(self, items):
+        """new vector with items added at the end
+        """
+        vector = self
+        for item in items:
+            vector = vector.append(item)
+        return vector
+
+    def pop(self):
+        """new vector without the last item
+        """
+        count = self._count
+        if not count:
+            raise IndexError("pop from empty PersistentVector")
+        if count == 1:
+            return PersistentVector()
+        if len(self._tail) > 1:
+            return self._make(
+                count - 1, self._shift, self._root, self._tail[:-1]
+            )
+        tail = self._leaf_for(count - 2)
+        shift = self._shift
+        root = self._pop_tail(shift, self._root)
+        if root is None:
+            root = ()
+        if shift > BITS and len(root) == 1:
+            root = root[0]
+            shift -= BITS
+        return self._make(count - 1, shift, root, tail)
+
+    def _pop_tail(self, level, node):
+        position = ((self._count - 2) >> level) & MASK
+        if level > BITS:
+            child = self._pop_tail(level - BITS, node[position])
+            if child is not None:
+                return node[:position] + (child,)
+        if position == 0:
+            return None
+        return node[:position]
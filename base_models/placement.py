@@ -0,0 +1,175 @@
+# module for finding where EdgeTiles can legally be laid on a Board
+# every open space next to a placed tile (the frontier) needs certain
+# labels on certain sides; the index keeps each frontier space under the
+# rotation_key of what it needs, so the spaces a tile fits come from a
+# few dict lookups per tile rather than a check of every space and
+# rotation, and the index follows the board as tiles are placed
+
+from tiles import Tile
+from tiles import rotation_key
+
+
+def _fits(edges, needed, rotation):
+    """True if edges turned by rotation match every label in needed
+    """
+    num_edges = len(edges)
+    for side, label in enumerate(needed):
+        if label is not None and edges[(side - rotation) % num_edges] != label:
+            return False
+    return True
+
+
+class PlacementIndex(object):
+    """Frontier spaces of a Board keyed by the edge labels they need
+
+    grid is the GridIndex the board spaces are laid out on; a space is
+    open while it holds no Tile and on the frontier while it is open
+    and next to a Tile. A frontier space needs, on each side facing a
+    tile, the label that tile shows on the side facing back, or None
+    facing an open space or a tile without edge labels. Attaches to the
+    board and follows changes made through Board.set_space, place_tile
+    and remove_tile; call reset after changing board.spaces directly.
+
+    i. placements: (space, rotation) pairs where a tile may be laid
+    ii. placements_for_hand: the same for each tile of a hand
+    iii. frontier: the frontier spaces and the labels they need
+    iv. close: stop following the board
+    """
+    def __init__(self, board, grid):
+        if len(grid) != len(board.spaces):
+            raise ValueError(
+                "Grid has {} cells for {} spaces".format(
+                    len(grid), len(board.spaces)
+                )
+            )
+        self.board = board
+        self.grid = grid
+        self.reset(board)
+        board._attach(self)
+
+    def reset(self, board):
+        """rebuild the index from every space of the board
+        """
+        self.frontier = {}
+        self._spaces = {}
+        self._mask_counts = {}
+        self._lookup_keys = {}
+        for index in range(len(board.spaces)):
+            self._refresh(index)
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def board_changed(self, board, event):
+        """update the spaces around a space that changed
+        """
+        if event[0] != 'space':
+            return
+        index, old_content, new_content = event[1:]
+        if not (isinstance(old_content, Tile) or
+                isinstance(new_content, Tile)):
+            return
+        self._refresh(index)
+        for neighbor in self.grid.neighbors_of(index):
+            if neighbor != -1:
+                self._refresh(neighbor)
+
+    def _needed(self, index):
+        """labels needed on each side of open space index, or None if
+        no side faces a tile
+        """
+        grid = self.grid
+        spaces = self.board.spaces
+        num_sides = grid.num_sides
+        needed = []
+        facing_tile = False
+        for side, neighbor in enumerate(grid.neighbors_of(index)):
+            label = None
+            if neighbor != -1 and isinstance(spaces[neighbor], Tile):
+                facing_tile = True
+                edges = getattr(spaces[neighbor], 'edges', None)
+                if edges is not None:
+                    label = edges[(side + num_sides // 2) % num_sides]
+            needed.append(label)
+        if not facing_tile:
+            return None
+        return tuple(needed)
+
+    def _refresh(self, index):
+        """take space index out of the index and put it back if it is
+        on the frontier
+        """
+        old_needed = self.frontier.pop(index, None)
+        if old_needed is not None:
+            key, mask = self._keys(old_needed)
+            positions = self._spaces[key]
+            positions.discard(index)
+            if not positions:
+                del self._spaces[key]
+            self._mask_counts[mask] -= 1
+            if not self._mask_counts[mask]:
+                del self._mask_counts[mask]
+                self._lookup_keys = {}
+        if isinstance(self.board.spaces[index], Tile):
+            return
+        needed = self._needed(index)
+        if needed is None:
+            return
+        self.frontier[index] = needed
+        key, mask = self._keys(needed)
+        self._spaces.setdefault(key, set()).add(index)
+        if mask not in self._mask_counts:
+            self._mask_counts[mask] = 0
+            self._lookup_keys = {}
+        self._mask_counts[mask] += 1
+
+    @staticmethod
+    def _keys(needed):
+        """rotation keys of the labels needed and of which sides need one
+        """
+        mask = tuple([label is not None for label in needed])
+        return rotation_key(needed)[0], rotation_key(mask)[0]
+
+    def _tile_keys(self, edges):
+        """rotation keys of edges with the sides of each frontier mask
+        blanked, cached until the set of masks changes
+        """
+        keys = self._lookup_keys.get(edges)
+        if keys is None:
+            keys = set()
+            num_edges = len(edges)
+            for mask in self._mask_counts:
+                if len(mask) != num_edges:
+                    continue
+                for shift in range(num_edges):
+                    keys.add(rotation_key([
+                        label if mask[(side + shift) % num_edges] else None
+                        for side, label in enumerate(edges)
+                    ])[0])
+            self._lookup_keys[edges] = keys
+        return keys
+
+    def placements(self, tile):
+        """sorted (space, rotation) pairs where tile fits the frontier,
+        rotation being the steps to turn it by, as for EdgeTile.rotated
+        """
+        edges = tuple(tile.edges)
+        found = []
+        for key in self._tile_keys(edges):
+            for index in self._spaces.get(key, ()):
+                needed = self.frontier[index]
+                for rotation in range(len(edges)):
+                    if _fits(edges, needed, rotation):
+                        found.append((index, rotation))
+        found.sort()
+        return found
+
+    def placements_for_hand(self, hand):
+        """list of placements for each tile in hand
+        """
+        return [self.placements(tile) for tile in hand]
+
+    def close(self):
+        """detach from the board and stop following it
+        """
+        self.board._detach(self)
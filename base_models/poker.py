@@ -0,0 +1,233 @@
+# module for a 5, 6 and 7 card poker hand evaluator
+# cards follow the registry convention (rank is the suit 1 to 4, value is
+# the face 2 to 14 with ace high) and may be given as Card objects or as
+# packed_deck integer codes
+# evaluation is table driven: the face multiset of a hand is perfectly
+# hashed by summing a power of five per face (no face appears more than
+# four times), and a second table maps the 13-bit face mask of a flush
+# suit to its best flush or straight flush; both are built on first use
+
+from array import array
+
+from cards import Card
+from packed_deck import FIELD_BITS
+from packed_deck import encode_card
+
+
+HAND_CATEGORIES = (
+    'high card', 'pair', 'two pair', 'three of a kind', 'straight',
+    'flush', 'full house', 'four of a kind', 'straight flush'
+)
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT = 0, 1, 2, 3, 4
+FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = 5, 6, 7, 8
+
+NUM_FACES = 13
+NUM_SUITS = 4
+CATEGORY_SHIFT = 20
+MAX_CODE = (NUM_SUITS << FIELD_BITS) | (NUM_FACES + 1)
+WHEEL_MASK = (1 << 12) | 0xF
+
+# per code tables, filled for valid codes only; see _build_tables
+RANK_KEY = [0] * (MAX_CODE + 1)
+SUIT_COUNT = [0] * (MAX_CODE + 1)
+SUIT_INDEX = [-1] * (MAX_CODE + 1)
+FACE_BIT = [0] * (MAX_CODE + 1)
+for _suit in range(NUM_SUITS):
+    for _face in range(NUM_FACES):
+        _code = ((_suit + 1) << FIELD_BITS) | (_face + 2)
+        RANK_KEY[_code] = 5 ** _face
+        SUIT_COUNT[_code] = 1 << (4 * _suit)
+        SUIT_INDEX[_code] = _suit
+        FACE_BIT[_code] = 1 << _face
+
+# adding three to each four bit suit count sets its top bit at five cards
+FLUSH_CHECK_ADD = 0x3333
+FLUSH_CHECK_MASK = 0x8888
+
+_rank_table = None
+_flush_table = None
+
+
+def _hand_value(category, faces):
+    """pack a category and up to five face indexes, highest first
+    """
+    value = category
+    for i in range(5):
+        value <<= 4
+        if i < len(faces):
+            value |= faces[i]
+    return value
+
+
+def _straight_top(mask):
+    """face index of the top card of the best straight in mask, or -1
+    """
+    for top in range(NUM_FACES - 1, 3, -1):
+        straight = 0x1F << (top - 4)
+        if mask & straight == straight:
+            return top
+    if mask & WHEEL_MASK == WHEEL_MASK:
+        return 3
+    return -1
+
+
+def _best_without_flush(counts):
+    """value of the best five cards for a list of 13 face counts
+    """
+    faces_by_count = [[], [], [], [], []]
+    mask = 0
+    for face in range(NUM_FACES - 1, -1, -1):
+        if counts[face]:
+            faces_by_count[counts[face]].append(face)
+            mask |= 1 << face
+    quads, trips = faces_by_count[4], faces_by_count[3]
+    pairs = faces_by_count[2]
+    present = [face for face in range(NUM_FACES - 1, -1, -1) if counts[face]]
+
+    if quads:
+        kickers = [face for face in present if face != quads[0]]
+        return _hand_value(QUADS, [quads[0]] + kickers[:1])
+    if trips and (len(trips) > 1 or pairs):
+        pair_faces = sorted(trips[1:] + pairs, reverse=True)
+        return _hand_value(FULL_HOUSE, [trips[0], pair_faces[0]])
+    top = _straight_top(mask)
+    if top >= 0:
+        return _hand_value(STRAIGHT, [top])
+    if trips:
+        kickers = [face for face in present if face != trips[0]]
+        return _hand_value(TRIPS, [trips[0]] + kickers[:2])
+    if len(pairs) > 1:
+        kickers = [face for face in present if face not in pairs[:2]]
+        return _hand_value(TWO_PAIR, pairs[:2] + kickers[:1])
+    if pairs:
+        kickers = [face for face in present if face != pairs[0]]
+        return _hand_value(PAIR, [pairs[0]] + kickers[:3])
+    return _hand_value(HIGH_CARD, present[:5])
+
+
+def _best_flush(mask):
+    """value of the best flush or straight flush among the faces in mask
+    """
+    top = _straight_top(mask)
+    if top >= 0:
+        return _hand_value(STRAIGHT_FLUSH, [top])
+    faces = [face for face in range(NUM_FACES - 1, -1, -1) if mask >> face & 1]
+    return _hand_value(FLUSH, faces[:5])
+
+
+def _face_multisets(num_cards, face=0):
+    """generate every list of 13 face counts (at most four each)
+    that adds up to num_cards
+    """
+    if face == NUM_FACES - 1:
+        if num_cards <= 4:
+            yield [num_cards]
+        return
+    for count in range(min(num_cards, 4) + 1):
+        for rest in _face_multisets(num_cards - count, face + 1):
+            yield [count] + rest
+
+
+def _build_tables():
+    """fill the face multiset and flush tables
+    """
+    global _rank_table, _flush_table
+    rank_table = {}
+    for num_cards in (5, 6, 7):
+        for counts in _face_multisets(num_cards):
+            key = sum([count * 5 ** face for face, count in enumerate(counts)])
+            rank_table[key] = _best_without_flush(counts)
+    flush_table = [0] * (1 << NUM_FACES)
+    for mask in range(1 << NUM_FACES):
+        if bin(mask).count('1') >= 5:
+            flush_table[mask] = _best_flush(mask)
+    _rank_table = rank_table
+    _flush_table = flush_table
+
+
+def evaluate_codes(codes):
+    """Value of the best poker hand in 5 to 7 valid card codes
+
+    The fast path: codes are not checked. Higher values are better
+    hands and equal values tie; see hand_category
+    """
+    if _rank_table is None:
+        _build_tables()
+    key = 0
+    suits = 0
+    for code in codes:
+        key += RANK_KEY[code]
+        suits += SUIT_COUNT[code]
+    value = _rank_table[key]
+    flush_bits = (suits + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK
+    if flush_bits:
+        flush_suit = (flush_bits.bit_length() - 1) // 4
+        mask = 0
+        for code in codes:
+            if SUIT_INDEX[code] == flush_suit:
+                mask |= FACE_BIT[code]
+        flush_value = _flush_table[mask]
+        if flush_value > value:
+            value = flush_value
+    return value
+
+
+def card_codes(cards):
+    """list of valid card codes for a mix of Card objects and codes
+    """
+    codes = []
+    for card in cards:
+        if isinstance(card, Card):
+            card = encode_card(card)
+        if not (0 <= card <= MAX_CODE and SUIT_INDEX[card] >= 0):
+            raise ValueError("Expect standard cards, see registry.py")
+        codes.append(card)
+    return codes
+
+
+def evaluate(cards):
+    """Value of the best poker hand among 5 to 7 cards
+
+    Args:
+        cards: Card objects or packed card codes following the standard
+            card convention of registry.py
+
+    Returns:
+        integer, higher is better and equal values tie
+    """
+    codes = card_codes(cards)
+    if not 5 <= len(codes) <= 7:
+        raise ValueError("Expect between five and seven cards")
+    if len(set(codes)) != len(codes):
+        raise ValueError("Expect no repeated cards in a hand")
+    return evaluate_codes(codes)
+
+
+def evaluate_many(hands, hand_size=None):
+    """Evaluate a batch of hands into an array('L') of values
+
+    Args:
+        hands: sequence of hands of card codes, or with hand_size a flat
+            sequence of codes (e.g. an array('H') or numpy array) holding
+            one hand after another
+        hand_size: number of cards per hand in a flat sequence
+    """
+    if hand_size is not None:
+        hands = [hands[i:i + hand_size]
+                 for i in range(0, len(hands), hand_size)]
+    if _rank_table is None:
+        _build_tables()
+    return array('L', [evaluate_codes([int(code) for code in hand])
+                       for hand in hands])
+
+
+def hand_category(value):
+    """category index (see HAND_CATEGORIES) of an evaluated hand value
+    """
+    return value >> CATEGORY_SHIFT
+
+
+def hand_name(value):
+    """name of the category of an evaluated hand value
+    """
+    return HAND_CATEGORIES[hand_category(value)]
@@ -0,0 +1,106 @@
+# module for CardRegistry, which interns immutable cards and tiles so that
+# every deck built from a registry holds references to one shared object
+# per distinct card rather than allocating fresh Card objects per table
+# the standard 52 card set uses rank for the suit (1 to 4, in the order of
+# SUIT_NAMES) and value for the face (2 to 14, ace high)
+
+from cards import Card
+from cards import DeckOfCards
+from cards import FrozenCard
+from tiles import FrozenTile
+from tiles import Tile
+
+
+SUIT_NAMES = ('clubs', 'diamonds', 'hearts', 'spades')
+SUITS = (1, 2, 3, 4)
+FACES = tuple(range(2, 15))
+
+
+class CardRegistry(object):
+    """Interns FrozenCard and FrozenTile objects by their attributes
+
+    Asking twice for the same (rank, value), or (num_edges, rank, value)
+    for tiles, returns the same object, so cards from one registry can
+    be compared and hashed by identity and a deck only holds references.
+
+    Description of methods:
+    i. card: the shared FrozenCard for rank and value
+    ii. tile: the shared FrozenTile for num_edges, rank and value
+    iii. intern: the shared frozen equivalent of any Card or Tile
+    iv. deck: DeckOfCards of shared cards for a list of (rank, value)
+    v. standard_deck: DeckOfCards of the 52 shared standard cards
+    """
+    def __init__(self):
+        self._cards = {}
+        self._tiles = {}
+
+    def __len__(self):
+        return len(self._cards) + len(self._tiles)
+
+    def card(self, rank=0, value=0):
+        """the shared FrozenCard for rank and value
+        """
+        key = (rank, value)
+        card = self._cards.get(key)
+        if card is None:
+            card = FrozenCard(rank=rank, value=value)
+            self._cards[key] = card
+        return card
+
+    def tile(self, num_edges=4, rank=0, value=0):
+        """the shared FrozenTile for num_edges, rank and value
+        """
+        key = (num_edges, rank, value)
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = FrozenTile(num_edges=num_edges, rank=rank, value=value)
+            self._tiles[key] = tile
+        return tile
+
+    def intern(self, card):
+        """the shared frozen equivalent of a Card or Tile object
+        """
+        if isinstance(card, Tile):
+            return self.tile(card.num_edges, card.rank, card.value)
+        if isinstance(card, Card):
+            return self.card(card.rank, card.value)
+        raise TypeError("Can only intern Card or Tile objects")
+
+    def deck(self, card_keys):
+        """DeckOfCards of shared cards, one per (rank, value) in card_keys
+        """
+        card_for = self.card
+        return DeckOfCards(
+            [card_for(rank, value) for rank, value in card_keys]
+        )
+
+    def standard_deck(self):
+        """DeckOfCards of the 52 standard cards, suits in SUITS order
+        and faces from 2 to 14 within each suit
+        """
+        return self.deck([(suit, face) for suit in SUITS for face in FACES])
+
+
+default_registry = CardRegistry()
+
+
+def standard_deck():
+    """DeckOfCards of the 52 standard cards from the default registry
+    """
+    return default_registry.standard_deck()
+
+
+def intern_card(rank=0, value=0):
+    """the FrozenCard for rank and value from the default registry
+
+    frozen cards unpickle through here, so a copy sent to another
+    process is the shared card of that process
+    """
+    return default_registry.card(rank, value)
+
+
+def intern_tile(num_edges=4, rank=0, value=0):
+    """the FrozenTile for num_edges, rank and value from the default
+    registry, as for intern_card
+    """
+    return default_registry.tile(num_edges, rank, value)
@@ -0,0 +1,477 @@
+# module for a compact versioned binary format for Board, DeckOfCards and
+# DiceRoller state
+# a blob is a fixed header, a directory of sections and the sections
+# themselves: packed integer arrays for spaces, reserve tiles, deck
+# orders, dice and tokens, the score, and a pickled list of any values
+# too unusual to pack. BoardView reads single values straight from the
+# blob, so decoding only builds the objects that are asked for
+from array import array
+import pickle
+import struct
+import sys
+
+from board import Board
+from cards import Card
+from cards import CompactCard
+from cards import DeckOfCards
+from cards import FrozenCard
+from dice import DiceRoller
+from packed_deck import PackedDeck
+from packed_deck import decode_card
+from packed_deck import encode_card
+from shoe import Shoe
+from tiles import CompactTile
+from tiles import Tile
+
+MAGIC = b'BGST'
+VERSION = 1
+KIND_BOARD = 0
+KIND_DECK = 1
+KIND_DICE = 2
+# sections in directory order
+SPACES, TILES, DECKS, DICE, TOKENS, SCORE, EXTRAS = range(7)
+NUM_SECTIONS = 7
+
+HEADER = struct.Struct('<4sBBH')
+ENTRY = struct.Struct('<II')
+REF = struct.Struct('<I')
+DECK_ENTRY = struct.Struct('<III')
+ROLLER_ENTRY = struct.Struct('<HHII')
+REF_TYPECODE = 'I'
+CODE_TYPECODE = 'H'
+
+# a packed reference is (payload << 3) | tag
+TAG_BITS = 3
+TAG_MASK = (1 << TAG_BITS) - 1
+TAG_INT, TAG_NONE, TAG_TILE, TAG_CARD, TAG_EXTRA, TAG_BOOL = range(6)
+MAX_PAYLOAD = (1 << (32 - TAG_BITS)) - 1
+
+DECK_PLAIN, DECK_PACKED, DECK_SHOE, DECK_EXTRA = range(4)
+CARD_TYPES = (Card, CompactCard, FrozenCard)
+TILE_TYPES = (Tile, CompactTile)
+
+LITTLE_ENDIAN = sys.byteorder == 'little'
+HAS_CAST = hasattr(memoryview, 'cast')
+
+
+def _to_bytes(values):
+    if not LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    if hasattr(values, 'tobytes'):
+        return values.tobytes()
+    return values.tostring()
+
+
+def _typed(buf, offset, count, typecode):
+    """count integers of typecode at offset in buf
+
+    a memoryview over buf where the platform allows, else an array copy
+    """
+    size = count * array(typecode).itemsize
+    chunk = buf[offset:offset + size]
+    if HAS_CAST and LITTLE_ENDIAN:
+        return chunk.cast(typecode)
+    values = array(typecode)
+    if hasattr(values, 'frombytes'):
+        values.frombytes(chunk.tobytes())
+    else:
+        values.fromstring(chunk.tobytes())
+    if not LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def _padded(data):
+    return data + b'\0' * (-len(data) % 4)
+
+
+def pack_value(obj):
+    """32-bit packed reference for a small int, None, bool, Card or Tile
+
+    returns None for values that do not pack
+    """
+    obj_type = type(obj)
+    if obj_type is int and 0 <= obj <= MAX_PAYLOAD:
+        return obj << TAG_BITS
+    if obj is None:
+        return TAG_NONE
+    if obj_type is bool:
+        return (int(obj) << TAG_BITS) | TAG_BOOL
+    if obj_type in TILE_TYPES:
+        if (obj.num_edges | obj.rank | obj.value) >> 8 == 0:
+            return ((obj.num_edges << 16 | obj.rank << 8 | obj.value)
+                    << TAG_BITS) | TAG_TILE
+    elif obj_type in CARD_TYPES:
+        if (obj.rank | obj.value) >> 8 == 0:
+            return ((obj.rank << 8 | obj.value) << TAG_BITS) | TAG_CARD
+    return None
+
+
+def unpack_value(ref, card_class=Card, tile_class=Tile, extras=()):
+    """value for a packed reference, the inverse of pack_value
+
+    references to pickled values index into extras
+    """
+    tag = ref & TAG_MASK
+    payload = int(ref >> TAG_BITS)
+    if tag == TAG_INT:
+        return payload
+    if tag == TAG_NONE:
+        return None
+    if tag == TAG_CARD:
+        return card_class(rank=payload >> 8, value=payload & 255)
+    if tag == TAG_TILE:
+        return tile_class(
+            num_edges=payload >> 16, rank=(payload >> 8) & 255,
+            value=payload & 255
+        )
+    if tag == TAG_BOOL:
+        return bool(payload)
+    return extras[payload]
+
+
+class _Encoder(object):
+    """Builds the sections of one blob, collecting unusual values
+    """
+    def __init__(self):
+        self.sections = [b''] * NUM_SECTIONS
+        self.extras = []
+
+    def ref(self, obj):
+        """packed reference for any value
+        """
+        ref = pack_value(obj)
+        if ref is None:
+            return (self.extra(obj) << TAG_BITS) | TAG_EXTRA
+        return ref
+
+    def extra(self, obj):
+        """index of obj in the pickled extras
+        """
+        self.extras.append(obj)
+        return len(self.extras) - 1
+
+    def refs(self, objects):
+        ref = self.ref
+        return _to_bytes(array(REF_TYPECODE, [ref(obj) for obj in objects]))
+
+    def deck_codes(self, deck):
+        """kind and array of card codes, top first, for one deck
+        """
+        if type(deck) is PackedDeck:
+            return DECK_PACKED, deck.to_codes()
+        if type(deck) not in (DeckOfCards, Shoe):
+            return DECK_EXTRA, array(CODE_TYPECODE, [self.extra(deck)])
+        card_list = deck.card_list
+        if set(map(type, card_list)).difference(CARD_TYPES):
+            return DECK_EXTRA, array(CODE_TYPECODE, [self.extra(deck)])
+        try:
+            codes = array(CODE_TYPECODE, map(encode_card, card_list))
+        except ValueError:
+            # a rank or value outside the packed card fields
+            return DECK_EXTRA, array(CODE_TYPECODE, [self.extra(deck)])
+        kind = DECK_SHOE if type(deck) is Shoe else DECK_PLAIN
+        return kind, codes
+
+    def decks(self, decks):
+        entries = []
+        codes = []
+        offset = 4 + DECK_ENTRY.size * len(decks)
+        for deck in decks:
+            kind, deck_codes = self.deck_codes(deck)
+            entries.append(DECK_ENTRY.pack(kind, offset, len(deck_codes)))
+            deck_bytes = _padded(_to_bytes(deck_codes))
+            codes.append(deck_bytes)
+            offset += len(deck_bytes)
+        self.sections[DECKS] = b''.join(
+            [REF.pack(len(decks))] + entries + codes
+        )
+
+    def dice(self, dice_rollers):
+        entries = []
+        faces = []
+        offset = 4 + ROLLER_ENTRY.size * len(dice_rollers)
+        for roller in dice_rollers:
+            roller_faces = _padded(_to_bytes(array(
+                CODE_TYPECODE, [die.face_value for die in roller.dice]
+            )))
+            entries.append(ROLLER_ENTRY.pack(
+                roller.num_sides, len(roller.dice), roller.roll_value, offset
+            ))
+            faces.append(roller_faces)
+            offset += len(roller_faces)
+        self.sections[DICE] = b''.join(
+            [REF.pack(len(dice_rollers))] + entries + faces
+        )
+
+    def finish(self, kind):
+        """the complete blob
+        """
+        if self.extras:
+            self.sections[EXTRAS] = pickle.dumps(self.extras, 2)
+        sections = [_padded(section) for section in self.sections]
+        offset = HEADER.size + ENTRY.size * NUM_SECTIONS
+        directory = []
+        for index, section in enumerate(sections):
+            directory.append(ENTRY.pack(offset, len(self.sections[index])))
+            offset += len(section)
+        return b''.join(
+            [HEADER.pack(MAGIC, VERSION, kind, NUM_SECTIONS)] +
+            directory + sections
+        )
+
+
+def encode_board(board):
+    """bytes holding the state of a Board
+
+    Cards in decks and spaces decode as Card objects and tiles as Tile
+    objects; other values, and cards or tiles of other classes, are
+    kept through pickle. Dice rollers keep their faces, not an rng.
+    """
+    encoder = _Encoder()
+    sections = encoder.sections
+    sections[SPACES] = encoder.refs(board.spaces)
+    sections[TILES] = encoder.refs(board.tiles)
+    encoder.decks(board.decks)
+    encoder.dice(board.dice_rollers)
+    sections[TOKENS] = encoder.refs(board.tokens)
+    sections[SCORE] = REF.pack(encoder.ref(board.score))
+    return encoder.finish(KIND_BOARD)
+
+
+def encode_deck(deck):
+    """bytes holding the cards of a DeckOfCards, PackedDeck or Shoe
+    """
+    encoder = _Encoder()
+    encoder.decks([deck])
+    return encoder.finish(KIND_DECK)
+
+
+def encode_dice(dice_roller):
+    """bytes holding the dice and last roll of a DiceRoller
+    """
+    encoder = _Encoder()
+    encoder.dice([dice_roller])
+    return encoder.finish(KIND_DICE)
+
+
+class BoardView(object):
+    """Read only view of a blob made by encode_board, encode_deck or
+    encode_dice
+
+    Nothing is decoded up front; the methods read the values they need
+    from the blob, which is not copied when it is bytes, bytearray or a
+    memoryview:
+    i. space, spaces, tiles, tokens and score decode those values
+    ii. deck_codes gives a deck's card codes, top first, without making
+        Card objects; deck makes the deck
+    iii. dice_faces gives a roller's faces; dice_roller makes the roller
+    iv. to_board, to_deck and to_dice decode everything
+    """
+    def __init__(self, data, card_class=Card, tile_class=Tile):
+        buf = memoryview(data)
+        if len(buf) < HEADER.size:
+            raise ValueError("Data too short for a serialized board")
+        magic, version, kind, num_sections = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Data is not a serialized board")
+        if version > VERSION:
+            raise ValueError(
+                "Serialized board version {} is newer than {}".format(
+                    version, VERSION
+                )
+            )
+        self._buf = buf
+        self.kind = kind
+        self.version = version
+        self.card_class = card_class
+        self.tile_class = tile_class
+        self._sections = [
+            ENTRY.unpack_from(buf, HEADER.size + ENTRY.size * index)
+            for index in range(num_sections)
+        ]
+        self._extras = None
+        self._extras_data = None
+
+    def copy_extras(self):
+        """copy the pickled values out of the blob, so that they are
+        unpickled from the copy rather than from a blob that may change
+        """
+        offset, length = self._sections[EXTRAS]
+        self._extras_data = self._buf[offset:offset + length].tobytes()
+
+    @property
+    def extras(self):
+        """the pickled values, unpickled on first use
+        """
+        if self._extras is None:
+            data = self._extras_data
+            if data is None:
+                offset, length = self._sections[EXTRAS]
+                data = self._buf[offset:offset + length].tobytes()
+            self._extras = []
+            if data:
+                self._extras = pickle.loads(data)
+        return self._extras
+
+    def _decode(self, ref):
+        if ref & TAG_MASK == TAG_EXTRA:
+            return self.extras[ref >> TAG_BITS]
+        return unpack_value(ref, self.card_class, self.tile_class)
+
+    def _refs(self, section):
+        offset, length = self._sections[section]
+        return _typed(self._buf, offset, length // REF.size, REF_TYPECODE)
+
+    def _decode_refs(self, section):
+        decode = self._decode
+        return [decode(ref) for ref in self._refs(section)]
+
+    @property
+    def num_spaces(self):
+        return self._sections[SPACES][1] // REF.size
+
+    def space(self, index):
+        """decode spaces[index] alone
+        """
+        if not 0 <= index < self.num_spaces:
+            raise IndexError("Space index out of range")
+        offset = self._sections[SPACES][0] + index * REF.size
+        return self._decode(REF.unpack_from(self._buf, offset)[0])
+
+    @property
+    def spaces(self):
+        return self._decode_refs(SPACES)
+
+    @property
+    def tiles(self):
+        return self._decode_refs(TILES)
+
+    @property
+    def tokens(self):
+        return self._decode_refs(TOKENS)
+
+    @property
+    def score(self):
+        offset, length = self._sections[SCORE]
+        if not length:
+            return None
+        return self._decode(REF.unpack_from(self._buf, offset)[0])
+
+    def _count(self, section):
+        offset, length = self._sections[section]
+        if not length:
+            return 0
+        return REF.unpack_from(self._buf, offset)[0]
+
+    @property
+    def num_decks(self):
+        return self._count(DECKS)
+
+    def _deck_entry(self, index):
+        if not 0 <= index < self.num_decks:
+            raise IndexError("Deck index out of range")
+        start = self._sections[DECKS][0]
+        kind, offset, count = DECK_ENTRY.unpack_from(
+            self._buf, start + 4 + index * DECK_ENTRY.size
+        )
+        return kind, _typed(self._buf, start + offset, count, CODE_TYPECODE)
+
+    def deck_codes(self, index=0):
+        """card codes of deck index, top first, as (rank << 8) | value
+        """
+        kind, codes = self._deck_entry(index)
+        if kind == DECK_EXTRA:
+            return array(REF_TYPECODE, [
+                card.rank << 8 | card.value
+                for card in self.extras[codes[0]].card_list
+            ])
+        return codes
+
+    def deck(self, index=0):
+        """decode deck index into a new deck object
+        """
+        kind, codes = self._deck_entry(index)
+        if kind == DECK_EXTRA:
+            return self.extras[codes[0]]
+        card_class = self.card_class
+        if kind == DECK_PACKED:
+            return PackedDeck.from_codes(codes, card_class=card_class)
+        card_list = [decode_card(code, card_class) for code in codes]
+        if kind == DECK_SHOE:
+            deck = Shoe()
+            deck.card_list = card_list
+            return deck
+        return DeckOfCards(card_list=card_list)
+
+    @property
+    def num_dice_rollers(self):
+        return self._count(DICE)
+
+    def _roller_entry(self, index):
+        if not 0 <= index < self.num_dice_rollers:
+            raise IndexError("Dice roller index out of range")
+        start = self._sections[DICE][0]
+        return start, ROLLER_ENTRY.unpack_from(
+            self._buf, start + 4 + index * ROLLER_ENTRY.size
+        )
+
+    def dice_faces(self, index=0):
+        """face values of the dice in roller index
+        """
+        start, (num_sides, num_dice, roll_value, offset) = (
+            self._roller_entry(index)
+        )
+        return _typed(self._buf, start + offset, num_dice, CODE_TYPECODE)
+
+    def dice_roller(self, index=0):
+        """decode roller index into a new DiceRoller
+        """
+        num_sides, num_dice, roll_value, offset = (
+            self._roller_entry(index)[1]
+        )
+        roller = DiceRoller(num_sides=num_sides, num_dice=num_dice)
+        for die, face_value in zip(roller.dice, self.dice_faces(index)):
+            die.face_value = face_value
+        roller.roll_value = roll_value
+        return roller
+
+    def to_board(self):
+        """decode everything into a new Board
+        """
+        return Board(
+            spaces=self.spaces,
+            tiles=self.tiles,
+            decks=[self.deck(index) for index in range(self.num_decks)],
+            tokens=self.tokens,
+            dice_rollers=[
+                self.dice_roller(index)
+                for index in range(self.num_dice_rollers)
+            ],
+            score=self.score
+        )
+
+    def to_deck(self):
+        return self.deck(0)
+
+    def to_dice(self):
+        return self.dice_roller(0)
+
+
+def decode_board(data, card_class=Card, tile_class=Tile):
+    """new Board from the bytes made by encode_board
+    """
+    return BoardView(data, card_class, tile_class).to_board()
+
+
+def decode_deck(data, card_class=Card):
+    """new deck from the bytes made by encode_deck
+    """
+    return BoardView(data, card_class).to_deck()
+
+
+def decode_dice(data):
+    """new DiceRoller from the bytes made by encode_dice
+    """
+    return BoardView(data).to_dice()
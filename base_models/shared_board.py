@@ -0,0 +1,199 @@
+# module for publishing Board state to worker processes through shared
+# memory
+# the parent encodes the board in the serialization.py format (typed
+# arrays of space references, deck card codes and dice faces) into one
+# multiprocessing.shared_memory block guarded by a sequence counter;
+# workers attach by name and read the arrays in place with BoardView,
+# so no board is pickled per task
+import struct
+import time
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+from serialization import BoardView
+from serialization import decode_board
+from serialization import encode_board
+
+MAGIC = b'BGSM'
+# magic, capacity, sequence counter and length of the published blob
+HEADER = struct.Struct('<4sIQQ')
+SEQUENCE_OFFSET = 8
+LENGTH_OFFSET = 16
+COUNTER = struct.Struct('<Q')
+
+
+def _require_shared_memory():
+    if shared_memory is None:
+        raise RuntimeError(
+            "Shared boards need multiprocessing.shared_memory"
+        )
+
+
+def attach_store(name):
+    """Attach read only to a SharedBoardStore made in another process
+    """
+    _require_shared_memory()
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+    store = SharedBoardStore.__new__(SharedBoardStore)
+    store._shm = shm
+    store._owner = False
+    magic, capacity, sequence, length = HEADER.unpack_from(shm.buf, 0)
+    if magic != MAGIC:
+        shm.close()
+        raise ValueError("Shared memory {} holds no board".format(name))
+    store.capacity = capacity
+    store._buf = shm.buf.toreadonly()
+    return store
+
+
+class SharedBoardStore(object):
+    """Board state in a shared memory block for many reader processes
+
+    The process that makes the store publishes boards into it; other
+    processes attach with attach_store(store.name), or by receiving the
+    pickled store, and get a read only view of the same memory.
+
+    Publishing is guarded by a sequence lock: the counter is odd while
+    a board is being written and each publish adds two, so version is
+    the number of boards published.
+    i. publish: write a new version of the board (owner only)
+    ii. view: the current version and a BoardView reading the arrays in
+        place; check is_current(version) once done reading, as a later
+        publish overwrites the same memory and can garble or break the
+        reads made meanwhile
+    iii. load_board: a new Board decoded from a consistent version
+    iv. wait_for: block until a version newer than a given one exists
+    """
+    def __init__(self, capacity=1 << 20, name=None, board=None):
+        _require_shared_memory()
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=True, size=HEADER.size + capacity
+        )
+        self._owner = True
+        self.capacity = capacity
+        self._buf = self._shm.buf
+        HEADER.pack_into(self._buf, 0, MAGIC, capacity, 0, 0)
+        if board is not None:
+            self.publish(board)
+
+    def __reduce__(self):
+        return (attach_store, (self.name,))
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def _sequence(self):
+        return COUNTER.unpack_from(self._buf, SEQUENCE_OFFSET)[0]
+
+    @property
+    def version(self):
+        """number of boards published so far
+        """
+        return self._sequence() // 2
+
+    def is_current(self, version):
+        """True while no publish has started since version was read
+        """
+        return self._sequence() == version * 2
+
+    def publish(self, board):
+        """write board as the next version and return that version
+        """
+        if not self._owner:
+            raise ValueError("Only the process that made the store "
+                             "can publish to it")
+        data = encode_board(board)
+        if len(data) > self.capacity:
+            raise ValueError(
+                "Board needs {} bytes, the store holds {}".format(
+                    len(data), self.capacity
+                )
+            )
+        sequence = self._sequence() + 1
+        buf = self._buf
+        COUNTER.pack_into(buf, SEQUENCE_OFFSET, sequence)
+        buf[HEADER.size:HEADER.size + len(data)] = data
+        COUNTER.pack_into(buf, LENGTH_OFFSET, len(data))
+        COUNTER.pack_into(buf, SEQUENCE_OFFSET, sequence + 1)
+        return (sequence + 1) // 2
+
+    def _whole_sequence(self):
+        """sequence counter once no publish is under way
+        """
+        while True:
+            sequence = self._sequence()
+            if not sequence:
+                raise ValueError("No board published yet")
+            if not sequence % 2:
+                return sequence
+            time.sleep(0)
+
+    def _blob(self):
+        length = COUNTER.unpack_from(self._buf, LENGTH_OFFSET)[0]
+        return self._buf[HEADER.size:HEADER.size + length]
+
+    def view(self):
+        """(version, BoardView) of the board published last
+
+        the view reads the shared memory in place, but its pickled
+        values are copied out and checked whole before they can be
+        unpickled; raises ValueError if nothing has been published yet
+        """
+        while True:
+            sequence = self._whole_sequence()
+            try:
+                view = BoardView(self._blob())
+                view.copy_extras()
+            except (ValueError, struct.error):
+                # a publish tore the header or directory being read
+                if self._sequence() == sequence:
+                    raise
+                continue
+            if self._sequence() == sequence:
+                return sequence // 2, view
+
+    def load_board(self):
+        """new Board decoded from a version left whole by the publisher
+
+        the blob is copied out and checked whole before anything in it
+        is decoded
+        """
+        while True:
+            sequence = self._whole_sequence()
+            data = bytes(self._blob())
+            if self._sequence() == sequence:
+                return decode_board(data)
+
+    def wait_for(self, version, timeout=None, interval=0.001):
+        """block until a version newer than version is published
+
+        returns the new version, or None after timeout seconds
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            sequence = self._sequence()
+            if not sequence % 2 and sequence // 2 > version:
+                return sequence // 2
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(interval)
+
+    def close(self):
+        """release this process's view of the store
+        """
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self):
+        """free the shared memory block, from the process that made it
+        """
+        if self._owner:
+            self._shm.unlink()
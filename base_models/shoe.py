@@ -0,0 +1,280 @@
+# module for the Shoe class, a multi deck shoe held as counts of each
+# distinct card rather than as a list of Card objects
+# blackjack style shoes only ever need the remaining composition, so a
+# shoe built from six or eight decks costs the same memory as one deck
+
+from fractions import Fraction
+import random
+
+from cards import Card
+from cards import DeckOfCards
+from utils import list_type_check
+
+
+def _card_key(card):
+    """key that identifies interchangeable cards in a shoe
+    """
+    return (card.rank, card.value, getattr(card, 'num_edges', None))
+
+
+class Shoe(DeckOfCards):
+    """Unordered collection of cards stored as a count per distinct card
+
+    Built from one or more DeckOfCards templates, each included
+    num_copies times. The shoe is always 'shuffled': a deal draws a
+    card at random weighted by the counts left, which costs O(number of
+    distinct cards) whatever the number of decks. Dealt cards are the
+    template card objects themselves, so equal cards share one object.
+
+    Keeps the DeckOfCards API so a Shoe can go in Board.decks:
+    i. deal_card: draw a random card; bottom_deal draws from the other end
+    ii. add_card: return a card to the shoe at a random position
+    iii. shuffle: set the rng used for later draws and unpin the ends
+    iv. show_top / show_bottom: draw the card at that end now and keep
+        it there until it is dealt, so the next deal matches the show
+    v. card_list: the cards left, pinned ends first and last
+
+    Additional methods:
+    i. composition: exact count of the cards left per (rank, value)
+    ii. probability_of_next: exact chance the next top deal matches
+    iii. remove_card: take out one card equal to a given card
+    iv. pinned_cards / set_pinned_cards: read or restore the cards held
+        at the ends by show_top and show_bottom
+    """
+    ordered = False
+
+    def __init__(self, templates=[], num_copies=1):
+        # the base attributes stay empty, the cards live in the counts
+        super(Shoe, self).__init__()
+        self._keys = []
+        self._counts = []
+        self._prototypes = []
+        self._slots = {}
+        self._total = 0
+        self._top_card = None
+        self._bottom_card = None
+        # None draws from the global random module, which is resolved at
+        # draw time so that the shoe still copies and pickles
+        self.rng = None
+        if templates:
+            type_check = list_type_check(templates, DeckOfCards, error=True)
+            for template in templates:
+                for card in template.card_list:
+                    self._add_to_counts(card, num_copies)
+
+    def _add_to_counts(self, card, num_cards=1):
+        key = _card_key(card)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            self._slots[key] = slot
+            self._keys.append(key)
+            self._counts.append(0)
+            self._prototypes.append(card)
+        self._counts[slot] += num_cards
+        self._total += num_cards
+
+    def _draw(self):
+        """remove one card at random from the counts and return it
+        """
+        rng = self.rng
+        if rng is None:
+            rng = random
+        target = rng.randrange(self._total)
+        counts = self._counts
+        for slot in range(len(counts)):
+            target -= counts[slot]
+            if target < 0:
+                counts[slot] -= 1
+                self._total -= 1
+                return self._prototypes[slot]
+
+    def _pins(self):
+        return [card for card in (self._top_card, self._bottom_card)
+                if card is not None]
+
+    @property
+    def card_list(self):
+        """list of the cards left; pinned top and bottom cards come first
+        and last, the rest are grouped by card in no particular order
+        """
+        card_list = []
+        if self._top_card is not None:
+            card_list.append(self._top_card)
+        for slot, count in enumerate(self._counts):
+            card_list.extend([self._prototypes[slot]] * count)
+        if self._bottom_card is not None:
+            card_list.append(self._bottom_card)
+        return card_list
+
+    @card_list.setter
+    def card_list(self, card_list):
+        type_check = list_type_check(card_list, Card, error=True)
+        self._keys = []
+        self._counts = []
+        self._prototypes = []
+        self._slots = {}
+        self._total = 0
+        self._top_card = None
+        self._bottom_card = None
+        for card in card_list:
+            self._add_to_counts(card)
+
+    @property
+    def cards_left(self):
+        """number of cards left in the shoe
+        """
+        return self._total + len(self._pins())
+
+    def show_top(self):
+        """print the attributes of the top card as dict
+        """
+        if self._top_card is None:
+            if not self._total:
+                if self._bottom_card is None:
+                    raise IndexError("show_top on an empty Shoe")
+                return self._bottom_card.to_dict()
+            self._top_card = self._draw()
+        return self._top_card.to_dict()
+
+    def show_bottom(self):
+        """print the attributes of the bottom card as dict
+        """
+        if self._bottom_card is None:
+            if not self._total:
+                if self._top_card is None:
+                    raise IndexError("show_bottom on an empty Shoe")
+                return self._top_card.to_dict()
+            self._bottom_card = self._draw()
+        return self._bottom_card.to_dict()
+
+    def shuffle(self, rng=None, lazy=False):
+        """return any pinned cards and draw from rng from now on
+
+        rng is an optional random.Random instance used in place of the
+        global random module; lazy is accepted for DeckOfCards
+        compatibility, a Shoe is always drawn lazily
+        """
+        self.rng = rng
+        for card in self._pins():
+            self._add_to_counts(card)
+        self._top_card = None
+        self._bottom_card = None
+
+    def deal_card(self, bottom_deal=False):
+        """deal a random card from the shoe
+        """
+        if bottom_deal:
+            dealt_card, self._bottom_card = self._bottom_card, None
+        else:
+            dealt_card, self._top_card = self._top_card, None
+        if dealt_card is not None:
+            return dealt_card
+        if self._total:
+            return self._draw()
+        # only the card pinned at the other end is left
+        dealt_card = self._top_card or self._bottom_card
+        self._top_card = None
+        self._bottom_card = None
+        return dealt_card
+
+    def deal_many(self, num_cards, bottom_deal=False):
+        """deal up to num_cards random cards from the shoe as a list
+        """
+        num_cards = min(num_cards, self.cards_left)
+        return [self.deal_card(bottom_deal) for i in range(num_cards)]
+
+    def add_card(self, card_to_add, bottom_add=False):
+        """return a card object to the shoe at a random position
+
+        bottom_add is accepted for DeckOfCards compatibility
+        """
+        if not isinstance(card_to_add, Card):
+            raise TypeError("Can only add Card objects to Deck")
+        self._add_to_counts(card_to_add)
+
+    def add_many(self, cards_to_add, bottom_add=False):
+        """return a sequence of card objects to the shoe
+        """
+        cards_to_add = list(cards_to_add)
+        type_check = list_type_check(cards_to_add, Card)
+        if not type_check:
+            raise TypeError("Can only add Card objects to Deck")
+        for card in cards_to_add:
+            self._add_to_counts(card)
+
+    def remove_card(self, card_to_remove):
+        """take one card like card_to_remove out of the shoe and return it
+
+        pinned cards are taken first; raises ValueError if no such card
+        is left
+        """
+        key = _card_key(card_to_remove)
+        for pin in ('_top_card', '_bottom_card'):
+            card = getattr(self, pin)
+            if card is not None and _card_key(card) == key:
+                setattr(self, pin, None)
+                return card
+        slot = self._slots.get(key)
+        if slot is None or not self._counts[slot]:
+            raise ValueError("No such card left in the Shoe")
+        self._counts[slot] -= 1
+        self._total -= 1
+        return self._prototypes[slot]
+
+    def pinned_cards(self):
+        """tuple of the cards pinned at the top and bottom, None if not
+        """
+        return (self._top_card, self._bottom_card)
+
+    def set_pinned_cards(self, top_card, bottom_card):
+        """pin the given cards, either of which may be None, at the ends
+
+        any cards pinned now go back into the counts first; raises
+        ValueError if a card to pin is not left in the Shoe
+        """
+        for card in self._pins():
+            self._add_to_counts(card)
+        self._top_card = None
+        self._bottom_card = None
+        for card in (top_card, bottom_card):
+            if card is not None:
+                self.remove_card(card)
+        self._top_card = top_card
+        self._bottom_card = bottom_card
+
+    def composition(self):
+        """dict of (rank, value) to the exact number of such cards left
+        """
+        composition = {}
+        for slot, count in enumerate(self._counts):
+            if count:
+                key = self._keys[slot][:2]
+                composition[key] = composition.get(key, 0) + count
+        for card in self._pins():
+            key = (card.rank, card.value)
+            composition[key] = composition.get(key, 0) + 1
+        return composition
+
+    def probability_of_next(self, rank=None, value=None):
+        """exact probability that the next top deal matches rank and value
+
+        either argument left as None matches any card; 0 for an empty
+        shoe
+        """
+        def matches(card_rank, card_value):
+            return ((rank is None or card_rank == rank) and
+                    (value is None or card_value == value))
+
+        top_card = self._top_card
+        if top_card is None and not self._total:
+            top_card = self._bottom_card
+        if top_card is not None:
+            return Fraction(int(matches(top_card.rank, top_card.value)))
+        if not self._total:
+            return Fraction(0)
+        matching = sum([
+            count for key, count in zip(self._keys, self._counts)
+            if matches(key[0], key[1])
+        ])
+        return Fraction(matching, self._total)
@@ -0,0 +1,126 @@
+# module to run Monte Carlo trials over decks and dice in parallel
+# trials are grouped into fixed size blocks and every block draws from its
+# own random.Random seeded from the master seed and the block number;
+# blocks are merged in order, so a fixed master seed reproduces the result
+# exactly whatever the number of worker processes
+
+import copy
+import hashlib
+import multiprocessing
+import operator
+import random
+
+
+def derive_seed(master_seed, stream_index):
+    """Derive an independent 64-bit seed for one stream of a simulation
+
+    Args:
+        master_seed: the seed fixed for the whole simulation
+        stream_index: integer identifying the stream (block) of trials
+
+    Returns:
+        integer seed taken from a SHA-256 digest of both arguments
+    """
+    stream_name = '{}:{}'.format(master_seed, stream_index)
+    digest = hashlib.sha256(stream_name.encode('utf-8')).hexdigest()
+    return int(digest[:16], 16)
+
+
+def _run_block(block_task):
+    """run one block of trials from a fresh seeded rng and reduce them
+
+    module level so that it can be sent to worker processes
+    """
+    trial, reduce_function, initial, seed, num_trials = block_task
+    rng = random.Random(seed)
+    block_result = copy.deepcopy(initial)
+    for i in range(num_trials):
+        block_result = reduce_function(block_result, trial(rng))
+    return block_result
+
+
+class MonteCarloRunner(object):
+    """Runs a trial function many times, optionally over a process pool
+
+    Attributes:
+        trial: function taking a random.Random and returning one result;
+            it should draw all of its randomness from that rng, e.g.
+            deck.shuffle(rng=rng) and dice_roller.roll(rng=rng), and must
+            be defined at module level when num_workers is above one
+        reduce_function: folds one trial result into a running result,
+            default operator.add
+        initial: the starting running result for each block, default 0
+        merge_function: folds a block result into the total, defaults to
+            reduce_function
+        num_workers: number of worker processes, 1 runs in this process
+        block_size: number of trials per seeded block
+
+    The last master seed used is kept as last_seed so that a run started
+    without a seed can be reproduced.
+    """
+    def __init__(self,
+                 trial,
+                 reduce_function=operator.add,
+                 initial=0,
+                 merge_function=None,
+                 num_workers=1,
+                 block_size=1000
+                 ):
+        if num_workers < 1:
+            raise ValueError("Expect at least one worker")
+        if block_size < 1:
+            raise ValueError("Expect at least one trial per block")
+        self.trial = trial
+        self.reduce_function = reduce_function
+        self.initial = initial
+        if merge_function is None:
+            merge_function = reduce_function
+        self.merge_function = merge_function
+        self.num_workers = num_workers
+        self.block_size = block_size
+        self.last_seed = None
+
+    def _block_tasks(self, num_trials, seed):
+        """generate the task tuple for each block in order
+        """
+        block_index = 0
+        for start in range(0, num_trials, self.block_size):
+            yield (
+                self.trial,
+                self.reduce_function,
+                self.initial,
+                derive_seed(seed, block_index),
+                min(self.block_size, num_trials - start)
+            )
+            block_index += 1
+
+    def run(self, num_trials, seed=None):
+        """Run num_trials trials and return the merged result
+
+        Args:
+            num_trials: total number of trials to run
+            seed: master seed; None draws a fresh one from the global
+                random module (kept as last_seed)
+
+        Returns:
+            the merge of every block result, taken in block order as
+            the blocks come back from the workers
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.last_seed = seed
+        tasks = self._block_tasks(num_trials, seed)
+        result = copy.deepcopy(self.initial)
+        if self.num_workers == 1:
+            for block_task in tasks:
+                result = self.merge_function(result, _run_block(block_task))
+            return result
+
+        pool = multiprocessing.Pool(self.num_workers)
+        try:
+            for block_result in pool.imap(_run_block, tasks):
+                result = self.merge_function(result, block_result)
+        finally:
+            pool.close()
+            pool.join()
+        return result
@@ -0,0 +1,292 @@
+# module for immutable Board snapshots built on persistent vectors
+# a snapshot holds the spaces, reserve tiles, decks and tokens of a board
+# in PersistentVector objects, so a snapshot made by changing another one
+# shares every part it did not change; a Board keeps its latest snapshot
+# up to date change by change, which makes taking one O(1)
+
+from cards import DeckOfCards
+from dice import DiceRoller
+from persistent_vector import PersistentVector
+from shoe import Shoe
+
+
+def _insert(vector, position, item):
+    """vector with item inserted, O(log n) at the end and O(n) elsewhere
+    """
+    if position == len(vector):
+        return vector.append(item)
+    items = list(vector)
+    items.insert(position, item)
+    return PersistentVector(items)
+
+
+def _delete(vector, position):
+    """vector without the item at position, O(log n) at the end
+    """
+    if position in (-1, len(vector) - 1):
+        return vector.pop()
+    items = list(vector)
+    del items[position]
+    return PersistentVector(items)
+
+
+def _dice_state(roller):
+    return (
+        roller.num_sides,
+        tuple([die.face_value for die in roller.dice]),
+        roller.roll_value
+    )
+
+
+class DeckSnapshot(object):
+    """Immutable deck of cards held bottom card first in a PersistentVector
+
+    Top deals and adds, and bottom deals, return a new DeckSnapshot in
+    O(log n) sharing the rest of the cards; ordered is False for a
+    snapshot of a count based deck such as a Shoe
+    """
+    __slots__ = ('_cards', '_start', 'ordered')
+
+    def __init__(self, card_list=(), ordered=True):
+        self._cards = PersistentVector(reversed(list(card_list)))
+        self._start = 0
+        self.ordered = ordered
+
+    @classmethod
+    def _make(cls, cards, start, ordered):
+        deck = cls.__new__(cls)
+        deck._cards = cards
+        deck._start = start
+        deck.ordered = ordered
+        return deck
+
+    @classmethod
+    def from_deck(cls, deck):
+        return cls(deck.card_list, ordered=deck.ordered)
+
+    @property
+    def cards_left(self):
+        return len(self._cards) - self._start
+
+    @property
+    def card_list(self):
+        """list of the cards in the deck, top of the deck first
+        """
+        cards = self._cards
+        return [cards[i] for i in range(len(cards) - 1, self._start - 1, -1)]
+
+    def deal_card(self, bottom_deal=False):
+        """return the dealt card (None if empty) and the deck left
+        """
+        if not self.cards_left:
+            return None, self
+        if bottom_deal:
+            return self._cards[self._start], self._make(
+                self._cards, self._start + 1, self.ordered
+            )
+        return self._cards[-1], self._make(
+            self._cards.pop(), self._start, self.ordered
+        )
+
+    def add_card(self, card, bottom_add=False):
+        """return the deck with card added, default to 'top add'
+        """
+        if not bottom_add:
+            return self._make(
+                self._cards.append(card), self._start, self.ordered
+            )
+        if self._start:
+            return self._make(
+                self._cards.set(self._start - 1, card), self._start - 1,
+                self.ordered
+            )
+        return DeckSnapshot(self.card_list + [card], ordered=self.ordered)
+
+    def to_deck(self):
+        """a new mutable deck with the same cards
+        """
+        if self.ordered:
+            return DeckOfCards(card_list=self.card_list)
+        shoe = Shoe()
+        shoe.card_list = self.card_list
+        return shoe
+
+
+class BoardSnapshot(object):
+    """Immutable state of a Board at one point of play
+
+    spaces, tiles and tokens are PersistentVector objects, decks is a
+    tuple of DeckSnapshot objects, dice a tuple of (num_sides, faces,
+    roll_value) per dice roller and score is kept as it is. The Card,
+    Tile and token objects themselves are shared, not copied.
+
+    The methods named after the Board mutators return a new snapshot
+    that shares every part of this one it did not change:
+    i. set_space, place_tile, remove_tile
+    ii. deal_card (returns the card too) and add_card
+    iii. add_token, remove_token, set_score
+    to_board makes a new mutable Board from the snapshot.
+    """
+    __slots__ = ('spaces', 'tiles', 'decks', 'tokens', 'dice', 'score')
+
+    def __init__(self, spaces=PersistentVector(), tiles=PersistentVector(),
+                 decks=(), tokens=PersistentVector(), dice=(), score=None):
+        self.spaces = spaces
+        self.tiles = tiles
+        self.decks = decks
+        self.tokens = tokens
+        self.dice = dice
+        self.score = score
+
+    @classmethod
+    def from_board(cls, board):
+        """snapshot of board made from scratch, O(size of the board)
+        """
+        return cls(
+            spaces=PersistentVector(board.spaces),
+            tiles=PersistentVector(board.tiles),
+            decks=tuple([DeckSnapshot.from_deck(deck)
+                         for deck in board.decks]),
+            tokens=PersistentVector(board.tokens),
+            dice=tuple([_dice_state(roller)
+                        for roller in board.dice_rollers]),
+            score=board.score
+        )
+
+    def replace(self, **changes):
+        """new snapshot with the given attributes changed
+        """
+        attributes = dict([(name, getattr(self, name))
+                           for name in self.__slots__])
+        attributes.update(changes)
+        return BoardSnapshot(**attributes)
+
+    def _replace_deck(self, deck_index, deck):
+        decks = self.decks
+        return self.replace(
+            decks=decks[:deck_index] + (deck,) + decks[deck_index + 1:]
+        )
+
+    def set_space(self, index, content):
+        return self.replace(spaces=self.spaces.set(index, content))
+
+    def place_tile(self, index, tile):
+        """move tile to spaces[index], out of the reserve if it is there
+        """
+        tiles = self.tiles
+        for position, reserve_tile in enumerate(tiles):
+            if reserve_tile is tile:
+                tiles = _delete(tiles, position)
+                break
+        return self.replace(
+            spaces=self.spaces.set(index, tile), tiles=tiles
+        )
+
+    def remove_tile(self, index, empty=None):
+        """move the tile in spaces[index] to the reserve, leaving empty
+        """
+        return self.replace(
+            spaces=self.spaces.set(index, empty),
+            tiles=self.tiles.append(self.spaces[index])
+        )
+
+    def deal_card(self, deck_index, bottom_deal=False):
+        """return the dealt card and the snapshot after the deal
+        """
+        card, deck = self.decks[deck_index].deal_card(bottom_deal)
+        return card, self._replace_deck(deck_index, deck)
+
+    def add_card(self, deck_index, card, bottom_add=False):
+        deck = self.decks[deck_index].add_card(card, bottom_add)
+        return self._replace_deck(deck_index, deck)
+
+    def add_token(self, token):
+        return self.replace(tokens=self.tokens.append(token))
+
+    def remove_token(self, token):
+        return self.replace(
+            tokens=_delete(self.tokens, list(self.tokens).index(token))
+        )
+
+    def set_score(self, score):
+        return self.replace(score=score)
+
+    def to_board(self):
+        """a new mutable Board in the state of this snapshot
+        """
+        from board import Board
+        dice_rollers = []
+        for num_sides, faces, roll_value in self.dice:
+            roller = DiceRoller(num_sides=num_sides, num_dice=len(faces))
+            for die, face_value in zip(roller.dice, faces):
+                die.face_value = face_value
+            roller.roll_value = roll_value
+            dice_rollers.append(roller)
+        return Board(
+            spaces=list(self.spaces),
+            tiles=list(self.tiles),
+            decks=[deck.to_deck() for deck in self.decks],
+            tokens=list(self.tokens),
+            dice_rollers=dice_rollers,
+            score=self.score
+        )
+
+
+class SnapshotTracker(object):
+    """Keeps a BoardSnapshot of a Board up to date as it changes
+
+    Board mutators report each change to board_changed, which makes the
+    next snapshot from the last one in O(log n) for most changes;
+    reordering a deck, or dealing from a count based deck, snapshots
+    that deck again from scratch
+    """
+    def __init__(self, board):
+        self.reset(board)
+
+    def reset(self, board):
+        self.current = BoardSnapshot.from_board(board)
+
+    def board_changed(self, board, event):
+        """make the next snapshot for one change reported by the Board
+        """
+        kind = event[0]
+        current = self.current
+        if kind == 'space':
+            current = current.set_space(event[1], event[3])
+        elif kind == 'reserve_add':
+            current = current.replace(
+                tiles=_insert(current.tiles, event[1], event[2])
+            )
+        elif kind == 'reserve_remove':
+            current = current.replace(
+                tiles=_delete(current.tiles, event[1])
+            )
+        elif kind == 'token_add':
+            current = current.replace(
+                tokens=_insert(current.tokens, event[1], event[2])
+            )
+        elif kind == 'token_remove':
+            current = current.replace(
+                tokens=_delete(current.tokens, event[1])
+            )
+        elif kind == 'score':
+            current = current.set_score(event[2])
+        elif kind in ('deal', 'add', 'order'):
+            index = event[1]
+            deck = board.decks[index]
+            if kind == 'order' or not deck.ordered:
+                current = current._replace_deck(
+                    index, DeckSnapshot.from_deck(deck)
+                )
+            elif kind == 'deal':
+                current = current.deal_card(index, event[3])[1]
+            else:
+                current = current.add_card(index, event[2], event[3])
+        elif kind == 'roll':
+            index = event[1]
+            dice = current.dice
+            current = current.replace(dice=(
+                dice[:index] + (_dice_state(board.dice_rollers[index]),) +
+                dice[index + 1:]
+            ))
+        self.current = current
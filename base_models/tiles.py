@@ -11,3 +11,109 @@ class Tile(Card):
     def __init__(self, num_edges=4, rank=0, value=0):
         super(Tile, self).__init__(rank=rank, value=value)
         self.num_edges = num_edges
+
+
+class CompactTile(object):
+    """Tile with its attributes held in slots rather than in a __dict__
+
+    Behaves as a Tile and is registered as one, so it passes Tile and
+    Card type checks, but it has no instance dict
+    """
+    __slots__ = ('num_edges', 'rank', 'value')
+
+    def __init__(self, num_edges=4, rank=0, value=0):
+        self.num_edges = num_edges
+        self.rank = rank
+        self.value = value
+
+    def to_dict(self):
+        """return the attributes of the tile as dict
+        """
+        return {
+            'rank': self.rank, 'value': self.value,
+            'num_edges': self.num_edges
+        }
+
+
+Tile.register(CompactTile)
+
+
+class FrozenTile(CompactTile):
+    """Immutable CompactTile meant to be shared between boards
+
+    Attributes cannot be changed once set; build these through a
+    CardRegistry so that equal tiles are one shared object
+    """
+    __slots__ = ()
+
+    def __init__(self, num_edges=4, rank=0, value=0):
+        object.__setattr__(self, 'num_edges', num_edges)
+        object.__setattr__(self, 'rank', rank)
+        object.__setattr__(self, 'value', value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenTile objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenTile objects are immutable")
+
+    def __reduce__(self):
+        from registry import intern_tile
+        return (intern_tile, (self.num_edges, self.rank, self.value))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def _label_order(label):
+    # None sorts before any label and is never compared with one
+    return (0,) if label is None else (1, label)
+
+
+def rotation_key(labels):
+    """(key, shift): the rotation of labels chosen to stand for all of
+    its rotations, and the shift giving it, key[k] being
+    labels[(k + shift) % len(labels)]
+
+    None entries, for sides that need no match, may be mixed in
+    """
+    labels = tuple(labels)
+    if not labels:
+        return labels, 0
+    order = [_label_order(label) for label in labels]
+    shift = min(range(len(labels)),
+                key=lambda start: order[start:] + order[:start])
+    return labels[shift:] + labels[:shift], shift
+
+
+class EdgeTile(Tile):
+    """Tile with a label on each edge, such as the road, city and field
+    sides of a tile laying game
+
+    edges holds one label per edge in side order, as the tile lies, and
+    sets num_edges. A tile turned by rotation steps has on side k the
+    label edges[(k - rotation) % num_edges]:
+    i. edges_at: the labels after turning the tile
+    ii. rotated: a new EdgeTile turned by some steps
+    iii. rotation_key: a key shared by the tile and all its rotations
+    """
+    def __init__(self, edges=(0, 0, 0, 0), rank=0, value=0):
+        super(EdgeTile, self).__init__(
+            num_edges=len(edges), rank=rank, value=value
+        )
+        self.edges = tuple(edges)
+
+    def edges_at(self, rotation):
+        shift = -rotation % self.num_edges
+        return self.edges[shift:] + self.edges[:shift]
+
+    def rotated(self, rotation):
+        return EdgeTile(edges=self.edges_at(rotation), rank=self.rank,
+                        value=self.value)
+
+    @property
+    def rotation_key(self):
+        return rotation_key(self.edges)[0]
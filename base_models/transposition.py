@@ -0,0 +1,296 @@
+# module for a fixed size transposition table of evaluated board states
+# entries are packed into one flat buffer of equal sized slots grouped in
+# buckets, so the table never grows past the memory given at creation and
+# the same buffer can sit in shared memory for parallel search workers
+from collections import namedtuple
+import struct
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+POLICIES = ('always', 'depth', 'clock')
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+KEY_MASK = 2 ** 64 - 1
+MAGIC = b'BMTT'
+HEADER = struct.Struct('<4sIIB3x')
+# check, value bits, depth, used, ref, bound and one byte of padding
+SLOT = struct.Struct('<QQiBBBx')
+USED_OFFSET = 20
+REF_OFFSET = 21
+FLOAT = struct.Struct('<d')
+BITS = struct.Struct('<Q')
+
+TableEntry = namedtuple('TableEntry', ['value', 'depth', 'bound'])
+
+
+def _layout(num_buckets, ways):
+    """offsets of the bucket hands and the slots, and the buffer size
+    """
+    hands_offset = HEADER.size
+    slots_offset = hands_offset + (num_buckets + 7) // 8 * 8
+    return hands_offset, slots_offset, slots_offset + (
+        num_buckets * ways * SLOT.size
+    )
+
+
+def _verify(bits, depth, bound):
+    """64-bit word mixed from a slot's payload
+
+    a slot stores key ^ _verify(payload), so a slot torn by two writers
+    at once no longer matches its key and reads as a miss
+    """
+    return bits ^ ((depth & 0xffffffff) << 8) ^ bound
+
+
+def _key_of(key):
+    """the 64-bit key for an int or for a Board through its hash_key
+    """
+    return getattr(key, 'hash_key', key) & KEY_MASK
+
+
+def attach_table(name):
+    """Attach to a shared TranspositionTable created in another process
+    """
+    if shared_memory is None:
+        raise RuntimeError("Shared tables need multiprocessing.shared_memory")
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+    table = TranspositionTable.__new__(TranspositionTable)
+    table._shm = shm
+    table._owner = False
+    table._setup(shm.buf)
+    return table
+
+
+def _table_from_bytes(data):
+    """rebuild a local TranspositionTable from a copy of its buffer
+    """
+    table = TranspositionTable.__new__(TranspositionTable)
+    table._shm = None
+    table._owner = False
+    table._setup(bytearray(data))
+    return table
+
+
+class TranspositionTable(object):
+    """Bounded cache of evaluations keyed by a 64-bit board hash
+
+    Keys are ints or anything with a hash_key, such as a Board. Each
+    key maps to one bucket of `ways` slots and each slot holds a float
+    value, a search depth and a bound (EXACT, LOWER or UPPER). When a
+    bucket is full the policy picks the slot to give up:
+    i. 'always' replaces the slot chosen by the key
+    ii. 'depth' replaces the shallowest slot, but only with an entry
+        searched at least as deep, and never lets an entry be
+        overwritten by a shallower one for the same key
+    iii. 'clock' replaces the first slot not used since the bucket's
+        clock hand last passed it
+
+    With shared=True the buffer is a multiprocessing.shared_memory
+    block that other processes join through attach_table(table.name),
+    or by receiving the pickled table. Writes are not locked; a slot
+    torn by concurrent writers fails its check and reads as a miss.
+    Hit, miss, store, eviction and rejection counts are kept per
+    process in stats
+    """
+    def __init__(self, num_entries=65536, ways=4, policy='always',
+                 shared=False, name=None):
+        if policy not in POLICIES:
+            raise ValueError("Policy must be one of {}".format(POLICIES))
+        if not 0 < ways < 256:
+            raise ValueError("Ways must be between 1 and 255")
+        if num_entries < ways:
+            raise ValueError("Table needs at least one bucket of slots")
+        num_buckets = num_entries // ways
+        size = _layout(num_buckets, ways)[2]
+        if shared:
+            if shared_memory is None:
+                raise RuntimeError(
+                    "Shared tables need multiprocessing.shared_memory"
+                )
+            self._shm = shared_memory.SharedMemory(
+                name=name, create=True, size=size
+            )
+            buf = self._shm.buf
+            buf[:size] = bytearray(size)
+        else:
+            self._shm = None
+            buf = bytearray(size)
+        self._owner = shared
+        HEADER.pack_into(
+            buf, 0, MAGIC, num_buckets, ways, POLICIES.index(policy)
+        )
+        self._setup(buf)
+
+    def _setup(self, buf):
+        """read the table geometry from the header of buf
+        """
+        magic, num_buckets, ways, policy_code = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Buffer does not hold a TranspositionTable")
+        self._buf = buf
+        self.num_buckets = num_buckets
+        self.ways = ways
+        self.policy = POLICIES[policy_code]
+        (self._hands_offset, self._slots_offset,
+         self._size) = _layout(num_buckets, ways)
+        self.reset_stats()
+
+    def __reduce__(self):
+        if self._shm is not None:
+            return (attach_table, (self.name,))
+        return (_table_from_bytes, (bytes(self._buf[:self._size]),))
+
+    def __len__(self):
+        used = 0
+        for slot in range(self.num_buckets * self.ways):
+            offset = self._slots_offset + slot * SLOT.size
+            used += self._buf[offset + USED_OFFSET] != 0
+        return used
+
+    @property
+    def name(self):
+        """name of the shared memory block, None for a local table
+        """
+        return self._shm.name if self._shm is not None else None
+
+    @property
+    def num_entries(self):
+        return self.num_buckets * self.ways
+
+    @property
+    def stats(self):
+        """counts of hits, misses, stores, evictions and rejections
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'rejections': self.rejections,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    def _bucket(self, key):
+        bucket = key % self.num_buckets
+        return bucket, self._slots_offset + bucket * self.ways * SLOT.size
+
+    def probe(self, key, min_depth=None):
+        """return the TableEntry stored for key, or None on a miss
+
+        an entry searched shallower than min_depth counts as a miss
+        """
+        key = _key_of(key)
+        buf = self._buf
+        offset = self._bucket(key)[1]
+        for way in range(self.ways):
+            check, bits, depth, used, ref, bound = SLOT.unpack_from(
+                buf, offset
+            )
+            if used and check ^ _verify(bits, depth, bound) == key:
+                if min_depth is not None and depth < min_depth:
+                    break
+                if self.policy == 'clock' and not ref:
+                    buf[offset + REF_OFFSET] = 1
+                self.hits += 1
+                value = FLOAT.unpack(BITS.pack(bits))[0]
+                return TableEntry(value, depth, bound)
+            offset += SLOT.size
+        self.misses += 1
+        return None
+
+    def store(self, key, value, depth=0, bound=EXACT):
+        """store an evaluation for key, returning False if the policy
+        kept the entries already there instead
+        """
+        key = _key_of(key)
+        buf = self._buf
+        bucket, bucket_offset = self._bucket(key)
+        target = None
+        empty = None
+        shallowest = None
+        shallowest_depth = None
+        offset = bucket_offset
+        for way in range(self.ways):
+            check, bits, slot_depth, used, ref, slot_bound = (
+                SLOT.unpack_from(buf, offset)
+            )
+            if not used:
+                if empty is None:
+                    empty = way
+            elif check ^ _verify(bits, slot_depth, slot_bound) == key:
+                target = way
+                shallowest_depth = slot_depth
+                break
+            elif shallowest is None or slot_depth < shallowest_depth:
+                shallowest = way
+                shallowest_depth = slot_depth
+            offset += SLOT.size
+        if target is None and empty is not None:
+            target = empty
+        elif target is None:
+            target = self._victim(key, bucket, bucket_offset, shallowest)
+            if self.policy == 'depth' and depth < shallowest_depth:
+                self.rejections += 1
+                return False
+            self.evictions += 1
+        elif self.policy == 'depth' and depth < shallowest_depth:
+            self.rejections += 1
+            return False
+        bits = BITS.unpack(FLOAT.pack(float(value)))[0]
+        SLOT.pack_into(
+            buf, bucket_offset + target * SLOT.size,
+            key ^ _verify(bits, depth, bound), bits, depth, 1, 1, bound
+        )
+        self.stores += 1
+        return True
+
+    def _victim(self, key, bucket, bucket_offset, shallowest):
+        """way of a full bucket that the policy gives up
+        """
+        if self.policy == 'depth':
+            return shallowest
+        if self.policy == 'always':
+            return (key // self.num_buckets) % self.ways
+        buf = self._buf
+        hand_offset = self._hands_offset + bucket
+        hand = buf[hand_offset] % self.ways
+        while True:
+            ref_offset = bucket_offset + hand * SLOT.size + REF_OFFSET
+            if not buf[ref_offset]:
+                buf[hand_offset] = (hand + 1) % self.ways
+                return hand
+            buf[ref_offset] = 0
+            hand = (hand + 1) % self.ways
+
+    def clear(self):
+        """drop every entry, keeping the geometry and the counters
+        """
+        start = self._hands_offset
+        self._buf[start:self._size] = bytearray(self._size - start)
+
+    def close(self):
+        """release this process's view of a shared table
+        """
+        if self._shm is not None:
+            self._buf = None
+            self._shm.close()
+
+    def unlink(self):
+        """free the shared memory block, from the process that made it
+        """
+        if self._shm is not None and self._owner:
+            self._shm.unlink()
@@ -1,4 +1,6 @@
 # utility functions for repeated use across other base classes
+from array import array
+from collections import OrderedDict
 
 
 def list_type_check(check_object_list, check_class, error=False):
@@ -16,3 +18,56 @@ def list_type_check(check_object_list, check_class, error=False):
         raise TypeError(error_message)
     else:
         return False
+
+
+def array_typecode(max_value):
+    """Utility function picks the smallest unsigned array typecode
+
+    the returned typecode can hold every integer from 0 to max_value
+    """
+    for typecode in ('B', 'H', 'I', 'L'):
+        if max_value < 2 ** (8 * array(typecode).itemsize):
+            return typecode
+    raise ValueError("No array typecode can hold {}".format(max_value))
+
+
+class LRUCache(object):
+    """Bounded mapping that drops the least recently used entry
+
+    works like a small dict through get and put; once maxsize entries
+    are held each new entry evicts the one left untouched the longest
+    """
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("LRUCache maxsize must be at least one")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """return the value for key and mark it as most recently used
+        """
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            return default
+        self._entries[key] = value
+        return value
+
+    def put(self, key, value):
+        """store value for key, evicting the least recently used entry
+        """
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """drop every entry
+        """
+        self._entries.clear()
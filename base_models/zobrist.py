@@ -0,0 +1,198 @@
+# module for Zobrist style hashing of Board state
+# every feature of a board (what sits in each space, each reserve tile,
+# each card at each depth of each deck, each token and the score) has a
+# fixed pseudo random 64-bit key and the board hash is the XOR of the keys
+# of its features, so a change to the board only XORs out the keys of the
+# features it removed and XORs in the keys of the features it added
+
+import hashlib
+from numbers import Number
+
+from cards import Card
+from tiles import Tile
+
+
+# values whose repr is the same in every process
+try:
+    _PLAIN_TYPES = (type(None), Number, basestring)
+except NameError:
+    _PLAIN_TYPES = (type(None), Number, str, bytes)
+
+
+def state_key(obj):
+    """hashable description of a board object with a stable repr
+
+    Cards and tiles become tuples of their attributes and lists become
+    tuples; None, numbers and strings are used as they are, and any
+    other object must give its own description through a state_key
+    method. Raises TypeError otherwise, as a default repr holds a memory
+    address and would hash the same state differently in each process
+    """
+    if isinstance(obj, Tile):
+        edges = getattr(obj, 'edges', None)
+        if edges is not None:
+            return ('tile', obj.num_edges, obj.rank, obj.value, edges)
+        return ('tile', obj.num_edges, obj.rank, obj.value)
+    if isinstance(obj, Card):
+        return ('card', obj.rank, obj.value)
+    if isinstance(obj, (list, tuple)):
+        return tuple([state_key(item) for item in obj])
+    if isinstance(obj, _PLAIN_TYPES):
+        return obj
+    if hasattr(obj, 'state_key'):
+        return state_key(obj.state_key())
+    raise TypeError(
+        "No stable state key for {} objects".format(type(obj).__name__)
+    )
+
+
+class ZobristKeys(object):
+    """Table of deterministic pseudo random 64-bit keys, one per feature
+
+    A key is taken from an MD5 digest of the feature (and salt), so the
+    same feature gets the same key in every process; keys are cached
+    """
+    def __init__(self, salt=''):
+        self.salt = salt
+        self._keys = {}
+
+    def key(self, *feature):
+        """the 64-bit key of a feature tuple
+        """
+        key = self._keys.get(feature)
+        if key is None:
+            text = '{}:{!r}'.format(self.salt, feature)
+            digest = hashlib.md5(text.encode('utf-8')).hexdigest()
+            key = int(digest[:16], 16)
+            self._keys[feature] = key
+        return key
+
+
+default_keys = ZobristKeys()
+
+
+class ZobristTracker(object):
+    """Keeps the Zobrist hash of a Board up to date as it changes
+
+    Board mutators report each change to board_changed, which updates
+    key in O(1) for placements, reserve and token changes, the score and
+    top deals and adds; bottom deals and adds, shuffles and count based
+    decks rehash only the deck concerned. With debug set every update is
+    checked against full_hash and a mismatch raises AssertionError.
+    """
+    def __init__(self, board, keys=None, debug=False):
+        if keys is None:
+            keys = default_keys
+        self.keys = keys
+        self.debug = debug
+        self.reset(board)
+
+    def reset(self, board):
+        """recompute every part of the hash from scratch
+        """
+        self.reserve_counts = {}
+        self.token_counts = {}
+        self.deck_keys = [
+            self.deck_hash(index, deck)
+            for index, deck in enumerate(board.decks)
+        ]
+        key = 0
+        for index, content in enumerate(board.spaces):
+            key ^= self.keys.key('space', index, state_key(content))
+        for tile in board.tiles:
+            key ^= self._count_in(self.reserve_counts, 'reserve', tile)
+        for token in board.tokens:
+            key ^= self._count_in(self.token_counts, 'token', token)
+        for deck_key in self.deck_keys:
+            key ^= deck_key
+        key ^= self.keys.key('score', state_key(board.score))
+        self.key = key
+
+    def full_hash(self, board):
+        """hash of board computed from scratch, for checking key
+        """
+        return ZobristTracker(board, keys=self.keys).key
+
+    def deck_hash(self, index, deck):
+        """XOR of the keys of every card in deck number index
+
+        ordered decks key each card by its depth counted from the
+        bottom, so top deals and adds leave the other cards' keys alone
+        """
+        key = 0
+        if getattr(deck, 'ordered', True):
+            card_list = deck.card_list
+            depth = len(card_list)
+            for card in card_list:
+                depth -= 1
+                key ^= self.keys.key('deck', index, depth, state_key(card))
+        else:
+            for card_key, count in deck.composition().items():
+                key ^= self.keys.key('deck_count', index, card_key, count)
+        return key
+
+    def _count_in(self, counts, kind, obj):
+        """key for adding one more obj to a multiset of kind
+        """
+        obj_key = state_key(obj)
+        count = counts.get(obj_key, 0) + 1
+        counts[obj_key] = count
+        return self.keys.key(kind, obj_key, count)
+
+    def _count_out(self, counts, kind, obj):
+        """key for removing one obj from a multiset of kind
+        """
+        obj_key = state_key(obj)
+        count = counts[obj_key]
+        counts[obj_key] = count - 1
+        return self.keys.key(kind, obj_key, count)
+
+    def _rehash_deck(self, board, index):
+        new_key = self.deck_hash(index, board.decks[index])
+        self.key ^= self.deck_keys[index] ^ new_key
+        self.deck_keys[index] = new_key
+
+    def board_changed(self, board, event):
+        """update key for one change reported by a Board mutator
+        """
+        kind = event[0]
+        keys = self.keys
+        if kind == 'space':
+            index, old_content, new_content = event[1:]
+            self.key ^= keys.key('space', index, state_key(old_content))
+            self.key ^= keys.key('space', index, state_key(new_content))
+        elif kind == 'reserve_add':
+            self.key ^= self._count_in(self.reserve_counts, 'reserve',
+                                       event[2])
+        elif kind == 'reserve_remove':
+            self.key ^= self._count_out(self.reserve_counts, 'reserve',
+                                        event[2])
+        elif kind == 'token_add':
+            self.key ^= self._count_in(self.token_counts, 'token', event[2])
+        elif kind == 'token_remove':
+            self.key ^= self._count_out(self.token_counts, 'token',
+                                        event[2])
+        elif kind == 'score':
+            old_score, new_score = event[1:]
+            self.key ^= keys.key('score', state_key(old_score))
+            self.key ^= keys.key('score', state_key(new_score))
+        elif kind in ('deal', 'add'):
+            index, card, at_bottom = event[1:]
+            deck = board.decks[index]
+            if at_bottom or not getattr(deck, 'ordered', True):
+                self._rehash_deck(board, index)
+            else:
+                # the card was or is now the top card, just above the
+                # cards_left - 1 cards below it after an add
+                depth = deck.cards_left
+                if kind == 'add':
+                    depth -= 1
+                card_key = keys.key('deck', index, depth, state_key(card))
+                self.key ^= card_key
+                self.deck_keys[index] ^= card_key
+        elif kind == 'order':
+            self._rehash_deck(board, event[1])
+        if self.debug and self.key != self.full_hash(board):
+            raise AssertionError(
+                "Zobrist hash out of step after {} change".format(kind)
+            )